@@ -0,0 +1,59 @@
+"""
+Benchmarks das consultas do DashboardRepository contra o MySQL configurado
+no .env (use um banco populado, ex.: seed_database --users 10000 --days 365).
+"""
+import os
+from datetime import date, datetime
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.database.repository.dashboard_repository import DashboardRepository
+from benchmarks.harness import BenchmarkResults
+
+dotenv.load_dotenv()
+
+
+def dashboard_queries(repository: DashboardRepository, user_id: int):
+    """Todas as consultas do repository, com os argumentos usados pelo dashboard"""
+    today = date.today().strftime('%Y-%m-%d')
+    return {
+        'get_today_accesses_count': repository.get_today_accesses_count,
+        'get_today_allowed_count': repository.get_today_allowed_count,
+        'get_today_denied_count': repository.get_today_denied_count,
+        'get_unread_notifications_count': repository.get_unread_notifications_count,
+        'get_all_users_attendance': repository.get_all_users_attendance,
+        'get_attendance_snapshot': lambda: repository.get_attendance_snapshot(today, datetime.now()),
+        'list_approved_users_basic': repository.list_approved_users_basic,
+        'get_accesses_by_day': repository.get_accesses_by_day,
+        'get_accesses_by_hour': repository.get_accesses_by_hour,
+        'get_success_rate_by_day': repository.get_success_rate_by_day,
+        'get_top_users': repository.get_top_users,
+        'get_notifications_by_type': repository.get_notifications_by_type,
+        'get_overtime_by_user': repository.get_overtime_by_user,
+        'get_daily_overtime_detail': lambda: repository.get_daily_overtime_detail(user_id),
+    }
+
+
+def run(results: BenchmarkResults, repeat: int = 5) -> None:
+    db_connection = DatabaseConnection(
+        os.getenv('DB_HOST', 'localhost'),
+        os.getenv('DB_USER', 'root'),
+        os.getenv('DB_PASSWORD', ''),
+        os.getenv('DB_NAME', 'facepass_db'),
+        int(os.getenv('DB_PORT', '3306'))
+    )
+    db_connection.connect()
+    conn = db_connection.get_connection()
+    if conn is None:
+        print("⚠️  Banco indisponível, pulando benchmarks do dashboard")
+        return
+
+    try:
+        repository = DashboardRepository(conn)
+        users = repository.list_approved_users_basic()
+        user_id = users[0]['id'] if users else 1
+
+        print("\n📊 DashboardRepository")
+        for name, query in dashboard_queries(repository, user_id).items():
+            results.run(f"dashboard.{name}", query, repeat)
+    finally:
+        db_connection.close()
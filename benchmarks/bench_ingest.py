@@ -0,0 +1,119 @@
+"""
+Benchmarks da ingestão de imagens (sem banco de dados).
+
+Compara, para uploads de celular de 12 MP (4000x3000 JPEG):
+- decodificação completa (equivalente a face_recognition.load_image_file)
+- image_ingest.decode_image (escala DCT do libjpeg até IMAGE_TARGET_SIDE)
+
+Além do tempo, mede o pico de memória de cada variante num processo
+separado (aumento do RSS máximo durante a decodificação; no Linux o pico
+é zerado antes, para não ser encoberto pelo dos imports).
+
+Uso isolado:
+    python -m benchmarks.bench_ingest --face-image rosto.jpg
+"""
+import argparse
+import io
+import multiprocessing
+import resource
+import sys
+from typing import Callable, Dict, Optional
+import numpy as np
+from PIL import Image
+from facepass.services.image_ingest import IMAGE_TARGET_SIDE, decode_image
+from benchmarks.harness import BenchmarkResults
+
+PHONE_SIZE = (4000, 3000)
+
+
+def phone_jpeg(face_image: Optional[str] = None, size=PHONE_SIZE, seed: int = 42) -> bytes:
+    """JPEG de 12 MP; sem foto, ruído suavizado (tamanho de arquivo próximo ao de uma foto real)"""
+    if face_image:
+        source = Image.open(face_image).convert('RGB')
+    else:
+        rng = np.random.default_rng(seed)
+        source = Image.fromarray(rng.integers(0, 256, size=(300, 400, 3), dtype=np.uint8))
+    buffer = io.BytesIO()
+    source.resize(size, Image.BICUBIC).save(buffer, format='JPEG', quality=92)
+    return buffer.getvalue()
+
+
+def full_decode(data: bytes) -> np.ndarray:
+    """Caminho anterior: decodificação em resolução total + conversão para RGB"""
+    return np.array(Image.open(io.BytesIO(data)).convert('RGB'))
+
+
+VARIANTS: Dict[str, Callable[[bytes], np.ndarray]] = {
+    'full_decode': full_decode,
+    'decode_image': decode_image,
+}
+
+
+def _proc_status_kb(field: str) -> int:
+    with open('/proc/self/status') as status_file:
+        for line in status_file:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _reset_peak_rss() -> bool:
+    """Zera o pico de RSS do processo (Linux); False se não suportado"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _max_rss_kb() -> int:
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _peak_worker(variant: str, data: bytes, queue) -> None:
+    # O pico acumulado dos imports (OpenCV, numpy, módulos da suíte) esconderia
+    # o da decodificação: no Linux ele é zerado antes de medir
+    if _reset_peak_rss():
+        before = _proc_status_kb('VmRSS')
+        VARIANTS[variant](data)
+        queue.put(_proc_status_kb('VmHWM') - before)
+        return
+
+    before = _max_rss_kb()
+    VARIANTS[variant](data)
+    queue.put(_max_rss_kb() - before)
+
+
+def peak_memory_mb(variant: str, data: bytes) -> float:
+    """Pico de memória da decodificação, medido num processo novo (spawn)"""
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_peak_worker, args=(variant, data, queue))
+    process.start()
+    delta_kb = queue.get()
+    process.join()
+    return round(delta_kb / 1024, 1)
+
+
+def run(results: BenchmarkResults, repeat: int = 5, face_image: Optional[str] = None) -> None:
+    data = phone_jpeg(face_image)
+    width, height = PHONE_SIZE
+    print(f"\n🖼️  Ingestão de imagem ({width}x{height}, {len(data) / (1024 * 1024):.1f} MB, "
+          f"alvo {IMAGE_TARGET_SIDE}px)")
+
+    for variant, decode in VARIANTS.items():
+        stats = results.run(f"ingest.{variant}[{width}x{height}]", lambda decode=decode: decode(data), repeat)
+        shape = decode(data).shape
+        stats['peak_mb'] = peak_memory_mb(variant, data)
+        print(f"  {'':<55} pico {stats['peak_mb']:>6.1f} MB, saída {shape[1]}x{shape[0]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da ingestão de imagens de 12 MP")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--face-image", default=None, help="Foto usada como base (padrão: imagem sintética)")
+    args = parser.parse_args()
+    run(BenchmarkResults(), args.repeat, args.face_image)
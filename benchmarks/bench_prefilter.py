@@ -0,0 +1,106 @@
+"""
+Benchmarks do pré-filtro de presença de rosto (sem banco de dados).
+
+Mede generate_face_encoding com e sem o Haar cascade (FacePrefilter):
+- quadros vazios de quiosque: taxa de rejeição e latência
+- foto com rosto (--face-image): custo extra e se o rosto continua detectado
+
+Sem --empty-dir, os quadros vazios são ruído suavizado sintético: a taxa de
+rejeição medida assim não representa o cenário real. Para números úteis,
+capture quadros do quiosque sem ninguém na frente e passe o diretório.
+
+Uso isolado:
+    python -m benchmarks.bench_prefilter --face-image rosto.jpg --empty-dir capturas/vazias
+"""
+import argparse
+import io
+import os
+from typing import List, Optional
+import numpy as np
+from PIL import Image
+from facepass.services.face_prefilter import FacePrefilter
+from facepass.services.face_recognition_service import FaceRecognitionService
+from benchmarks.harness import BenchmarkResults
+
+FRAME_SIZE = (640, 480)
+
+
+def empty_frames(count: int, size=FRAME_SIZE, seed: int = 7) -> List[bytes]:
+    """Quadros JPEG sem rosto: ruído de baixa frequência, como fundo/cenário desfocado"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        noise = rng.integers(0, 256, size=(12, 16, 3), dtype=np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(noise).resize(size, Image.BICUBIC).save(buffer, format='JPEG', quality=85)
+        frames.append(buffer.getvalue())
+    return frames
+
+
+def scene_frames(directory: str, size=FRAME_SIZE) -> List[bytes]:
+    """Quadros reais sem rosto (fotos do local vazio), redimensionados para o tamanho do quiosque"""
+    frames = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(('.jpg', '.jpeg', '.png')):
+            frames.append(face_frame(os.path.join(directory, name), size))
+    return frames
+
+
+def face_frame(face_image: str, size=FRAME_SIZE) -> bytes:
+    buffer = io.BytesIO()
+    Image.open(face_image).convert('RGB').resize(size).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def run(results: BenchmarkResults, repeat: int = 5, face_image: Optional[str] = None, frames: int = 20,
+        empty_dir: Optional[str] = None) -> None:
+    width, height = FRAME_SIZE
+    if empty_dir:
+        empty = scene_frames(empty_dir)
+        frames = len(empty)
+        source = f"reais de {empty_dir}"
+    else:
+        empty = empty_frames(frames)
+        source = "sintéticos"
+    print(f"\n🚪 Pré-filtro de rosto ({frames} quadros vazios {source}, {width}x{height})")
+    if not empty_dir:
+        print("  ⚠️  Ruído sintético não representa o fundo real do quiosque; "
+              "use --empty-dir com capturas do local vazio")
+
+    baseline = FaceRecognitionService(None, prefilter=FacePrefilter(enabled=False))
+    prefilter = FacePrefilter(enabled=True)
+    filtered = FaceRecognitionService(None, prefilter=prefilter)
+
+    without = results.run(f"prefilter.off.empty[{frames}x{width}x{height}]",
+                          lambda: [baseline.generate_face_encoding(frame) for frame in empty], repeat)
+    prefilter.checked = prefilter.rejected = 0
+    with_prefilter = results.run(
+        f"prefilter.on.empty[{frames}x{width}x{height}]",
+        lambda: [filtered.generate_face_encoding(frame, use_prefilter=True) for frame in empty], repeat)
+
+    stats = prefilter.stats()
+    saving = 1 - with_prefilter['median_ms'] / without['median_ms'] if without['median_ms'] else 0.0
+    print(f"  rejeitados pelo cascade: {stats['rejected']}/{stats['checked']} ({stats['reject_rate']:.0%}), "
+          f"{with_prefilter['median_ms'] / frames:.1f} ms/quadro vs {without['median_ms'] / frames:.1f} ms "
+          f"({saving:.0%} menos)")
+
+    if face_image:
+        image = face_frame(face_image)
+        results.run(f"prefilter.off.face[{width}x{height}]", lambda: baseline.generate_face_encoding(image), repeat)
+        results.run(f"prefilter.on.face[{width}x{height}]",
+                    lambda: filtered.generate_face_encoding(image, use_prefilter=True), repeat)
+        found = filtered.generate_face_encoding(image, use_prefilter=True) is not None
+        expected = baseline.generate_face_encoding(image) is not None
+        if expected and not found:
+            print("  ⚠️  O pré-filtro descartou um rosto que o dlib detecta (ajuste FACE_PREFILTER_*)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do pré-filtro de presença de rosto")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=20, help="Quantidade de quadros vazios")
+    parser.add_argument("--face-image", default=None, help="Foto com rosto (verifica falsos descartes)")
+    parser.add_argument("--empty-dir", default=None,
+                        help="Diretório com fotos reais do local sem ninguém (substitui os quadros sintéticos)")
+    args = parser.parse_args()
+    run(BenchmarkResults(), args.repeat, args.face_image, args.frames, args.empty_dir)
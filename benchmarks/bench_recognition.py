@@ -0,0 +1,74 @@
+"""
+Benchmarks do reconhecimento facial (sem banco de dados).
+
+- generate_face_encoding em imagens de resoluções diferentes
+- identify_face com galerias sintéticas (repositório em memória)
+- FaceEncoding.to_bytes / from_bytes
+"""
+import io
+from typing import List, Optional, Sequence
+import numpy as np
+from PIL import Image
+from facepass.models.faceEncoding import FaceEncoding
+from facepass.services.face_recognition_service import FaceRecognitionService
+from benchmarks.harness import BenchmarkResults
+
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 960), (1920, 1440)]
+GALLERY_SIZES = [1000, 10000, 100000]
+
+
+class InMemoryEncodingRepository:
+    """Substitui FaceEncodingRepository com encodings sintéticos em memória"""
+
+    def __init__(self, encodings: List[FaceEncoding]):
+        self.encodings = encodings
+
+    def get_all_encodings(self) -> List[FaceEncoding]:
+        return self.encodings
+
+    def get_encoding_by_user_id(self, user_id: int) -> Optional[FaceEncoding]:
+        return self.encodings[user_id - 1] if 0 < user_id <= len(self.encodings) else None
+
+
+def synthetic_gallery(rng, size: int) -> List[FaceEncoding]:
+    vectors = rng.normal(0.0, 0.1, size=(size, 128))
+    return [FaceEncoding(user_id, vector, id=user_id) for user_id, vector in enumerate(vectors, start=1)]
+
+
+def jpeg_bytes(image: Image.Image, size) -> bytes:
+    buffer = io.BytesIO()
+    image.convert('RGB').resize(size).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def run(results: BenchmarkResults, repeat: int = 5, gallery_sizes: Sequence[int] = GALLERY_SIZES,
+        face_image: Optional[str] = None, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+
+    print("\n🔢 FaceEncoding (serialização)")
+    vector = rng.normal(0.0, 0.1, size=128)
+    encoding = FaceEncoding(1, vector)
+    data = encoding.to_bytes()
+    results.run("encoding.to_bytes", lambda: [encoding.to_bytes() for _ in range(1000)], repeat)
+    results.run("encoding.from_bytes", lambda: [FaceEncoding.from_bytes(data) for _ in range(1000)], repeat)
+
+    print("\n📷 generate_face_encoding")
+    # Sem foto real, a imagem sintética não tem rosto: mede decodificação + detecção
+    if face_image:
+        source = Image.open(face_image)
+    else:
+        source = Image.fromarray(rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8))
+    service = FaceRecognitionService(InMemoryEncodingRepository([]))
+    for width, height in RESOLUTIONS:
+        image = jpeg_bytes(source, (width, height))
+        results.run(f"generate_face_encoding[{width}x{height}]",
+                    lambda image=image: service.generate_face_encoding(image), repeat)
+
+    print("\n🔎 identify_face (galeria sintética)")
+    probe = rng.normal(0.0, 0.1, size=128)
+    for size in gallery_sizes:
+        gallery_service = FaceRecognitionService(InMemoryEncodingRepository(synthetic_gallery(rng, size)))
+        # Isola a busca: o encoding da imagem de entrada é fixo
+        gallery_service.generate_face_encoding = lambda _image, use_prefilter=False: probe
+        results.run(f"identify_face[gallery={size}]",
+                    lambda gallery_service=gallery_service: gallery_service.identify_face(b''), repeat)
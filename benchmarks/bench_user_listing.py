@@ -0,0 +1,84 @@
+"""
+Benchmark da listagem de usuários (UsuarioRepository).
+
+Compara a listagem enxuta (sem o BLOB photo_recognition) com a consulta
+completa antiga, sobre N usuários sintéticos inseridos numa transação que é
+desfeita ao final (o banco não é alterado).
+
+Uso:
+    python -m benchmarks.bench_user_listing --users 10000 --repeat 5
+"""
+import argparse
+import os
+import uuid
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.database.setup_database.executor_query import QueryExecutor
+from facepass.database.repository.user_repository import UsuarioRepository
+from benchmarks.harness import BenchmarkResults
+
+dotenv.load_dotenv()
+
+FULL_LISTING_QUERY = """
+    SELECT id, name, email, cpf, created_at, photo_recognition, position, approved FROM users
+"""
+
+
+def insert_synthetic_users(conn, count: int, photo_size: int) -> None:
+    """Insere usuários sintéticos sem commit (visíveis apenas nesta conexão)"""
+    prefix = uuid.uuid4().hex[:8]
+    photo = os.urandom(photo_size)
+    rows = [
+        (f"Bench User {i}", f"bench.{prefix}.{i}@facepass.com",
+         f"9{i:010d}", photo, "Desenvolvedor", i % 3 != 0)
+        for i in range(count)
+    ]
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("""
+            INSERT INTO users (name, email, cpf, photo_recognition, position, approved)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows)
+    finally:
+        cursor.close()
+
+
+def run(results: BenchmarkResults, repeat: int = 5, users: int = 10000, photo_size: int = 50000) -> None:
+    db_connection = DatabaseConnection(
+        os.getenv('DB_HOST', 'localhost'),
+        os.getenv('DB_USER', 'root'),
+        os.getenv('DB_PASSWORD', ''),
+        os.getenv('DB_NAME', 'facepass_db'),
+        int(os.getenv('DB_PORT', '3306'))
+    )
+    db_connection.connect()
+    conn = db_connection.get_connection()
+    if conn is None:
+        print("⚠️  Banco indisponível, pulando benchmarks da listagem de usuários")
+        return
+
+    repository = UsuarioRepository(conn)
+    executor = QueryExecutor(conn)
+
+    try:
+        print(f"\n👥 Listagem de usuários ({users} sintéticos, foto de {photo_size} bytes)")
+        insert_synthetic_users(conn, users, photo_size)
+
+        full = results.run(f"user_listing.list_all_users_with_blob[{users}]",
+                           lambda: executor.execute_query(FULL_LISTING_QUERY), repeat)
+        slim = results.run(f"user_listing.list_all_users[{users}]", repository.list_all_users, repeat)
+        results.run(f"user_listing.list_unapproved_users[{users}]", repository.list_unapproved_users, repeat)
+        if slim['median_ms'] > 0:
+            print(f"  {'':<55} ganho {full['median_ms'] / slim['median_ms']:.1f}x")
+    finally:
+        conn.rollback()
+        db_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--photo-size", type=int, default=50000)
+    args = parser.parse_args()
+    run(BenchmarkResults(), args.repeat, args.users, args.photo_size)
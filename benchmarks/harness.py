@@ -0,0 +1,91 @@
+"""
+Utilitários comuns dos benchmarks: medição, baseline em JSON e relatório de
+comparação.
+"""
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+def measure(func: Callable[[], object], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Executa `func` `warmup` + `repeat` vezes e retorna estatísticas em ms"""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p95_index = min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[p95_index], 3),
+        'min_ms': round(timings[0], 3),
+        'runs': repeat
+    }
+
+
+class BenchmarkResults:
+    """Coleta os resultados de uma execução da suíte, indexados por nome"""
+
+    def __init__(self):
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def run(self, name: str, func: Callable[[], object], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+        stats = measure(func, repeat, warmup)
+        self.results[name] = stats
+        print(f"  {name:<55} {stats['median_ms']:>10.3f} ms (p95 {stats['p95_ms']:.3f})")
+        return stats
+
+    def save(self, path: str) -> None:
+        payload = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': self.results
+        }
+        with open(path, 'w', encoding='utf-8') as baseline_file:
+            json.dump(payload, baseline_file, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)['results']
+
+
+def compare(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]],
+            threshold: float = 0.10) -> List[Dict[str, Optional[float]]]:
+    """
+    Compara as medianas atuais com a baseline.
+
+    Uma regressão é uma mediana mais de `threshold` (fração) acima da baseline.
+    """
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        before = baseline.get(name, {}).get('median_ms')
+        after = current.get(name, {}).get('median_ms')
+        change = (after - before) / before if before and after is not None else None
+        rows.append({
+            'name': name,
+            'baseline_ms': before,
+            'current_ms': after,
+            'change': change,
+            'regression': change is not None and change > threshold
+        })
+    return rows
+
+
+def print_report(rows: List[Dict[str, Optional[float]]]) -> None:
+    print(f"\n{'benchmark':<55} {'baseline':>12} {'atual':>12} {'variação':>10}")
+    for row in rows:
+        before = f"{row['baseline_ms']:.3f}" if row['baseline_ms'] is not None else "-"
+        after = f"{row['current_ms']:.3f}" if row['current_ms'] is not None else "-"
+        change = f"{row['change'] * 100:+.1f}%" if row['change'] is not None else "-"
+        flag = "  ❌ regressão" if row['regression'] else ""
+        print(f"{row['name']:<55} {before:>12} {after:>12} {change:>10}{flag}")
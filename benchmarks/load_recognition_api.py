@@ -0,0 +1,93 @@
+"""
+Teste de carga local da API de reconhecimento (facepass.api.recognition_server).
+
+Abre N conexões keep-alive e envia a mesma foto repetidamente, medindo
+vazão e latência (p50/p95/p99). Suba a API antes:
+
+    python -m facepass.api.recognition_server --workers 4
+    python -m benchmarks.load_recognition_api rosto.jpg --requests 500 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import List, Tuple
+
+
+async def send(reader, writer, host: str, path: str, image: bytes, token: str) -> Tuple[int, dict, bool]:
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: image/jpeg\r\n"
+            f"Content-Length: {len(image)}\r\n")
+    if token:
+        head += f"Authorization: Bearer {token}\r\n"
+    writer.write(head.encode('latin-1') + b"\r\n" + image)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    close = False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+        elif name.lower() == 'connection':
+            close = value.strip().lower() == 'close'
+    return status, json.loads(await reader.readexactly(length)), close
+
+
+async def client(host: str, port: int, path: str, image: bytes, token: str,
+                 remaining: List[int], latencies: List[float], statuses: dict) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            status, _, close = await send(reader, writer, host, path, image, token)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if close:
+                # Respostas de erro encerram a conexão
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, path: str, image: bytes, requests: int,
+                   concurrency: int, token: str = '') -> None:
+    remaining = [requests]
+    latencies: List[float] = []
+    statuses: dict = {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, path, image, token, remaining, latencies, statuses)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    percentiles = statistics.quantiles(latencies_ms, n=100) if len(latencies_ms) > 1 else latencies_ms * 99
+    print(f"📈 {len(latencies_ms)} requisições em {elapsed:.1f}s ({len(latencies_ms) / elapsed:.1f} req/s)")
+    print(f"   p50 {percentiles[49]:.0f} ms | p95 {percentiles[94]:.0f} ms | "
+          f"p99 {percentiles[98]:.0f} ms | máx {latencies_ms[-1]:.0f} ms")
+    print(f"   status: {statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga da API de reconhecimento")
+    parser.add_argument("image", help="Foto JPEG enviada em cada requisição")
+    parser.add_argument("--host", default=os.getenv('RECOGNITION_API_HOST', '127.0.0.1'))
+    parser.add_argument("--port", type=int, default=int(os.getenv('RECOGNITION_API_PORT', '8090')))
+    parser.add_argument("--path", default="/access?manager_id=1&location=Teste%20de%20carga")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--token", default=os.getenv('RECOGNITION_API_TOKEN', ''))
+    args = parser.parse_args()
+
+    with open(args.image, 'rb') as image_file:
+        image_bytes = image_file.read()
+    asyncio.run(run_load(args.host, args.port, args.path, image_bytes,
+                         args.requests, args.concurrency, args.token))
@@ -0,0 +1,59 @@
+"""
+Suíte de benchmarks do FacePass com baseline em JSON.
+
+Uso:
+    python -m benchmarks.run_suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_suite --compare benchmarks/baseline.json
+
+Com --compare, imprime o relatório de variação e sai com código 1 se
+alguma mediana piorar mais que --threshold (padrão 10%).
+"""
+import argparse
+import sys
+from benchmarks import bench_recognition, bench_dashboard, bench_ingest, bench_prefilter, bench_user_listing
+from benchmarks.harness import BenchmarkResults, compare, load_baseline, print_report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gallery-sizes", default=",".join(map(str, bench_recognition.GALLERY_SIZES)),
+                        help="Tamanhos de galeria para identify_face (ex.: 1000,10000,100000,1000000)")
+    parser.add_argument("--face-image", default=None,
+                        help="Foto com rosto para generate_face_encoding (padrão: imagem sintética)")
+    parser.add_argument("--skip-db", action="store_true",
+                        help="Não executa os benchmarks do dashboard e da listagem de usuários")
+    parser.add_argument("--listing-users", type=int, default=10000,
+                        help="Usuários sintéticos da listagem (inseridos e desfeitos ao final)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Grava os resultados como baseline JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compara com uma baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Piora tolerada (fração)")
+    args = parser.parse_args()
+
+    results = BenchmarkResults()
+    gallery_sizes = [int(size) for size in args.gallery_sizes.split(",") if size]
+    bench_recognition.run(results, args.repeat, gallery_sizes, args.face_image)
+    bench_ingest.run(results, args.repeat, args.face_image)
+    bench_prefilter.run(results, args.repeat, args.face_image)
+    if not args.skip_db:
+        bench_dashboard.run(results, args.repeat)
+        bench_user_listing.run(results, args.repeat, args.listing_users)
+
+    if args.save_baseline:
+        results.save(args.save_baseline)
+        print(f"\n💾 Baseline gravada em {args.save_baseline}")
+
+    if args.compare:
+        rows = compare(load_baseline(args.compare), results.results, args.threshold)
+        print_report(rows)
+        regressions = [row['name'] for row in rows if row['regression']]
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressão(ões) acima de {args.threshold:.0%}")
+            return 1
+        print("\n✅ Nenhuma regressão")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
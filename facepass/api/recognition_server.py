@@ -0,0 +1,348 @@
+"""
+API HTTP de reconhecimento facial para quiosques, independente do Streamlit.
+
+Servidor asyncio enxuto: as requisições são lidas no event loop e o
+reconhecimento roda num pool de processos (facepass.api.recognition_worker),
+cada um com sua conexão ao banco, seus services e sua galeria de encodings
+em memória. O número de tentativas em processamento é limitado (excedentes
+aguardam na fila até RECOGNITION_API_QUEUE_TIMEOUT e então recebem 503).
+
+Fora de localhost, a API só sobe com RECOGNITION_API_TOKEN configurado.
+
+Endpoints (corpo image/jpeg, image/png ou multipart/form-data):
+    POST /access?manager_id=1&location=Entrada       -> process_access_attempt
+    POST /verify?user_id=42                          -> verify_user_face
+    POST /access/batch?manager_id=1                  -> várias imagens (multipart)
+    GET  /health
+    GET  /metrics                                    -> texto Prometheus
+
+Uso:
+    python -m facepass.api.recognition_server --port 8090 --workers 4
+    curl -X POST --data-binary @rosto.jpg -H "Content-Type: image/jpeg" \\
+        "http://127.0.0.1:8090/access?manager_id=1"
+"""
+import argparse
+import asyncio
+import hmac
+import ipaddress
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import dotenv
+from facepass.api.recognition_worker import init_worker, run_in_worker
+from facepass.services.metrics import metrics
+
+dotenv.load_dotenv()
+
+RECOGNITION_API_HOST = os.getenv('RECOGNITION_API_HOST', '127.0.0.1')
+RECOGNITION_API_PORT = int(os.getenv('RECOGNITION_API_PORT', '8090'))
+RECOGNITION_API_WORKERS = int(os.getenv('RECOGNITION_API_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Tentativas em processamento ao mesmo tempo (padrão: uma por worker)
+RECOGNITION_API_MAX_CONCURRENCY = int(os.getenv('RECOGNITION_API_MAX_CONCURRENCY', '0')) or RECOGNITION_API_WORKERS
+RECOGNITION_API_QUEUE_TIMEOUT = float(os.getenv('RECOGNITION_API_QUEUE_TIMEOUT', '10'))
+# Token compartilhado com os quiosques (Authorization: Bearer <token>); vazio desativa
+RECOGNITION_API_TOKEN = os.getenv('RECOGNITION_API_TOKEN', '')
+KIOSK_MANAGER_ID = int(os.getenv('KIOSK_MANAGER_ID', '1'))
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH_IMAGES = 32
+MAX_HEADERS = 100
+KEEPALIVE_TIMEOUT = 15.0
+IMAGE_CONTENT_TYPES = ('image/jpeg', 'image/png', 'application/octet-stream')
+
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+           405: 'Method Not Allowed', 411: 'Length Required', 413: 'Payload Too Large',
+           415: 'Unsupported Media Type', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get('connection', '').lower() != 'close'
+
+    def int_param(self, name: str, default: Optional[int] = None) -> int:
+        value = self.query.get(name)
+        if value is None:
+            if default is None:
+                raise HttpError(400, f"Parâmetro obrigatório ausente: {name}")
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HttpError(400, f"Parâmetro inválido: {name}")
+
+    def images(self) -> List[bytes]:
+        """Imagens do corpo: o próprio corpo (image/*) ou os arquivos de um multipart"""
+        content_type = self.headers.get('content-type', '')
+        if content_type.startswith('multipart/form-data'):
+            message = BytesParser(policy=HTTP).parsebytes(
+                b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + self.body)
+            if not message.is_multipart():
+                raise HttpError(400, "Corpo multipart inválido")
+            images = [part.get_payload(decode=True) for part in message.iter_parts()
+                      if part.get_filename() or part.get_content_type().startswith('image/')]
+        elif content_type.split(';')[0].strip() in IMAGE_CONTENT_TYPES:
+            images = [self.body]
+        else:
+            raise HttpError(415, "Envie image/jpeg, image/png ou multipart/form-data")
+
+        images = [image for image in images if image]
+        if not images:
+            raise HttpError(400, "Nenhuma imagem no corpo da requisição")
+        return images
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return None
+    if not request_line.strip():
+        return None
+
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, "Linha de requisição inválida")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HttpError(400, "Cabeçalhos demais")
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HttpError(411, "Transfer-Encoding chunked não suportado; envie Content-Length")
+    try:
+        length = int(headers.get('content-length', '0'))
+    except ValueError:
+        raise HttpError(400, "Content-Length inválido")
+    if length < 0:
+        raise HttpError(400, "Content-Length inválido")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, f"Corpo maior que {MAX_BODY_BYTES} bytes")
+
+    body = await reader.readexactly(length) if length else b''
+    return Request(method.upper(), target, headers, body)
+
+
+async def write_response(writer: asyncio.StreamWriter, status: int, payload: Any,
+                         keep_alive: bool, content_type: str = 'application/json; charset=utf-8') -> None:
+    if isinstance(payload, str):
+        body = payload.encode('utf-8')
+    else:
+        body = json.dumps(payload, default=str, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class RecognitionWorkers:
+    """Pool de processos de reconhecimento; agrega a telemetria devolvida pelos workers"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=init_worker)
+        # Última telemetria de cada processo (galeria e pré-filtro são por processo)
+        self._telemetry: Dict[int, Dict[str, Any]] = {}
+
+    async def run(self, method: str, *args) -> Dict:
+        loop = asyncio.get_running_loop()
+        result, telemetry = await loop.run_in_executor(self.pool, run_in_worker, method, args)
+        metrics.merge(telemetry.pop('metrics'))
+        self._telemetry[telemetry['pid']] = telemetry
+        return result
+
+    def health(self) -> Dict[str, Any]:
+        reports = list(self._telemetry.values())
+        checked = sum(report['prefilter']['checked'] for report in reports)
+        rejected = sum(report['prefilter']['rejected'] for report in reports)
+        return {
+            'workers': self.workers,
+            'gallery_size': max((report['gallery_size'] for report in reports), default=0),
+            'prefilter': {
+                'checked': checked,
+                'rejected': rejected,
+                'reject_rate': round(rejected / checked, 3) if checked else 0.0
+            }
+        }
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True)
+
+
+class RecognitionApi:
+    def __init__(self, workers: RecognitionWorkers, max_concurrency: int = RECOGNITION_API_MAX_CONCURRENCY,
+                 queue_timeout: float = RECOGNITION_API_QUEUE_TIMEOUT, token: str = RECOGNITION_API_TOKEN):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.token = token
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def _recognize(self, method: str, *args) -> Dict:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(503, "Servidor ocupado, tente novamente")
+        try:
+            return await self.workers.run(method, *args)
+        finally:
+            self._slots.release()
+
+    def _authorize(self, request: Request) -> None:
+        if not self.token:
+            return
+        supplied = request.headers.get('authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied.encode(), self.token.encode()):
+            raise HttpError(401, "Token inválido")
+
+    async def dispatch(self, request: Request) -> Tuple[int, Any]:
+        if request.method == 'GET' and request.path == '/health':
+            return 200, dict(status='ok', **self.workers.health())
+        if request.method == 'GET' and request.path == '/metrics':
+            return 200, metrics.render_prometheus()
+
+        routes = {'/access': self.access, '/verify': self.verify, '/access/batch': self.access_batch}
+        handler = routes.get(request.path)
+        if handler is None:
+            raise HttpError(404, "Rota não encontrada")
+        if request.method != 'POST':
+            raise HttpError(405, "Use POST")
+
+        self._authorize(request)
+        return 200, await handler(request)
+
+    async def access(self, request: Request) -> Dict:
+        image = request.images()[0]
+        manager_id = request.int_param('manager_id', KIOSK_MANAGER_ID)
+        location = request.query.get('location', 'Entrada Principal')
+        return await self._recognize('process_access_attempt', image, manager_id, location)
+
+    async def verify(self, request: Request) -> Dict:
+        image = request.images()[0]
+        user_id = request.int_param('user_id')
+        return await self._recognize('verify_user_face', user_id, image)
+
+    async def access_batch(self, request: Request) -> Dict:
+        images = request.images()
+        if len(images) > MAX_BATCH_IMAGES:
+            raise HttpError(413, f"Máximo de {MAX_BATCH_IMAGES} imagens por lote")
+        manager_id = request.int_param('manager_id', KIOSK_MANAGER_ID)
+        location = request.query.get('location', 'Entrada Principal')
+
+        results = await asyncio.gather(
+            *(self._recognize('process_access_attempt', image, manager_id, location) for image in images),
+            return_exceptions=True)
+        results = [
+            {'success': False, 'message': result.message if isinstance(result, HttpError) else 'Erro ao processar imagem',
+             'data': None, 'errors': [str(result)]}
+            if isinstance(result, Exception) else result
+            for result in results
+        ]
+        return {
+            'success': all(result['success'] for result in results),
+            'message': f"{len(results)} imagem(ns) processada(s)",
+            'data': results,
+            'errors': []
+        }
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    status, payload = await self.dispatch(request)
+                    keep_alive = request.keep_alive
+                except HttpError as e:
+                    status, keep_alive = e.status, False
+                    payload = {'success': False, 'message': e.message, 'data': None, 'errors': [e.message]}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, keep_alive = 500, False
+                    payload = {'success': False, 'message': 'Erro interno', 'data': None, 'errors': [str(e)]}
+
+                content_type = 'text/plain; version=0.0.4; charset=utf-8' if isinstance(payload, str) \
+                    else 'application/json; charset=utf-8'
+                await write_response(writer, status, payload, keep_alive, content_type)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = RECOGNITION_API_HOST, port: int = RECOGNITION_API_PORT,
+                workers: int = RECOGNITION_API_WORKERS,
+                max_concurrency: int = RECOGNITION_API_MAX_CONCURRENCY,
+                token: str = RECOGNITION_API_TOKEN) -> None:
+    # /verify é um oráculo de identidade e /access grava registros: sem token, só em localhost
+    if not token and not is_loopback(host):
+        raise RuntimeError(f"Defina RECOGNITION_API_TOKEN para expor a API em {host}")
+
+    recognition_workers = RecognitionWorkers(workers)
+    api = RecognitionApi(recognition_workers, max_concurrency, token=token)
+
+    server = await asyncio.start_server(api.handle_connection, host, port)
+    print(f"🚀 API de reconhecimento em http://{host}:{port} "
+          f"({workers} workers, até {max_concurrency} tentativas simultâneas)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        recognition_workers.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API HTTP de reconhecimento facial para quiosques")
+    parser.add_argument("--host", default=RECOGNITION_API_HOST)
+    parser.add_argument("--port", type=int, default=RECOGNITION_API_PORT)
+    parser.add_argument("--workers", type=int, default=RECOGNITION_API_WORKERS)
+    parser.add_argument("--max-concurrency", type=int, default=RECOGNITION_API_MAX_CONCURRENCY)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_concurrency))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+    except KeyboardInterrupt:
+        print("\n👋 API encerrada")
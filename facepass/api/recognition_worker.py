@@ -0,0 +1,95 @@
+"""
+Processos do pool de reconhecimento da API (facepass.api.recognition_server).
+
+A detecção HOG e o encoding do dlib seguram o GIL, então threads não passam
+de um núcleo: cada worker é um processo com sua conexão MySQL, seus services
+e sua própria FaceGallery. As métricas e contadores do processo voltam junto
+com cada resultado para serem agregados no processo da API.
+
+Os módulos do reconhecimento (dlib, OpenCV) são importados só nos workers.
+"""
+import atexit
+import os
+from typing import Any, Dict, Tuple
+
+# Estado do processo worker, criado por init_worker
+_state: Dict[str, Any] = {}
+
+
+def build_controller(connection, gallery):
+    """Mesma composição do init_services, só com o necessário para o reconhecimento"""
+    from facepass.database.repository.user_repository import UsuarioRepository
+    from facepass.database.repository.notification_repository import NotificationRepository
+    from facepass.database.repository.register_repository import RegistroRepository
+    from facepass.database.repository.face_encoding_repository import FaceEncodingRepository
+    from facepass.database.repository.daily_hours_repository import DailyHoursRepository
+    from facepass.services.access_service import AccessService
+    from facepass.services.user_service import UsuarioService
+    from facepass.services.face_recognition_service import FaceRecognitionService
+    from facepass.controllers.face_recognition_controller import FaceRecognitionController
+
+    usuario_repository = UsuarioRepository(connection)
+    notification_repository = NotificationRepository(connection)
+
+    user_service = UsuarioService(usuario_repository, notification_repository)
+    access_service = AccessService(
+        RegistroRepository(connection),
+        notification_repository,
+        usuario_repository,
+        DailyHoursRepository(connection)
+    )
+    face_recognition_service = FaceRecognitionService(FaceEncodingRepository(connection), gallery)
+    return FaceRecognitionController(face_recognition_service, user_service, access_service)
+
+
+def init_worker() -> None:
+    """Initializer do ProcessPoolExecutor"""
+    from facepass.services import metrics as metrics_module
+    from facepass.services.face_gallery import FaceGallery
+
+    # O processo da API exporta as métricas agregadas; os workers não gravam METRICS_FILE
+    metrics_module.METRICS_FILE = ''
+    _state['gallery'] = FaceGallery()
+    atexit.register(_close_connection)
+
+
+def _close_connection() -> None:
+    db_connection = _state.get('db_connection')
+    if db_connection is not None:
+        db_connection.close()
+
+
+def _controller():
+    from facepass.database.setup_database.connection import DatabaseConnection
+
+    db_connection = _state.get('db_connection')
+    connection = db_connection.get_connection() if db_connection else None
+    if connection is None or not connection.is_connected():
+        db_connection = DatabaseConnection(
+            os.getenv('DB_HOST', 'localhost'),
+            os.getenv('DB_USER', 'root'),
+            os.getenv('DB_PASSWORD', ''),
+            os.getenv('DB_NAME', 'facepass_db'),
+            int(os.getenv('DB_PORT', '3306'))
+        )
+        db_connection.connect()
+        if db_connection.get_connection() is None:
+            raise RuntimeError("Banco de dados indisponível")
+        _state['db_connection'] = db_connection
+        _state['controller'] = build_controller(db_connection.get_connection(), _state['gallery'])
+    return _state['controller']
+
+
+def run_in_worker(method: str, args: Tuple) -> Tuple[Dict, Dict[str, Any]]:
+    """Executa um método do controller; retorna (resultado, telemetria do processo)"""
+    from facepass.services.face_prefilter import face_prefilter
+    from facepass.services.metrics import metrics
+
+    result = getattr(_controller(), method)(*args)
+    telemetry = {
+        'pid': os.getpid(),
+        'gallery_size': len(_state['gallery']),
+        'prefilter': face_prefilter.stats(),
+        'metrics': metrics.drain()
+    }
+    return result, telemetry
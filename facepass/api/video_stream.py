@@ -0,0 +1,109 @@
+"""
+Modo de vídeo: reconhecimento contínuo a partir de um arquivo, câmera ou URL.
+
+Os rostos são rastreados entre quadros e cada pessoa gera um único registro
+de acesso (encoding e identificação só para rostos novos ou em rechecagens
+de baixa confiança). Ao final, imprime a vazão em quadros por segundo.
+
+Uso:
+    python -m facepass.api.video_stream 0 --location "Portaria"          # câmera 0
+    python -m facepass.api.video_stream rtsp://camera/stream --frame-skip 4
+    python -m facepass.api.video_stream amostra.mp4 --no-register         # só mede a vazão
+"""
+import argparse
+import os
+import cv2
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.services.face_gallery import FaceGallery
+from facepass.services.video_stream_service import VideoStreamProcessor
+from facepass.api.recognition_server import KIOSK_MANAGER_ID
+from facepass.api.recognition_worker import build_controller
+
+dotenv.load_dotenv()
+
+
+def print_stats(stats: dict) -> None:
+    print(f"  ⏱️  {stats['frames_read']} quadros ({stats['fps']} fps lidos, "
+          f"{stats['processed_fps']} fps processados), {stats['encodings']} encodings, "
+          f"{stats['events']} eventos")
+
+
+def run_video_stream(source: str, manager_id: int = KIOSK_MANAGER_ID, location: str = "Entrada Principal",
+                     frame_skip: int = 2, detection_scale: float = 0.5, confident_threshold: float = 0.5,
+                     max_attempts: int = 3, max_frames: int = None, register: bool = True) -> None:
+    host = os.getenv('DB_HOST', 'localhost')
+    port = int(os.getenv('DB_PORT', '3306'))
+
+    print(f"🔗 Conectando ao MySQL em {host}:{port}...")
+    db_connection = DatabaseConnection(
+        host,
+        os.getenv('DB_USER', 'root'),
+        os.getenv('DB_PASSWORD', ''),
+        os.getenv('DB_NAME', 'facepass_db'),
+        port
+    )
+    db_connection.connect()
+    conn = db_connection.get_connection()
+
+    if conn is None:
+        print("❌ Erro: Não foi possível estabelecer conexão com o banco de dados.")
+        return
+
+    capture = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    if not capture.isOpened():
+        print(f"❌ Não foi possível abrir o vídeo: {source}")
+        db_connection.close()
+        return
+
+    controller = build_controller(conn, FaceGallery())
+
+    def on_access(track, face_identify, image_bytes):
+        if not register:
+            who = f"usuário {face_identify[0]} ({face_identify[1]:.2f})" if face_identify else "desconhecido"
+            print(f"  👤 Trilha {track.id}: {who}")
+            return
+
+        result = controller.process_identified_access(face_identify, image_bytes, manager_id, location)
+        data = result.get('data') or {}
+        icon = '✅' if data.get('acesso_permitido') else '❌'
+        print(f"  {icon} Trilha {track.id}: {data.get('usuario_nome')} - {result['message']}")
+
+    processor = VideoStreamProcessor(
+        controller.face_recognition_service,
+        on_access,
+        frame_skip=frame_skip,
+        detection_scale=detection_scale,
+        confident_threshold=confident_threshold,
+        max_attempts=max_attempts
+    )
+
+    print(f"🎥 Processando {source} (1 a cada {frame_skip + 1} quadros)...")
+    try:
+        stats = processor.run(capture, max_frames=max_frames, report=print_stats)
+    except KeyboardInterrupt:
+        stats = processor.stats.summary()
+    finally:
+        capture.release()
+        db_connection.close()
+
+    print("✓ Fim do fluxo")
+    print_stats(stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconhecimento facial contínuo em um fluxo de vídeo")
+    parser.add_argument("source", help="Arquivo de vídeo, índice da câmera (ex.: 0) ou URL do fluxo")
+    parser.add_argument("--manager-id", type=int, default=KIOSK_MANAGER_ID)
+    parser.add_argument("--location", default="Entrada Principal")
+    parser.add_argument("--frame-skip", type=int, default=2, help="Quadros pulados entre dois processados")
+    parser.add_argument("--scale", type=float, default=0.5, help="Escala da imagem usada na detecção")
+    parser.add_argument("--confidence", type=float, default=0.5,
+                        help="Confiança a partir da qual a identificação não é rechecada")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Tentativas de identificação por rosto")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--no-register", action="store_true",
+                        help="Não grava registros de acesso (apenas identifica e mede)")
+    args = parser.parse_args()
+    run_video_stream(args.source, args.manager_id, args.location, args.frame_skip, args.scale,
+                     args.confidence, args.max_attempts, args.max_frames, not args.no_register)
@@ -1,6 +1,7 @@
-from typing import Dict, List
+from typing import BinaryIO, Dict, Iterable, Iterator
 from facepass.services.access_service import AccessService
 from datetime import datetime
+import io
 
 
 class AccessController:
@@ -120,22 +121,18 @@ class AccessController:
                 'errors': [str(e)]
             }
 
-    def export_registers_csv(self, registers: List[Dict]) -> str:
+    def iter_registers_csv(self, registers: Iterable[Dict]) -> Iterator[str]:
         """
-        Exporta registros para formato CSV
+        Gera o CSV dos registros linha a linha, sem acumular o arquivo em memória
 
         Args:
-            registers: Lista de registros a exportar
+            registers: Registros a exportar (lista ou iterador em streaming)
 
-        Returns:
-            String com conteudo CSV
+        Yields:
+            Cabeçalho e depois uma linha CSV por registro
         """
-        if not registers:
-            return "Nenhum registro disponivel"
-
         # Cabeçalho
-        csv_lines = [
-            "ID,Usuario,Data/Hora,Status,Tipo Acesso,Motivo Negacao\n"]
+        yield "ID,Usuario,Data/Hora,Status,Tipo Acesso,Motivo Negacao\n"
 
         # Dados
         for reg in registers:
@@ -152,6 +149,60 @@ class AccessController:
             linha += f"{'Permitido' if reg.get('access_allowed') else 'Negado'},"
             linha += f"{reg.get('type_access', '')},"
             linha += f"{reg.get('reason_denied', '')}\n"
-            csv_lines.append(linha)
+            yield linha
+
+    def write_registers_csv(self, registers: Iterable[Dict], output: BinaryIO) -> int:
+        """
+        Escreve o CSV dos registros em um arquivo binário (UTF-8), linha a linha
+
+        Returns:
+            Quantidade de registros escritos
+        """
+        total = -1
+        for total, linha in enumerate(self.iter_registers_csv(registers)):
+            output.write(linha.encode('utf-8'))
+        return total
+
+    def export_registers_csv(self, registers: Iterable[Dict]) -> str:
+        """
+        Exporta registros para formato CSV
 
-        return "".join(csv_lines)
+        Args:
+            registers: Registros a exportar (lista ou iterador em streaming)
+
+        Returns:
+            String com conteudo CSV
+        """
+        output = io.StringIO()
+        total = -1
+        for total, linha in enumerate(self.iter_registers_csv(registers)):
+            output.write(linha)
+
+        if total == 0:
+            return "Nenhum registro disponivel"
+
+        return output.getvalue()
+
+    def export_registers_csv_by_filters(self, user_name: str = "", status: str = "Todos",
+                                        location: str = "", start_date: str = "", end_date: str = "") -> io.BytesIO:
+        """
+        Exporta para CSV os registros dos filtros, lidos do banco em streaming
+        e escritos linha a linha no buffer (sem lista de linhas nem join),
+        pronto para o st.download_button
+
+        Returns:
+            Buffer binário (UTF-8) posicionado no início com o conteudo CSV
+        """
+        filters = {
+            'user_name': user_name,
+            'status': status,
+            'location': location,
+            'start_date': start_date,
+            'end_date': end_date
+        }
+        output = io.BytesIO()
+        total = self.write_registers_csv(self.access_service.iter_registers_by_filters(filters), output)
+        if total == 0:
+            output = io.BytesIO("Nenhum registro disponivel".encode('utf-8'))
+        output.seek(0)
+        return output
@@ -6,6 +6,7 @@ from facepass.services.user_service import UsuarioService
 from facepass.services.access_service import AccessService
 from facepass.models.user import Usuario
 from facepass.models.registerAccess import RegistroAcesso
+from facepass.services.metrics import span, trace_operation, get_last_trace
 
 
 class FaceRecognitionController:
@@ -51,98 +52,209 @@ class FaceRecognitionController:
             - data (dict): Dados do resultado do acesso
             - errors (list): Lista de erros, se houver
         """
+        # Tempos por etapa ficam disponíveis em get_last_access_breakdown()
+        with trace_operation('process_access_attempt'):
+            return self._process_access_attempt(image_bytes, manager_id, location)
+
+    def _process_access_attempt(self, image_bytes: bytes, manager_id: int, location: str) -> Dict:
         try:
             # 1. Tentar identificar o rosto
             face_identify = self.face_recognition_service.identify_face(image_bytes)
+            return self._register_access(face_identify, image_bytes, manager_id, location)
+
+        except Exception as e:
+            return self._access_error(location, e)
+
+    def process_identified_access(self, face_identify: Optional[Tuple[int, float]], image_bytes: bytes,
+                                  manager_id: int, location: str = "Entrada Principal") -> Dict:
+        """
+        Registra uma tentativa de acesso cujo rosto já foi identificado
+        (ex.: modo de vídeo, que identifica uma vez por rosto rastreado).
+
+        Arguments:
+            face_identify (Optional[Tuple[int, float]]): (user_id, confiança) ou None se desconhecido
+            image_bytes (bytes): Imagem (JPEG) guardada no registro
+            manager_id (int): ID do gestor para notificações
+            location (str): Local da tentativa de acesso
+
+        Returns:
+            Dict no mesmo formato de process_access_attempt
+        """
+        try:
+            return self._register_access(face_identify, image_bytes, manager_id, location)
+        except Exception as e:
+            return self._access_error(location, e)
+
+    def _register_access(self, face_identify: Optional[Tuple[int, float]], image_bytes: bytes,
+                         manager_id: int, location: str) -> Dict:
+        # Inicializar resultado padrão (acesso negado)
+        result = {
+            'acesso_permitido': False,
+            'usuario_id': None,
+            'usuario_nome': 'Desconhecido',
+            'usuario_cargo': None,
+            'confianca': 0.0,
+            'motivo_negacao': 'Rosto não reconhecido no sistema',
+            'data_hora': datetime.now(),
+            'local': location
+        }
 
-            # Inicializar resultado padrão (acesso negado)
-            result = {
+        # 2. Se rosto foi identificado
+        if face_identify:
+            user_id, confidence = face_identify
+
+            # 3. Buscar dados do usuário
+            with span('user_lookup'):
+                user_data = self.user_service.get_user_by_id(user_id)
+
+            if user_data:
+                user = Usuario.from_dict(user_data)
+
+                # 4. Validar se usuário está aprovado
+                if user.approved:
+                    # ACESSO PERMITIDO
+                    result = {
+                        'acesso_permitido': True,
+                        'usuario_id': user.id,
+                        'usuario_nome': user.name,
+                        'usuario_cargo': user.position,
+                        'confianca': confidence,
+                        'motivo_negacao': None,
+                        'data_hora': datetime.now(),
+                        'local': location
+                    }
+                else:
+                    # ACESSO NEGADO - Usuário não aprovado
+                    result = {
+                        'acesso_permitido': False,
+                        'usuario_id': user.id,
+                        'usuario_nome': user.name,
+                        'usuario_cargo': user.position,
+                        'confianca': confidence,
+                        'motivo_negacao': 'Usuário aguardando aprovação do gestor',
+                        'data_hora': datetime.now(),
+                        'local': location
+                    }
+            else:
+                # ACESSO NEGADO - Usuário não encontrado (caso raro)
+                result['motivo_negacao'] = 'Usuário não encontrado no sistema'
+
+        # 5. Registrar a tentativa de acesso
+        registro_acesso = RegistroAcesso(
+            id=0,
+            user_id=result['usuario_id'],
+            created_at=result['data_hora'],
+            type_access='Reconhecimento Facial',
+            access_allowed=result['acesso_permitido'],
+            reason_denied=result['motivo_negacao'],
+            captured_image=image_bytes
+        )
+
+        # 6. Salvar registro e disparar notificações se necessário
+        self.access_service.register_access_attempt(
+            registro=registro_acesso,
+            manager_id=manager_id,
+            user_name=result['usuario_nome'] if result['usuario_id'] else None
+        )
+
+        # 7. Retornar resultado padronizado
+        return {
+            'success': True,
+            'message': 'Acesso permitido' if result['acesso_permitido'] else 'Acesso negado',
+            'data': result,
+            'errors': []
+        }
+
+    def _access_error(self, location: str, error: Exception) -> Dict:
+        return {
+            'success': False,
+            'message': 'Erro ao processar reconhecimento facial',
+            'data': {
                 'acesso_permitido': False,
-                'usuario_id': None,
-                'usuario_nome': 'Desconhecido',
-                'usuario_cargo': None,
-                'confianca': 0.0,
-                'motivo_negacao': 'Rosto não reconhecido no sistema',
+                'usuario_nome': 'Erro',
+                'motivo_negacao': 'Erro no sistema de reconhecimento',
                 'data_hora': datetime.now(),
                 'local': location
+            },
+            'errors': [str(error)]
+        }
+
+    def get_last_access_breakdown(self) -> Dict:
+        """
+        Retorna os tempos por etapa da última tentativa de acesso processada.
+
+        Returns:
+            Dict padronizado; data contém 'total_ms' e 'stages'
+            (lista de {'stage', 'ms', 'percent'})
+        """
+        trace = get_last_trace('process_access_attempt')
+        if trace is None:
+            return {
+                'success': False,
+                'message': 'Nenhuma tentativa de acesso medida',
+                'data': None,
+                'errors': []
             }
 
-            # 2. Se rosto foi identificado
-            if face_identify:
-                user_id, confidence = face_identify
+        return {
+            'success': True,
+            'message': 'Tempos da última tentativa de acesso',
+            'data': {
+                'total_ms': round(trace.total * 1000, 2),
+                'stages': trace.breakdown()
+            },
+            'errors': []
+        }
 
-                # 3. Buscar dados do usuário
-                user_data = self.user_service.get_user_by_id(user_id)
+    def approve_user_with_face(self, user_id: int) -> Dict:
+        """
+        Aprova um usuário pendente e salva seu encoding facial atomicamente.
+
+        O encoding é calculado antes (fora da transação); aprovação e
+        encoding são gravados juntos, então o usuário só é aprovado se
+        o rosto da foto cadastrada puder ser reconhecido.
+
+        Arguments:
+            user_id (int): ID do usuário
+
+        Returns:
+            Dict padronizado com resultado
+        """
+        try:
+            photo = self.user_service.get_user_photo(user_id)
+            if not photo:
+                return {
+                    'success': False,
+                    'message': 'Usuário sem foto cadastrada',
+                    'data': None,
+                    'errors': ['Foto de reconhecimento não encontrada']
+                }
+
+            encoding = self.face_recognition_service.generate_face_encoding(photo)
+            if encoding is None:
+                return {
+                    'success': False,
+                    'message': 'Não foi possível detectar rosto na imagem',
+                    'data': None,
+                    'errors': ['Nenhum rosto detectado na foto cadastrada']
+                }
+
+            with self.face_recognition_service.repository.executor.transaction():
+                self.user_service.approve_user(user_id)
+                face_encoding = self.face_recognition_service.save_encoding(user_id, encoding)
 
-                if user_data:
-                    user = Usuario.from_dict(user_data)
-
-                    # 4. Validar se usuário está aprovado
-                    if user.approved:
-                        # ACESSO PERMITIDO
-                        result = {
-                            'acesso_permitido': True,
-                            'usuario_id': user.id,
-                            'usuario_nome': user.name,
-                            'usuario_cargo': user.position,
-                            'confianca': confidence,
-                            'motivo_negacao': None,
-                            'data_hora': datetime.now(),
-                            'local': location
-                        }
-                    else:
-                        # ACESSO NEGADO - Usuário não aprovado
-                        result = {
-                            'acesso_permitido': False,
-                            'usuario_id': user.id,
-                            'usuario_nome': user.name,
-                            'usuario_cargo': user.position,
-                            'confianca': confidence,
-                            'motivo_negacao': 'Usuário aguardando aprovação do gestor',
-                            'data_hora': datetime.now(),
-                            'local': location
-                        }
-                else:
-                    # ACESSO NEGADO - Usuário não encontrado (caso raro)
-                    result['motivo_negacao'] = 'Usuário não encontrado no sistema'
-
-            # 5. Registrar a tentativa de acesso
-            registro_acesso = RegistroAcesso(
-                id=0,
-                user_id=result['usuario_id'],
-                created_at=result['data_hora'],
-                type_access='Reconhecimento Facial',
-                access_allowed=result['acesso_permitido'],
-                reason_denied=result['motivo_negacao'],
-                captured_image=image_bytes
-            )
-
-            # 6. Salvar registro e disparar notificações se necessário
-            self.access_service.register_access_attempt(
-                registro=registro_acesso,
-                manager_id=manager_id,
-                user_name=result['usuario_nome'] if result['usuario_id'] else None
-            )
-
-            # 7. Retornar resultado padronizado
             return {
                 'success': True,
-                'message': 'Acesso permitido' if result['acesso_permitido'] else 'Acesso negado',
-                'data': result,
+                'message': 'Usuário aprovado e encoding facial salvo com sucesso',
+                'data': {'encoding_id': face_encoding.id},
                 'errors': []
             }
 
         except Exception as e:
             return {
                 'success': False,
-                'message': 'Erro ao processar reconhecimento facial',
-                'data': {
-                    'acesso_permitido': False,
-                    'usuario_nome': 'Erro',
-                    'motivo_negacao': 'Erro no sistema de reconhecimento',
-                    'data_hora': datetime.now(),
-                    'local': location
-                },
+                'message': 'Erro ao aprovar usuário',
+                'data': None,
                 'errors': [str(e)]
             }
 
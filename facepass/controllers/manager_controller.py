@@ -78,11 +78,19 @@ class ManagerController:
                 'data': {
                     'id': gestor.id,
                     'name': gestor.name,
-                    'email': gestor.email
+                    'email': gestor.email,
+                    'session_token': self.manager_service.issue_session_token(gestor)
                 },
                 'errors': []
             }
 
+        except (PermissionError, TimeoutError) as e:
+            return {
+                'success': False,
+                'message': "Login temporariamente bloqueado.",
+                'data': None,
+                'errors': [str(e)]
+            }
         except ValueError as e:
             return {
                 'success': False,
@@ -98,6 +106,75 @@ class ManagerController:
                 'errors': [str(e)]
             }
 
+    def restore_session(self, session_token: str) -> Dict:
+        """
+        Restaura a sessão de um gestor a partir de um token assinado,
+        sem reexecutar a verificação de senha.
+
+        Arguments:
+            session_token (str): Token emitido no login
+
+        Returns:
+            Dict padronizado com os dados do gestor
+        """
+        try:
+            claims = self.manager_service.validate_session_token(session_token)
+
+            if not claims:
+                return {
+                    'success': False,
+                    'message': 'Sessão inválida ou expirada.',
+                    'data': None,
+                    'errors': ['Token inválido']
+                }
+
+            return {
+                'success': True,
+                'message': f"Bem-vindo de volta, {claims['name']}!",
+                'data': {
+                    'id': claims['id'],
+                    'name': claims['name'],
+                    'email': claims['email'],
+                    'session_token': session_token
+                },
+                'errors': []
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao restaurar sessão.',
+                'data': None,
+                'errors': [str(e)]
+            }
+
+    def logout(self, manager_id: int) -> Dict:
+        """
+        Encerra as sessões do gestor, revogando os tokens já emitidos.
+
+        Arguments:
+            manager_id (int): ID do gestor autenticado
+
+        Returns:
+            Dict padronizado
+        """
+        try:
+            self.manager_service.revoke_sessions(manager_id)
+            return {
+                'success': True,
+                'message': 'Sessão encerrada.',
+                'data': None,
+                'errors': []
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao encerrar sessão.',
+                'data': None,
+                'errors': [str(e)]
+            }
+
     def get_manager_info(self, manager_id: int) -> Dict:
         """
         Obtém informações de um gestor por ID.
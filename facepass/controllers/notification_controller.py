@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 from facepass.services.notification_service import NotificationService
 
 
@@ -72,6 +73,70 @@ class NotificationController:
                 'errors': [str(e)]
             }
 
+    def list_notifications_page(self, manager_id: int, status: str = "Todas",
+                                cursor: Optional[Tuple[datetime, int]] = None,
+                                page_size: int = 20) -> Dict:
+        """
+        Lista uma página do feed detalhado de notificacoes (paginacao por keyset).
+
+        Arguments:
+            manager_id (int): ID do gestor
+            status (str): "Todas", "Não Lidas" ou "Lidas"
+            cursor (Optional[Tuple[datetime, int]]): Cursor retornado pela pagina anterior
+            page_size (int): Quantidade de notificacoes por pagina
+
+        Returns:
+            Dict padronizado com a pagina em 'data' e o cursor da proxima em 'next_cursor'
+        """
+        is_read = {"Não Lidas": False, "Lidas": True}.get(status)
+
+        try:
+            notifications, next_cursor = self.notification_service.list_notifications_page(
+                manager_id, is_read=is_read, cursor=cursor, page_size=page_size)
+
+            return {
+                'success': True,
+                'message': f'{len(notifications)} notificacao(oes) nesta pagina',
+                'data': notifications,
+                'next_cursor': next_cursor,
+                'errors': []
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao listar notificacoes',
+                'data': [],
+                'next_cursor': None,
+                'errors': [str(e)]
+            }
+
+    def get_unread_count(self, manager_id: int) -> Dict:
+        """
+        Obtem a quantidade de notificacoes nao lidas de um gestor (contador em cache).
+
+        Arguments:
+            manager_id (int): ID do gestor
+
+        Returns:
+            Dict padronizado com a contagem em 'data'
+        """
+        try:
+            unread = self.notification_service.get_unread_count(manager_id)
+
+            return {
+                'success': True,
+                'message': f'{unread} notificacao(oes) nao lida(s)',
+                'data': unread,
+                'errors': []
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao contar notificacoes nao lidas',
+                'data': 0,
+                'errors': [str(e)]
+            }
+
     def mark_as_read(self, notification_id: int) -> Dict:
         """
         Marca uma notificacao como lida.
@@ -126,6 +191,109 @@ class NotificationController:
                 'errors': [str(e)]
             }
 
+    def mark_all_as_read(self, manager_id: int) -> Dict:
+        """
+        Marca todas as notificacoes do gestor como lidas (um unico UPDATE).
+
+        Arguments:
+            manager_id (int): ID do gestor
+
+        Returns:
+            Dict padronizado com a quantidade atualizada em 'data'
+        """
+        try:
+            updated = self.notification_service.mark_all_as_read(manager_id)
+
+            return {
+                'success': True,
+                'message': f'{updated} notificacao(oes) marcada(s) como lida(s)',
+                'data': updated,
+                'errors': []
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao marcar notificacoes como lidas',
+                'data': 0,
+                'errors': [str(e)]
+            }
+
+    def mark_as_read_by_filter(self, manager_id: int, type_notification: Optional[str] = None,
+                               start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> Dict:
+        """
+        Marca como lidas as notificacoes por tipo e/ou periodo (um unico UPDATE).
+
+        Arguments:
+            manager_id (int): ID do gestor
+            type_notification (Optional[str]): Tipo da notificacao
+            start_date (Optional[datetime]): Inicio do periodo (inclusivo)
+            end_date (Optional[datetime]): Fim do periodo (exclusivo)
+
+        Returns:
+            Dict padronizado com a quantidade atualizada em 'data'
+        """
+        try:
+            updated = self.notification_service.mark_as_read_by_filter(
+                manager_id, type_notification, start_date, end_date)
+
+            return {
+                'success': True,
+                'message': f'{updated} notificacao(oes) marcada(s) como lida(s)',
+                'data': updated,
+                'errors': []
+            }
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': 'Filtro invalido',
+                'data': 0,
+                'errors': [str(e)]
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao marcar notificacoes como lidas',
+                'data': 0,
+                'errors': [str(e)]
+            }
+
+    def delete_read_older_than(self, manager_id: int, days: int) -> Dict:
+        """
+        Remove notificacoes lidas com mais de N dias (um unico DELETE).
+
+        Arguments:
+            manager_id (int): ID do gestor
+            days (int): Idade minima, em dias, das notificacoes removidas
+
+        Returns:
+            Dict padronizado com a quantidade removida em 'data'
+        """
+        try:
+            deleted = self.notification_service.delete_read_older_than(
+                manager_id, days)
+
+            return {
+                'success': True,
+                'message': f'{deleted} notificacao(oes) removida(s)',
+                'data': deleted,
+                'errors': []
+            }
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': 'Parametro invalido',
+                'data': 0,
+                'errors': [str(e)]
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao remover notificacoes',
+                'data': 0,
+                'errors': [str(e)]
+            }
+
     def get_statistics(self, manager_id: Optional[int] = None) -> Dict:
         """
         Obtem estatisticas de notificacoes.
@@ -137,16 +305,17 @@ class NotificationController:
             Dict com estatisticas
         """
         try:
-            all_notifications = self.notification_service.list_all_notifications(
-                manager_id)
-            unread_notifications = self.notification_service.list_unread_notifications(
-                manager_id)
+            if manager_id:
+                stats = self.notification_service.get_statistics(manager_id)
+            else:
+                all_notifications = self.notification_service.list_all_notifications()
+                unread_notifications = self.notification_service.list_unread_notifications()
 
-            stats = {
-                'total': len(all_notifications),
-                'unread': len(unread_notifications),
-                'read': len(all_notifications) - len(unread_notifications)
-            }
+                stats = {
+                    'total': len(all_notifications),
+                    'unread': len(unread_notifications),
+                    'read': len(all_notifications) - len(unread_notifications)
+                }
 
             return {
                 'success': True,
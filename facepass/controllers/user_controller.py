@@ -168,9 +168,9 @@ class UserController:
             Dict com informações do status
         """
         try:
-            usuario_dict = self.user_service.get_user_by_email(email)
+            usuario = self.user_service.get_user_by_email(email)
 
-            if not usuario_dict:
+            if not usuario:
                 return {
                     'success': False,
                     'message': 'Usuário não encontrado',
@@ -178,16 +178,16 @@ class UserController:
                     'errors': ['Email não cadastrado no sistema']
                 }
 
-            status_texto = "Aprovado" if usuario_dict['approved'] else "Aguardando Aprovação"
+            status_texto = "Aprovado" if usuario.approved else "Aguardando Aprovação"
 
             return {
                 'success': True,
                 'message': f'Status: {status_texto}',
                 'data': {
-                    'nome': usuario_dict['name'],
-                    'email': usuario_dict['email'],
-                    'cargo': usuario_dict['position'],
-                    'aprovado': usuario_dict['approved'],
+                    'nome': usuario.name,
+                    'email': usuario.email,
+                    'cargo': usuario.position,
+                    'aprovado': usuario.approved,
                     'status_texto': status_texto
                 },
                 'errors': []
@@ -201,6 +201,41 @@ class UserController:
                 'errors': [str(e)]
             }
 
+    def get_user_photo(self, user_id: int) -> Dict:
+        """
+        Busca sob demanda a foto de reconhecimento de um usuário.
+
+        Arguments:
+            user_id (int): ID do usuário
+
+        Returns:
+            Dict padronizado com os bytes da foto
+        """
+        try:
+            photo = self.user_service.get_user_photo(user_id)
+
+            if not photo:
+                return {
+                    'success': False,
+                    'message': 'Foto não encontrada',
+                    'data': None,
+                    'errors': ['Usuário sem foto cadastrada']
+                }
+
+            return {
+                'success': True,
+                'message': 'Foto obtida com sucesso',
+                'data': photo,
+                'errors': []
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Erro ao buscar foto',
+                'data': None,
+                'errors': [str(e)]
+            }
+
     def get_stats(self) -> Dict:
         """
         Obtém estatísticas gerais sobre os usuários.
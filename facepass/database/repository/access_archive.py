@@ -0,0 +1,149 @@
+import csv
+import gzip
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Caminhos relativos são resolvidos a partir da raiz do projeto, para que o app
+# e o job agendado usem o mesmo diretório independentemente do diretório atual
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+ACCESS_ARCHIVE_DIR = os.path.join(PROJECT_ROOT, os.getenv('ACCESS_ARCHIVE_DIR', 'archive/access_registers'))
+
+ARCHIVE_COLUMNS = ['id', 'user_id', 'created_at', 'type_access', 'access_allowed',
+                   'reason_denied', 'image_offset', 'image_length']
+
+
+class ArchivePartWriter:
+    """
+    Escreve uma parte do arquivo morto de um mês: registros em CSV comprimido
+    (gzip) e imagens capturadas em um pack binário separado.
+
+    Os arquivos são gravados com sufixo .tmp e só ficam visíveis para leitura
+    após close(); o CSV é renomeado por último.
+    """
+
+    def __init__(self, csv_path: str, pack_path: str):
+        self.csv_path = csv_path
+        self.pack_path = pack_path
+        self._csv_file = gzip.open(csv_path + '.tmp', 'wt', newline='', encoding='utf-8')
+        self._pack_file = open(pack_path + '.tmp', 'wb')
+        self._writer = csv.writer(self._csv_file)
+        self._writer.writerow(ARCHIVE_COLUMNS)
+        self.rows = 0
+
+    def write(self, row: Dict[str, Any]) -> None:
+        image = row.get('captured_image')
+        if image:
+            image_offset = self._pack_file.tell()
+            self._pack_file.write(bytes(image))
+            image_length = len(image)
+        else:
+            image_offset, image_length = '', ''
+
+        self._writer.writerow([
+            row['id'],
+            '' if row['user_id'] is None else row['user_id'],
+            row['created_at'].isoformat(),
+            row['type_access'],
+            int(bool(row['access_allowed'])),
+            row['reason_denied'] or '',
+            image_offset,
+            image_length
+        ])
+        self.rows += 1
+
+    def close(self) -> None:
+        self._csv_file.close()
+        self._pack_file.flush()
+        os.fsync(self._pack_file.fileno())
+        self._pack_file.close()
+        os.replace(self.pack_path + '.tmp', self.pack_path)
+        os.replace(self.csv_path + '.tmp', self.csv_path)
+
+    def abort(self) -> None:
+        """Descarta a parte sem publicá-la"""
+        self._csv_file.close()
+        self._pack_file.close()
+        for path in (self.csv_path + '.tmp', self.pack_path + '.tmp'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class AccessArchive:
+    """
+    Arquivo morto dos registros de acesso em disco local, particionado por mês:
+
+        <base_dir>/YYYY-MM/part-<id>.csv.gz   registros
+        <base_dir>/YYYY-MM/part-<id>.pack     imagens capturadas
+    """
+
+    def __init__(self, base_dir: str = ACCESS_ARCHIVE_DIR):
+        self.base_dir = base_dir
+
+    def open_part(self, month: str, part_id: str) -> ArchivePartWriter:
+        month_dir = os.path.join(self.base_dir, month)
+        os.makedirs(month_dir, exist_ok=True)
+        prefix = os.path.join(month_dir, f"part-{part_id}")
+        return ArchivePartWriter(prefix + '.csv.gz', prefix + '.pack')
+
+    def archived_months(self) -> List[str]:
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(name for name in os.listdir(self.base_dir)
+                      if os.path.isdir(os.path.join(self.base_dir, name)))
+
+    def read_period(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        Registros arquivados com start <= created_at < end, no formato das linhas do banco.
+
+        Um arquivamento interrompido depois de publicar as partes e antes de
+        apagar as linhas gera o mesmo id em mais de uma parte: cada id é
+        retornado uma única vez.
+        """
+        first_month, last_month = start.strftime('%Y-%m'), end.strftime('%Y-%m')
+        results = []
+        seen_ids = set()
+
+        for month in self.archived_months():
+            if month < first_month or month > last_month:
+                continue
+
+            month_dir = os.path.join(self.base_dir, month)
+            for name in sorted(os.listdir(month_dir)):
+                if name.endswith('.csv.gz'):
+                    csv_path = os.path.join(month_dir, name)
+                    pack_path = csv_path[:-len('.csv.gz')] + '.pack'
+                    for row in self._read_part(csv_path, pack_path, start, end):
+                        if row['id'] not in seen_ids:
+                            seen_ids.add(row['id'])
+                            results.append(row)
+
+        return results
+
+    def _read_part(self, csv_path: str, pack_path: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        rows = []
+        with gzip.open(csv_path, 'rt', newline='', encoding='utf-8') as csv_file, \
+                open(pack_path, 'rb') as pack_file:
+            for record in csv.DictReader(csv_file):
+                created_at = datetime.fromisoformat(record['created_at'])
+                if not (start <= created_at < end):
+                    continue
+
+                captured_image = None
+                if record['image_length']:
+                    pack_file.seek(int(record['image_offset']))
+                    captured_image = pack_file.read(int(record['image_length']))
+
+                rows.append({
+                    'id': int(record['id']),
+                    'user_id': int(record['user_id']) if record['user_id'] else None,
+                    'created_at': created_at,
+                    'type_access': record['type_access'],
+                    'access_allowed': int(record['access_allowed']),
+                    'reason_denied': record['reason_denied'] or None,
+                    'captured_image': captured_image
+                })
+        return rows
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Any, Optional
+from facepass.database.setup_database.executor_query import QueryExecutor
+
+
+class DailyHoursRepository:
+    """Repository da tabela fato daily_hours (uma linha por usuário e dia trabalhado)"""
+
+    def __init__(self, connection: Any):
+        self.connection = connection
+        self.executor = QueryExecutor(connection)
+
+    def record_event(self, user_id: int, created_at: datetime, type_access: str) -> None:
+        """Atualiza incrementalmente a linha do dia com uma entrada ou saída permitida"""
+        if type_access == 'entrada':
+            first_entry, last_exit = created_at, None
+        elif type_access == 'saida':
+            first_entry, last_exit = None, created_at
+        else:
+            return
+
+        # No ON DUPLICATE KEY UPDATE o MySQL avalia as atribuições em ordem,
+        # então minutes_worked já enxerga first_entry/last_exit atualizados
+        query = """
+            INSERT INTO daily_hours (user_id, work_date, first_entry, last_exit, minutes_worked)
+            VALUES (%s, %s, %s, %s, 0)
+            ON DUPLICATE KEY UPDATE
+                first_entry = LEAST(COALESCE(first_entry, VALUES(first_entry)),
+                                    COALESCE(VALUES(first_entry), first_entry)),
+                last_exit = GREATEST(COALESCE(last_exit, VALUES(last_exit)),
+                                     COALESCE(VALUES(last_exit), last_exit)),
+                minutes_worked = COALESCE(TIMESTAMPDIFF(MINUTE, first_entry, last_exit), 0)
+        """
+        params = (user_id, created_at.date(), first_entry, last_exit)
+        self.executor.execute_update(query, params)
+
+    def rebuild(self, days: Optional[int] = None) -> int:
+        """
+        Reconstrói a tabela a partir de accessRegisters (backfill).
+
+        Args:
+            days: Reconstrói apenas os últimos N dias; None reconstrói tudo
+
+        Returns:
+            Número de linhas (usuário, dia) gravadas
+        """
+        if days is None:
+            self.executor.execute_update("DELETE FROM daily_hours")
+            period_condition = ""
+            params = ()
+        else:
+            self.executor.execute_update(
+                "DELETE FROM daily_hours WHERE work_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)",
+                (days,))
+            period_condition = "AND created_at >= DATE_SUB(CURDATE(), INTERVAL %s DAY)"
+            params = (days,)
+
+        query = f"""
+            INSERT INTO daily_hours (user_id, work_date, first_entry, last_exit, minutes_worked)
+            SELECT
+                user_id,
+                work_date,
+                first_entry,
+                last_exit,
+                COALESCE(TIMESTAMPDIFF(MINUTE, first_entry, last_exit), 0)
+            FROM (
+                SELECT
+                    user_id,
+                    DATE(created_at) as work_date,
+                    MIN(CASE WHEN type_access = 'entrada' THEN created_at END) as first_entry,
+                    MAX(CASE WHEN type_access = 'saida' THEN created_at END) as last_exit
+                FROM accessRegisters
+                WHERE user_id IS NOT NULL
+                AND access_allowed = TRUE
+                AND type_access IN ('entrada', 'saida')
+                {period_condition}
+                GROUP BY user_id, DATE(created_at)
+            ) days
+        """
+        return self.executor.execute_update(query, params)
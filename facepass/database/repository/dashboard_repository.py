@@ -1,19 +1,23 @@
+from datetime import datetime
 from typing import List, Dict, Any
+import pandas as pd
 from facepass.database.setup_database.executor_query import QueryExecutor
 
 
 class DashboardRepository:
     """Repository para queries relacionadas ao dashboard de gestão"""
 
-    def __init__(self, connection):
+    def __init__(self, connection, replicas=None):
         self.connection = connection
-        self.executor = QueryExecutor(connection)
+        # Somente leitura: com réplicas configuradas, as consultas saem do primário
+        self.executor = QueryExecutor(connection, replicas)
+        self.primary_executor = QueryExecutor(connection)
 
     def get_today_accesses_count(self) -> int:
         query = """
             SELECT COUNT(*) as count
             FROM accessRegisters
-            WHERE DATE(created_at) = CURDATE()
+            WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
         """
         result = self.executor.execute_query_one(query)
         return result['count'] if result else 0
@@ -22,7 +26,7 @@ class DashboardRepository:
         query = """
             SELECT COUNT(*) as count
             FROM accessRegisters
-            WHERE DATE(created_at) = CURDATE()
+            WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
             AND access_allowed = TRUE
         """
         result = self.executor.execute_query_one(query)
@@ -32,7 +36,7 @@ class DashboardRepository:
         query = """
             SELECT COUNT(*) as count
             FROM accessRegisters
-            WHERE DATE(created_at) = CURDATE()
+            WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
             AND access_allowed = FALSE
         """
         result = self.executor.execute_query_one(query)
@@ -49,9 +53,11 @@ class DashboardRepository:
 
     def get_all_users_attendance(self, date: str = "") -> List[Dict[str, Any]]:
         if not date:
-            date_condition = "DATE(created_at) = CURDATE()"
+            day_start = "CURDATE()"
+            params = ()
         else:
-            date_condition = f"DATE(created_at) = '{date}'"
+            day_start = "%s"
+            params = (date, date)
 
         query = f"""
             SELECT
@@ -80,7 +86,8 @@ class DashboardRepository:
                         THEN created_at END) as last_exit,
                     COUNT(*) as total_accesses
                 FROM accessRegisters
-                WHERE {date_condition}
+                WHERE created_at >= {day_start}
+                AND created_at < {day_start} + INTERVAL 1 DAY
                 GROUP BY user_id
             ) attendance ON u.id = attendance.user_id
             WHERE u.approved = TRUE
@@ -92,9 +99,52 @@ class DashboardRepository:
                 END,
                 u.name
         """
+        return self.executor.execute_query(query, params)
+
+    def get_attendance_snapshot(self, date: str, settled_before: datetime) -> List[Dict[str, Any]]:
+        """
+        Estado de presença por usuário em um dia, usado para semear o
+        PresenceTracker: agrega só os registros anteriores a `settled_before`
+        (os mais recentes são aplicados individualmente pelo catch_up).
+        """
+        query = """
+            SELECT
+                user_id,
+                MAX(CASE WHEN type_access = 'entrada' AND access_allowed = TRUE
+                    THEN created_at END) as last_entry,
+                MAX(CASE WHEN type_access = 'saida' AND access_allowed = TRUE
+                    THEN created_at END) as last_exit,
+                COUNT(*) as total_accesses
+            FROM accessRegisters
+            WHERE created_at >= %s
+            AND created_at < %s + INTERVAL 1 DAY
+            AND created_at < %s
+            GROUP BY user_id
+        """
+        # Sempre no primário: uma réplica atrasada deixaria registros fora da semeadura
+        return self.primary_executor.execute_query(query, (date, date, settled_before))
+
+    def get_registers_since(self, since: datetime, date: str) -> List[Dict[str, Any]]:
+        """Registros do dia com created_at >= `since`, para o PresenceTracker.catch_up"""
+        query = """
+            SELECT id, user_id, created_at, type_access, access_allowed
+            FROM accessRegisters
+            WHERE created_at >= %s
+            AND created_at >= %s
+            AND created_at < %s + INTERVAL 1 DAY
+            ORDER BY id
+        """
+        return self.primary_executor.execute_query(query, (since, date, date))
+
+    def list_approved_users_basic(self) -> List[Dict[str, Any]]:
+        query = """
+            SELECT id, name, position, email
+            FROM users
+            WHERE approved = TRUE
+        """
         return self.executor.execute_query(query)
 
-    def get_accesses_by_day(self, days: int = 30) -> List[Dict[str, Any]]:
+    def get_accesses_by_day(self, days: int = 30) -> pd.DataFrame:
         query = """
             SELECT
                 DATE(created_at) as date,
@@ -106,9 +156,9 @@ class DashboardRepository:
             GROUP BY DATE(created_at)
             ORDER BY date
         """
-        return self.executor.execute_query(query, (days,))
+        return self.executor.query_frame(query, (days,))
 
-    def get_accesses_by_hour(self) -> List[Dict[str, Any]]:
+    def get_accesses_by_hour(self) -> pd.DataFrame:
         query = """
             SELECT
                 HOUR(created_at) as hour,
@@ -116,13 +166,13 @@ class DashboardRepository:
                 SUM(CASE WHEN access_allowed = TRUE THEN 1 ELSE 0 END) as allowed,
                 SUM(CASE WHEN access_allowed = FALSE THEN 1 ELSE 0 END) as denied
             FROM accessRegisters
-            WHERE DATE(created_at) = CURDATE()
+            WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
             GROUP BY HOUR(created_at)
             ORDER BY hour
         """
-        return self.executor.execute_query(query)
+        return self.executor.query_frame(query)
 
-    def get_success_rate_by_day(self, days: int = 30) -> List[Dict[str, Any]]:
+    def get_success_rate_by_day(self, days: int = 30) -> pd.DataFrame:
         query = """
             SELECT
                 DATE(created_at) as date,
@@ -134,9 +184,9 @@ class DashboardRepository:
             GROUP BY DATE(created_at)
             ORDER BY date
         """
-        return self.executor.execute_query(query, (days,))
+        return self.executor.query_frame(query, (days,))
 
-    def get_top_users(self, limit=10):
+    def get_top_users(self, limit=10) -> pd.DataFrame:
         query = """
             SELECT
                 u.name,
@@ -150,9 +200,9 @@ class DashboardRepository:
             ORDER BY access_count DESC
             LIMIT %s
         """
-        return self.executor.execute_query(query, (limit,))
+        return self.executor.query_frame(query, (limit,))
 
-    def get_notifications_by_type(self, days=30):
+    def get_notifications_by_type(self, days=30) -> pd.DataFrame:
         query = """
             SELECT
                 type_notification,
@@ -164,77 +214,42 @@ class DashboardRepository:
             GROUP BY type_notification
             ORDER BY count DESC
         """
-        return self.executor.execute_query(query, (days,))
+        return self.executor.query_frame(query, (days,))
 
-    def get_overtime_by_user(self, days: int = 30) -> List[Dict[str, Any]]:
+    def get_overtime_by_user(self, days: int = 30) -> pd.DataFrame:
+        """Horas extras por usuário, agregadas a partir da tabela fato daily_hours"""
         query = """
-            WITH DailyHours AS (
-                SELECT
-                    u.id as user_id,
-                    u.name,
-                    u.position,
-                    DATE(ar.created_at) as work_date,
-                    MIN(CASE WHEN ar.type_access = 'entrada' AND ar.access_allowed = TRUE
-                        THEN ar.created_at END) as first_entry,
-                    MAX(CASE WHEN ar.type_access = 'saida' AND ar.access_allowed = TRUE
-                        THEN ar.created_at END) as last_exit
-                FROM users u
-                INNER JOIN accessRegisters ar ON u.id = ar.user_id
-                WHERE u.approved = TRUE
-                AND ar.created_at >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
-                GROUP BY u.id, u.name, u.position, DATE(ar.created_at)
-                HAVING first_entry IS NOT NULL AND last_exit IS NOT NULL
-            ),
-            HoursCalculated AS (
-                SELECT
-                    user_id,
-                    name,
-                    position,
-                    work_date,
-                    first_entry,
-                    last_exit,
-                    TIMESTAMPDIFF(MINUTE, first_entry, last_exit) / 60.0 as hours_worked,
-                    GREATEST(0, (TIMESTAMPDIFF(MINUTE, first_entry, last_exit) / 60.0) - 8) as overtime_hours
-                FROM DailyHours
-            )
             SELECT
-                user_id,
-                name,
-                position,
-                COUNT(work_date) as days_worked,
-                ROUND(SUM(hours_worked), 2) as total_hours_worked,
-                ROUND(SUM(overtime_hours), 2) as total_overtime_hours
-            FROM HoursCalculated
-            WHERE overtime_hours > 0
-            GROUP BY user_id, name, position
-            HAVING total_overtime_hours > 0
+                u.id as user_id,
+                u.name,
+                u.position,
+                COUNT(*) as days_worked,
+                ROUND(SUM(dh.minutes_worked) / 60.0, 2) as total_hours_worked,
+                ROUND(SUM(dh.minutes_worked / 60.0 - 8), 2) as total_overtime_hours
+            FROM daily_hours dh
+            INNER JOIN users u ON u.id = dh.user_id
+            WHERE u.approved = TRUE
+            AND dh.work_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
+            AND dh.first_entry IS NOT NULL AND dh.last_exit IS NOT NULL
+            AND dh.minutes_worked > 8 * 60
+            GROUP BY u.id, u.name, u.position
             ORDER BY total_overtime_hours DESC
         """
-        return self.executor.execute_query(query, (days,))
+        return self.executor.query_frame(query, (days,))
 
-    def get_daily_overtime_detail(self, user_id: int, days: int = 30) -> List[Dict[str, Any]]:
+    def get_daily_overtime_detail(self, user_id: int, days: int = 30) -> pd.DataFrame:
         query = """
-            WITH DailyHours AS (
-                SELECT
-                    DATE(ar.created_at) as work_date,
-                    MIN(CASE WHEN ar.type_access = 'entrada' AND ar.access_allowed = TRUE
-                        THEN ar.created_at END) as first_entry,
-                    MAX(CASE WHEN ar.type_access = 'saida' AND ar.access_allowed = TRUE
-                        THEN ar.created_at END) as last_exit
-                FROM accessRegisters ar
-                WHERE ar.user_id = %s
-                AND ar.created_at >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
-                GROUP BY DATE(ar.created_at)
-                HAVING first_entry IS NOT NULL AND last_exit IS NOT NULL
-            )
             SELECT
                 work_date,
                 first_entry,
                 last_exit,
-                ROUND(TIMESTAMPDIFF(MINUTE, first_entry, last_exit) / 60.0, 2) as hours_worked,
-                ROUND(GREATEST(0, (TIMESTAMPDIFF(MINUTE, first_entry, last_exit) / 60.0) - 8), 2) as overtime_hours
-            FROM DailyHours
-            WHERE TIMESTAMPDIFF(MINUTE, first_entry, last_exit) / 60.0 > 8
+                ROUND(minutes_worked / 60.0, 2) as hours_worked,
+                ROUND(minutes_worked / 60.0 - 8, 2) as overtime_hours
+            FROM daily_hours
+            WHERE user_id = %s
+            AND work_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
+            AND first_entry IS NOT NULL AND last_exit IS NOT NULL
+            AND minutes_worked > 8 * 60
             ORDER BY work_date DESC
         """
-        return self.executor.execute_query(query, (user_id, days))
+        return self.executor.query_frame(query, (user_id, days))
@@ -9,32 +9,32 @@ class FaceEncodingRepository:
         self.executor = QueryExecutor(connection)
 
     def save_encoding(self, face_encoding: FaceEncoding) -> FaceEncoding:
-        """Armazena ou atualiza o encoding no Banco de Dados (previne duplicação)"""
-
-        # Verificar se já existe encoding para este usuário
-        existing = self.get_encoding_by_user_id(face_encoding.user_id)
+        """Armazena ou atualiza o encoding no Banco de Dados (upsert pelo índice único de user_id)"""
+        # LAST_INSERT_ID(id) faz o lastrowid devolver o id existente quando há atualização
+        query = """
+            INSERT INTO face_encoding (user_id, encoding)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), encoding = VALUES(encoding);
+        """
+        params = (face_encoding.user_id, face_encoding.to_bytes())
+        face_encoding.id = self.executor.execute_insert(query, params)
+        return face_encoding
 
-        if existing:
-            # Atualizar encoding existente
-            query = """
-                UPDATE face_encoding
-                SET encoding = %s
-                WHERE user_id = %s
-            """
-            params = (face_encoding.to_bytes(), face_encoding.user_id)
-            self.executor.execute_update(query, params)
-            face_encoding.id = existing.id
-        else:
-            # Inserir novo encoding
-            query = """
-                INSERT INTO face_encoding (user_id, encoding)
-                VALUES (%s, %s);
-            """
-            params = (face_encoding.user_id, face_encoding.to_bytes())
-            encoding_id = self.executor.execute_insert(query, params)
-            face_encoding.id = encoding_id
+    def save_encodings(self, face_encodings: List[FaceEncoding]) -> int:
+        """Upsert de vários encodings em um único INSERT multi-linha; retorna linhas afetadas"""
+        if not face_encodings:
+            return 0
 
-        return face_encoding
+        placeholders = ", ".join(["(%s, %s)"] * len(face_encodings))
+        query = f"""
+            INSERT INTO face_encoding (user_id, encoding)
+            VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE encoding = VALUES(encoding);
+        """
+        params = []
+        for face_encoding in face_encodings:
+            params.extend((face_encoding.user_id, face_encoding.to_bytes()))
+        return self.executor.execute_update(query, tuple(params))
     
     def get_encoding_by_user_id(self, user_id: int) -> Optional[FaceEncoding]:
         query = """
@@ -55,6 +55,15 @@ class FaceEncodingRepository:
             )
         return None
     
+    def get_encodings_signature(self) -> tuple:
+        """(contagem, id máximo) da tabela: muda quando encodings são inseridos ou removidos"""
+        query = """
+            SELECT COUNT(*) as total, COALESCE(MAX(id), 0) as max_id
+            FROM face_encoding;
+        """
+        result = self.executor.execute_query_one(query)
+        return (result['total'], result['max_id']) if result else (0, 0)
+
     def get_all_encodings(self) -> List[FaceEncoding]:
         query = """
             SELECT id, user_id, encoding
@@ -60,6 +60,27 @@ class ManagerRepository:
                   manager_data['password_hash'], manager_id)
         self.executor.execute_update(query, params)
 
+    def get_session_version(self, manager_id: int):
+        """Versão atual dos tokens de sessão do gestor (None se o gestor não existir)"""
+        query = """
+            SELECT session_version
+            FROM manager
+            WHERE id = %s
+        """
+        params = (manager_id,)
+        result = self.executor.execute_query_one(query, params)
+        return result['session_version'] if result else None
+
+    def increment_session_version(self, manager_id: int):
+        """Invalida todos os tokens de sessão já emitidos para o gestor"""
+        query = """
+            UPDATE manager
+            SET session_version = session_version + 1
+            WHERE id = %s
+        """
+        params = (manager_id,)
+        self.executor.execute_update(query, params)
+
     def delete_manager(self, manager_id: int):
         """Remove um gestor"""
         query = """
@@ -1,4 +1,5 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional, Tuple
 from facepass.database.setup_database.executor_query import QueryExecutor
 from facepass.models.notification import Notificacao
 from dotenv import load_dotenv
@@ -39,12 +40,64 @@ class NotificationRepository:
         params = (notification_id,)
         self.executor.execute_update(query, params)
 
-    def mark_notification_as_read(self, notification_id: int) -> None:
+    def mark_notification_as_read(self, notification_id: int) -> bool:
+        """Marca como lida; retorna True se a notificação estava não lida"""
         query = """
-            UPDATE notifications SET is_read = TRUE WHERE id = %s
+            UPDATE notifications SET is_read = TRUE WHERE id = %s AND is_read = FALSE
         """
         params = (notification_id,)
-        self.executor.execute_update(query, params)
+        return self.executor.execute_update(query, params) > 0
+
+    def mark_all_as_read(self, manager_id: int) -> int:
+        """Marca todas as notificações não lidas do gestor como lidas"""
+        query = """
+            UPDATE notifications SET is_read = TRUE
+            WHERE manager_id = %s AND is_read = FALSE
+        """
+        params = (manager_id,)
+        return self.executor.execute_update(query, params)
+
+    def mark_as_read_by_filter(self, manager_id: int, type_notification: Optional[str] = None,
+                               start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> int:
+        """Marca como lidas as notificações do gestor que atendem aos filtros"""
+        query = """
+            UPDATE notifications SET is_read = TRUE
+            WHERE manager_id = %s AND is_read = FALSE
+        """
+        params = [manager_id]
+
+        if type_notification:
+            query += " AND type_notification = %s"
+            params.append(type_notification)
+
+        if start_date:
+            query += " AND created_at >= %s"
+            params.append(start_date)
+
+        if end_date:
+            query += " AND created_at < %s"
+            params.append(end_date)
+
+        return self.executor.execute_update(query, tuple(params))
+
+    def delete_read_older_than(self, manager_id: int, days: int) -> int:
+        """Remove notificações já lidas do gestor criadas há mais de `days` dias"""
+        query = """
+            DELETE FROM notifications
+            WHERE manager_id = %s AND is_read = TRUE
+            AND created_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+        """
+        params = (manager_id, days)
+        return self.executor.execute_update(query, params)
+
+    def get_notification_manager_id(self, notification_id: int) -> Optional[int]:
+        query = """
+            SELECT manager_id FROM notifications WHERE id = %s
+        """
+        params = (notification_id,)
+        result = self.executor.execute_query_one(query, params)
+        return result['manager_id'] if result else None
 
     def list_all_notifications(self):
         query = """
@@ -60,6 +113,20 @@ class NotificationRepository:
         results = self.executor.execute_query(query)
         return results
 
+    def get_notification_counts(self) -> dict:
+        """Conta total e não lidas de todos os gestores em uma única consulta"""
+        query = """
+            SELECT
+                COUNT(*) as total,
+                COALESCE(SUM(is_read = FALSE), 0) as unread
+            FROM notifications
+        """
+        result = self.executor.execute_query_one(query)
+        return {
+            'total': int(result['total']) if result else 0,
+            'unread': int(result['unread']) if result else 0
+        }
+
     def get_unread_count_by_manager(self, manager_id: int) -> int:
         """Conta notificações não lidas de um gestor específico"""
         query = """
@@ -71,8 +138,42 @@ class NotificationRepository:
         result = self.executor.execute_query_one(query, params)
         return result['total'] if result else 0
 
-    def get_notifications_with_details(self, manager_id: int):
-        """Retorna notificações com JOIN para pegar detalhes do registro/usuário"""
+    def get_unread_notifications_by_manager(self, manager_id: int):
+        query = """
+            SELECT id, manager_id, access_register_id, created_at, type_notification, message, is_read
+            FROM notifications
+            WHERE manager_id = %s AND is_read = FALSE
+            ORDER BY created_at DESC
+        """
+        params = (manager_id,)
+        results = self.executor.execute_query(query, params)
+        return results
+
+    def get_notification_counts_by_manager(self, manager_id: int) -> dict:
+        """Conta total e não lidas de um gestor em uma única consulta"""
+        query = """
+            SELECT
+                COUNT(*) as total,
+                COALESCE(SUM(is_read = FALSE), 0) as unread
+            FROM notifications
+            WHERE manager_id = %s
+        """
+        params = (manager_id,)
+        result = self.executor.execute_query_one(query, params)
+        return {
+            'total': int(result['total']) if result else 0,
+            'unread': int(result['unread']) if result else 0
+        }
+
+    def get_notifications_with_details(self, manager_id: int, limit: Optional[int] = None,
+                                       before: Optional[Tuple[datetime, int]] = None,
+                                       is_read: Optional[bool] = None):
+        """
+        Retorna notificações com JOIN para pegar detalhes do registro/usuário.
+
+        Paginação por keyset: `before` é o par (created_at, id) da última
+        notificação da página anterior; a ordenação é (created_at, id) DESC.
+        """
         query = """
             SELECT n.id, n.manager_id, n.access_register_id, n.created_at,
                    n.type_notification, n.message, n.is_read,
@@ -82,8 +183,22 @@ class NotificationRepository:
             LEFT JOIN accessRegisters ar ON n.access_register_id = ar.id
             LEFT JOIN users u ON ar.user_id = u.id
             WHERE n.manager_id = %s
-            ORDER BY n.created_at DESC
         """
-        params = (manager_id,)
-        results = self.executor.execute_query(query, params)
+        params = [manager_id]
+
+        if is_read is not None:
+            query += " AND n.is_read = %s"
+            params.append(is_read)
+
+        if before is not None:
+            query += " AND (n.created_at < %s OR (n.created_at = %s AND n.id < %s))"
+            params.extend([before[0], before[0], before[1]])
+
+        query += " ORDER BY n.created_at DESC, n.id DESC"
+
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        results = self.executor.execute_query(query, tuple(params))
         return results
@@ -1,5 +1,7 @@
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Optional
 from facepass.database.setup_database.executor_query import QueryExecutor
+from facepass.database.repository.access_archive import AccessArchive
 from facepass.models.user import Usuario
 from facepass.models.registerAccess import RegistroAcesso
 from dotenv import load_dotenv
@@ -9,9 +11,12 @@ load_dotenv()
 
 
 class RegistroRepository:
-    def __init__(self, connection: Any):
+    def __init__(self, connection: Any, archive: Optional[AccessArchive] = None, replicas: Any = None):
         self.connection = connection
         self.executor = QueryExecutor(self.connection)
+        # Consultas de relatório podem ser servidas por uma réplica de leitura
+        self.report_executor = QueryExecutor(self.connection, replicas)
+        self.archive = archive or AccessArchive()
 
     def save_register(self, registro: RegistroAcesso) -> RegistroAcesso:
         query = """
@@ -30,10 +35,19 @@ class RegistroRepository:
         query = """
             SELECT id, user_id, created_at, type_access, access_allowed, reason_denied, captured_image
             FROM accessRegisters
-            WHERE created_at BETWEEN %s AND %s
+            WHERE created_at >= %s AND created_at < %s + INTERVAL 1 DAY
         """
         params = (start_date, end_date)
-        results = self.executor.execute_query(query, params)
+        results = self.report_executor.execute_query(query, params)
+
+        # Meses já movidos para o arquivo morto são lidos dos arquivos em disco
+        archived = self.archive.read_period(
+            datetime.fromisoformat(start_date),
+            datetime.fromisoformat(end_date) + timedelta(days=1))
+        if archived:
+            # Um registro pode estar nos dois lados se o arquivamento foi interrompido
+            hot_ids = {row['id'] for row in results}
+            results = [row for row in archived if row['id'] not in hot_ids] + results
         return results
 
     def get_registers_by_user(self, user_id: int):
@@ -60,7 +74,7 @@ class RegistroRepository:
             SELECT id, user_id, created_at, type_access, access_allowed, reason_denied, captured_image
             FROM accessRegisters
         """
-        results = self.executor.execute_query(query)
+        results = self.report_executor.execute_query(query)
         return results
 
     def get_registers_with_user_info(self, start_date: str = "", end_date: str = ""):
@@ -72,11 +86,11 @@ class RegistroRepository:
                        u.name as user_name, u.email as user_email
                 FROM accessRegisters ar
                 LEFT JOIN users u ON ar.user_id = u.id
-                WHERE ar.created_at BETWEEN %s AND %s
+                WHERE ar.created_at >= %s AND ar.created_at < %s + INTERVAL 1 DAY
                 ORDER BY ar.created_at DESC
             """
             params = (start_date, end_date)
-            results = self.executor.execute_query(query, params)
+            results = self.report_executor.execute_query(query, params)
         else:
             query = """
                 SELECT ar.id, ar.user_id, ar.created_at, ar.type_access,
@@ -86,7 +100,7 @@ class RegistroRepository:
                 LEFT JOIN users u ON ar.user_id = u.id
                 ORDER BY ar.created_at DESC
             """
-            results = self.executor.execute_query(query)
+            results = self.report_executor.execute_query(query)
         return results
 
     def get_today_access_count(self) -> int:
@@ -94,19 +108,16 @@ class RegistroRepository:
         query = """
             SELECT COUNT(*) as total
             FROM accessRegisters
-            WHERE DATE(created_at) = CURDATE()
+            WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
         """
         result = self.executor.execute_query_one(query)
         return result['total'] if result else 0
 
-    def get_registers_by_filters(self, user_name: str = "", status: str = "",
-                                 location: str = "", start_date: str = "",
-                                 end_date: str = ""):
-        """Busca com múltiplos filtros"""
-        query = """
-            SELECT ar.id, ar.user_id, ar.created_at, ar.type_access,
-                   ar.access_allowed, ar.reason_denied, ar.captured_image,
-                   u.name as user_name, u.email as user_email
+    def _filters_query(self, columns: str, user_name: str = "", status: str = "",
+                       start_date: str = "", end_date: str = ""):
+        """Monta o SELECT filtrado de registros com JOIN em users"""
+        query = f"""
+            SELECT {columns}
             FROM accessRegisters ar
             LEFT JOIN users u ON ar.user_id = u.id
             WHERE 1=1
@@ -123,17 +134,39 @@ class RegistroRepository:
             query += " AND ar.access_allowed = false"
 
         if start_date and end_date:
-            query += " AND ar.created_at BETWEEN %s AND %s"
+            query += " AND ar.created_at >= %s AND ar.created_at < %s + INTERVAL 1 DAY"
             params.extend([start_date, end_date])
 
         # TODO: Adicionar filtro de location quando implementar campo na tabela
 
         query += " ORDER BY ar.created_at DESC"
+        return query, tuple(params)
 
-        results = self.executor.execute_query(
-            query, tuple(params) if params else ())
+    def get_registers_by_filters(self, user_name: str = "", status: str = "",
+                                 location: str = "", start_date: str = "",
+                                 end_date: str = ""):
+        """Busca com múltiplos filtros"""
+        query, params = self._filters_query("""
+                   ar.id, ar.user_id, ar.created_at, ar.type_access,
+                   ar.access_allowed, ar.reason_denied, ar.captured_image,
+                   u.name as user_name, u.email as user_email""",
+            user_name, status, start_date, end_date)
+
+        results = self.report_executor.execute_query(query, params)
         return results
 
+    def iter_registers_by_filters(self, user_name: str = "", status: str = "",
+                                  location: str = "", start_date: str = "",
+                                  end_date: str = ""):
+        """Mesmos filtros, em streaming e sem a imagem capturada (exportação)"""
+        query, params = self._filters_query("""
+                   ar.id, ar.user_id, ar.created_at, ar.type_access,
+                   ar.access_allowed, ar.reason_denied,
+                   u.name as user_name, u.email as user_email""",
+            user_name, status, start_date, end_date)
+
+        return self.report_executor.iter_query(query, params)
+
     def get_access_count_by_status(self) -> dict:
         """Retorna contagem de acessos por status"""
         query = """
@@ -143,9 +176,9 @@ class RegistroRepository:
                 SUM(CASE WHEN access_allowed = false THEN 1 ELSE 0 END) as negados
             FROM accessRegisters
         """
-        result = self.executor.execute_query_one(query)
+        result = self.report_executor.execute_query_one(query)
         return {
-            'total': result['total'] if result else 0,
-            'permitidos': result['permitidos'] if result else 0,
-            'negados': result['negados'] if result else 0
+            'total': int(result['total'] or 0) if result else 0,
+            'permitidos': int(result['permitidos'] or 0) if result else 0,
+            'negados': int(result['negados'] or 0) if result else 0
         }
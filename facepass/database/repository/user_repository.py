@@ -1,6 +1,6 @@
-from typing import Any
+from typing import Any, List, Optional
 from facepass.database.setup_database.executor_query import QueryExecutor
-from facepass.models.user import Usuario
+from facepass.models.user import Usuario, UsuarioResumo
 from dotenv import load_dotenv
 import os
 
@@ -35,15 +35,15 @@ class UsuarioRepository:
             return None
         return result
 
-    def get_user_by_email(self, user_email: str):
+    def get_user_by_email(self, user_email: str) -> Optional[UsuarioResumo]:
         query = """
-            SELECT id, name, email, cpf, created_at, photo_recognition, position, approved FROM users WHERE email = %s
+            SELECT id, name, email, cpf, created_at, position, approved FROM users WHERE email = %s
         """
         params = (user_email,)
         result = self.executor.execute_query_one(query, params)
         if not result:
             return None
-        return result
+        return UsuarioResumo.from_dict(result)
 
     def get_user_by_cpf(self, user_cpf: str):
         query = """
@@ -67,28 +67,43 @@ class UsuarioRepository:
             DELETE FROM users WHERE id = %s
         """
         params = (user_id,)
-        self.executor.execute_update(query, params)
+        # accessRegisters particionada não tem FK: replica o ON DELETE SET NULL na mesma transação
+        with self.executor.transaction():
+            self.executor.execute_update(
+                "UPDATE accessRegisters SET user_id = NULL WHERE user_id = %s", (user_id,))
+            self.executor.execute_update(query, params)
+
+    def get_user_photo(self, user_id: int) -> Optional[bytes]:
+        """Busca apenas a foto de reconhecimento de um usuário (carregamento sob demanda)"""
+        query = """
+            SELECT photo_recognition FROM users WHERE id = %s
+        """
+        params = (user_id,)
+        result = self.executor.execute_query_one(query, params)
+        if not result:
+            return None
+        return result['photo_recognition']
 
-    def list_unapproved_users(self):
+    def list_unapproved_users(self) -> List[UsuarioResumo]:
         query = """
-            SELECT id, name, email, cpf, created_at, photo_recognition, position, approved FROM users WHERE approved = false
+            SELECT id, name, email, cpf, created_at, position, approved FROM users WHERE approved = false
         """
         results = self.executor.execute_query(query)
-        return results
+        return [UsuarioResumo.from_dict(row) for row in results]
 
-    def list_approved_users(self):
+    def list_approved_users(self) -> List[UsuarioResumo]:
         query = """
-            SELECT id, name, email, cpf, created_at, photo_recognition, position, approved FROM users WHERE approved = true
+            SELECT id, name, email, cpf, created_at, position, approved FROM users WHERE approved = true
         """
         results = self.executor.execute_query(query)
-        return results
+        return [UsuarioResumo.from_dict(row) for row in results]
 
-    def list_all_users(self):
+    def list_all_users(self) -> List[UsuarioResumo]:
         query = """
-            SELECT id, name, email, cpf, created_at, photo_recognition, position, approved FROM users
+            SELECT id, name, email, cpf, created_at, position, approved FROM users
         """
         results = self.executor.execute_query(query)
-        return results
+        return [UsuarioResumo.from_dict(row) for row in results]
 
     def update_user(self, usuario: Usuario) -> None:
         query = """
@@ -102,6 +117,22 @@ class UsuarioRepository:
                   usuario.approved, usuario.id)
         self.executor.execute_update(query, params)
 
+    def get_user_statistics(self) -> dict:
+        """Retorna total, aprovados e pendentes em uma única consulta"""
+        query = """
+            SELECT
+                COUNT(*) as total,
+                COALESCE(SUM(approved = true), 0) as approved,
+                COALESCE(SUM(approved = false), 0) as pending
+            FROM users
+        """
+        result = self.executor.execute_query_one(query)
+        return {
+            'total': int(result['total']) if result else 0,
+            'approved': int(result['approved']) if result else 0,
+            'pending': int(result['pending']) if result else 0
+        }
+
     def get_user_count(self) -> int:
         query = "SELECT COUNT(*) as total FROM users"
         result = self.executor.execute_query_one(query)
@@ -0,0 +1,129 @@
+"""
+Arquivamento dos registros de acesso antigos.
+
+Move os registros de accessRegisters mais antigos que N dias para o arquivo
+morto em disco (CSV gzip por mês + pack de imagens) e depois os remove do
+banco em lotes. RegistroRepository.get_register_by_period continua
+enxergando esses meses.
+
+Uso:
+    python -m facepass.database.setup_database.archive_access_registers --days 365
+"""
+import argparse
+import os
+from datetime import date, datetime, time, timedelta
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.database.setup_database.executor_query import QueryExecutor
+from facepass.database.repository.access_archive import AccessArchive
+
+dotenv.load_dotenv()
+
+ACCESS_ARCHIVE_AFTER_DAYS = int(os.getenv('ACCESS_ARCHIVE_AFTER_DAYS', '365'))
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def archive_access_registers(conn, days: int = ACCESS_ARCHIVE_AFTER_DAYS,
+                             batch_size: int = ARCHIVE_BATCH_SIZE,
+                             archive: AccessArchive = None) -> dict:
+    """
+    Arquiva e remove os registros com created_at anterior a hoje - `days`.
+
+    Os registros são lidos em streaming (cursor no servidor, `batch_size`
+    linhas por vez) e escritos nas partes do mês correspondente; só depois
+    que todas as partes foram publicadas as linhas são apagadas do banco,
+    em lotes.
+    """
+    archive = archive or AccessArchive()
+    executor = QueryExecutor(conn)
+    cutoff = datetime.combine(date.today() - timedelta(days=days), time.min)
+    part_id = datetime.now().strftime('%Y%m%d%H%M%S')
+
+    writers = {}
+    last_id = 0
+    archived = 0
+
+    batches = executor.iter_query("""
+        SELECT id, user_id, created_at, type_access, access_allowed, reason_denied, captured_image
+        FROM accessRegisters
+        WHERE created_at < %s
+        ORDER BY id
+    """, (cutoff,), fetch_size=batch_size, chunks=True)
+
+    try:
+        for rows in batches:
+            for row in rows:
+                month = row['created_at'].strftime('%Y-%m')
+                writer = writers.get(month)
+                if writer is None:
+                    writer = writers[month] = archive.open_part(month, part_id)
+                writer.write(row)
+
+            last_id = rows[-1]['id']
+            archived += len(rows)
+            print(f"  ⏳ {archived} registros arquivados...")
+    except Exception:
+        batches.close()
+        for writer in writers.values():
+            writer.abort()
+        raise
+
+    for writer in writers.values():
+        writer.close()
+
+    deleted = 0
+    if archived:
+        # accessRegisters particionada não tem FK: desvincula as notificações antes
+        executor.execute_update("""
+            UPDATE notifications SET access_register_id = NULL
+            WHERE access_register_id IN (
+                SELECT id FROM accessRegisters WHERE created_at < %s AND id <= %s
+            )
+        """, (cutoff, last_id))
+        while True:
+            removed = executor.execute_update("""
+                DELETE FROM accessRegisters
+                WHERE created_at < %s AND id <= %s
+                LIMIT %s
+            """, (cutoff, last_id, batch_size))
+            deleted += removed
+            if removed < batch_size:
+                break
+
+    return {'archived': archived, 'deleted': deleted, 'months': sorted(writers)}
+
+
+def run_archive(days: int = ACCESS_ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE) -> None:
+    host = os.getenv('DB_HOST', 'localhost')
+    user = os.getenv('DB_USER', 'root')
+    password = os.getenv('DB_PASSWORD', '')
+    database = os.getenv('DB_NAME', 'facepass_db')
+    port = int(os.getenv('DB_PORT', '3306'))
+
+    print(f"🔗 Conectando ao MySQL em {host}:{port}...")
+
+    db_connection = DatabaseConnection(host, user, password, database, port)
+    db_connection.connect()
+    conn = db_connection.get_connection()
+
+    if conn is None:
+        print("❌ Erro: Não foi possível estabelecer conexão com o banco de dados.")
+        return
+
+    print(f"📦 Arquivando registros com mais de {days} dias...")
+
+    try:
+        result = archive_access_registers(conn, days, batch_size)
+        print(f"  ✓ {result['archived']} registros arquivados em {len(result['months'])} mês(es)")
+        print(f"  ✓ {result['deleted']} registros removidos do banco")
+    finally:
+        db_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Arquiva registros de acesso antigos em disco")
+    parser.add_argument("--days", type=int, default=ACCESS_ARCHIVE_AFTER_DAYS,
+                        help="Arquiva registros mais antigos que N dias")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+    run_archive(args.days, args.batch_size)
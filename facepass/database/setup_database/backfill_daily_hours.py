@@ -0,0 +1,44 @@
+import argparse
+import os
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.database.repository.daily_hours_repository import DailyHoursRepository
+
+dotenv.load_dotenv()
+
+
+def backfill_daily_hours(days=None):
+    """Reconstrói a tabela daily_hours a partir dos registros de acesso"""
+    host = os.getenv('DB_HOST', 'localhost')
+    user = os.getenv('DB_USER', 'root')
+    password = os.getenv('DB_PASSWORD', '')
+    database = os.getenv('DB_NAME', 'facepass_db')
+    port = int(os.getenv('DB_PORT', '3306'))
+
+    print(f"🔗 Conectando ao MySQL em {host}:{port}...")
+
+    db_connection = DatabaseConnection(host, user, password, database, port)
+    db_connection.connect()
+    conn = db_connection.get_connection()
+
+    if conn is None:
+        print("❌ Erro: Não foi possível estabelecer conexão com o banco de dados.")
+        return
+
+    periodo = f"últimos {days} dias" if days is not None else "todo o histórico"
+    print(f"⏱️  Reconstruindo daily_hours ({periodo})...")
+
+    try:
+        rows = DailyHoursRepository(conn).rebuild(days)
+        print(f"  ✓ {rows} linhas (usuário, dia) gravadas")
+    finally:
+        db_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reconstrói a tabela daily_hours a partir de accessRegisters")
+    parser.add_argument("--days", type=int, default=None,
+                        help="Reconstrói apenas os últimos N dias (padrão: todo o histórico)")
+    args = parser.parse_args()
+    backfill_daily_hours(args.days)
@@ -0,0 +1,227 @@
+"""
+Cadastro em lote de usuários e encodings faciais.
+
+Lê um CSV (colunas: name, email, cpf, position, photo) e uma pasta com as
+fotos referenciadas na coluna `photo`. Os dados são validados com o
+InputValidator, os encodings são calculados em paralelo (pool de processos)
+e usuários + encodings são inseridos com executemany em transações por lote.
+Os usuários importados já entram aprovados.
+
+Uso:
+    python -m facepass.database.setup_database.bulk_enroll pessoas.csv fotos/ --workers 8
+"""
+import argparse
+import csv
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.validators.input_validator import InputValidator
+
+dotenv.load_dotenv()
+
+BULK_CHUNK_SIZE = 200
+PHOTO_MAX_BYTES = 65535  # users.photo_recognition é BLOB
+REQUIRED_COLUMNS = ('name', 'email', 'cpf', 'position', 'photo')
+
+
+def validate_rows(rows: List[Dict[str, str]], photo_dir: str, existing_emails: set,
+                  existing_cpfs: set) -> Tuple[List[Dict], List[Tuple[int, str, str]]]:
+    """
+    Valida as linhas do CSV; retorna (válidas, falhas).
+
+    Cada falha é (linha, email, erro); a linha considera o cabeçalho como 1.
+    """
+    validator = InputValidator()
+    valid, failures = [], []
+    seen_emails, seen_cpfs = set(), set()
+
+    for line, row in enumerate(rows, start=2):
+        name = (row.get('name') or '').strip()
+        email = (row.get('email') or '').strip()
+        cpf = re.sub(r'\D', '', row.get('cpf') or '')
+        position = (row.get('position') or '').strip()
+        photo_path = os.path.join(photo_dir, (row.get('photo') or '').strip())
+
+        errors = []
+        if not validator.validar_name(name):
+            errors.append("Nome inválido")
+        if not validator.validar_email(email):
+            errors.append("Email inválido")
+        elif email.lower() in existing_emails or email.lower() in seen_emails:
+            errors.append("Email já cadastrado")
+        if not validator.validar_cpf(cpf):
+            errors.append("CPF inválido")
+        elif cpf in existing_cpfs or cpf in seen_cpfs:
+            errors.append("CPF já cadastrado")
+        if not validator.validar_position(position):
+            errors.append("Cargo inválido")
+        if not os.path.isfile(photo_path) or os.path.getsize(photo_path) == 0:
+            errors.append("Foto não encontrada")
+        elif os.path.getsize(photo_path) > PHOTO_MAX_BYTES:
+            errors.append(f"Foto excede {PHOTO_MAX_BYTES} bytes")
+
+        if errors:
+            failures.append((line, email, "; ".join(errors)))
+            continue
+
+        seen_emails.add(email.lower())
+        seen_cpfs.add(cpf)
+        valid.append({'line': line, 'name': name, 'email': email, 'cpf': cpf,
+                      'position': position, 'photo_path': photo_path})
+
+    return valid, failures
+
+
+def encode_photo(photo_path: str) -> Tuple[Optional[bytes], Optional[bytes], Optional[str]]:
+    """
+    Executado nos processos do pool: lê a foto e calcula o encoding.
+
+    Retorna (foto, encoding serializado, erro).
+    """
+    # Importados aqui para que apenas os workers carreguem o dlib
+    from facepass.models.faceEncoding import FaceEncoding
+    from facepass.services.face_recognition_service import FaceRecognitionService
+
+    try:
+        with open(photo_path, 'rb') as photo_file:
+            photo = photo_file.read()
+    except OSError as e:
+        return None, None, f"Erro ao ler foto: {e}"
+
+    try:
+        encoding = FaceRecognitionService(None).generate_face_encoding(photo)
+    except ValueError as e:
+        return photo, None, f"Foto rejeitada: {e}"
+    if encoding is None:
+        return photo, None, "Nenhum rosto detectado na foto"
+
+    return photo, FaceEncoding(0, encoding).to_bytes(), None
+
+
+def insert_chunk(conn, chunk: List[Dict]) -> None:
+    """Insere usuários e encodings de um lote numa única transação"""
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("""
+            INSERT INTO users (name, email, cpf, photo_recognition, position, approved)
+            VALUES (%s, %s, %s, %s, %s, TRUE)
+        """, [(row['name'], row['email'], row['cpf'], row['photo'], row['position']) for row in chunk])
+
+        # executemany pode dividir o INSERT; os ids são resolvidos pelo email
+        emails = [row['email'] for row in chunk]
+        placeholders = ", ".join(["%s"] * len(emails))
+        cursor.execute(f"SELECT id, email FROM users WHERE email IN ({placeholders})", emails)
+        user_ids = {email.lower(): user_id for user_id, email in cursor.fetchall()}
+
+        cursor.executemany("""
+            INSERT INTO face_encoding (user_id, encoding) VALUES (%s, %s)
+        """, [(user_ids[row['email'].lower()], row['encoding']) for row in chunk])
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def load_existing_keys(conn) -> Tuple[set, set]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT email, cpf FROM users")
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return {email.lower() for email, _ in rows}, {cpf for _, cpf in rows}
+
+
+def write_report(report_path: str, failures: List[Tuple[int, str, str]]) -> None:
+    with open(report_path, 'w', newline='', encoding='utf-8') as report_file:
+        writer = csv.writer(report_file)
+        writer.writerow(['line', 'email', 'error'])
+        writer.writerows(sorted(failures))
+
+
+def bulk_enroll(csv_path: str, photo_dir: str, workers: Optional[int] = None,
+                chunk_size: int = BULK_CHUNK_SIZE, report_path: str = 'bulk_enroll_failures.csv') -> None:
+    with open(csv_path, newline='', encoding='utf-8-sig') as csv_file:
+        reader = csv.DictReader(csv_file)
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            print(f"❌ Colunas ausentes no CSV: {', '.join(missing)}")
+            return
+        rows = list(reader)
+
+    host = os.getenv('DB_HOST', 'localhost')
+    user = os.getenv('DB_USER', 'root')
+    password = os.getenv('DB_PASSWORD', '')
+    database = os.getenv('DB_NAME', 'facepass_db')
+    port = int(os.getenv('DB_PORT', '3306'))
+
+    print(f"🔗 Conectando ao MySQL em {host}:{port}...")
+
+    db_connection = DatabaseConnection(host, user, password, database, port)
+    db_connection.connect()
+    conn = db_connection.get_connection()
+
+    if conn is None:
+        print("❌ Erro: Não foi possível estabelecer conexão com o banco de dados.")
+        return
+
+    start = time.perf_counter()
+    imported = 0
+
+    try:
+        print(f"\n🔎 Validando {len(rows)} linhas...")
+        existing_emails, existing_cpfs = load_existing_keys(conn)
+        valid, failures = validate_rows(rows, photo_dir, existing_emails, existing_cpfs)
+        print(f"  ✓ {len(valid)} válidas, {len(failures)} com erro")
+
+        print(f"\n🧠 Gerando encodings com {workers or os.cpu_count()} processos...")
+        chunk = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(encode_photo, [row['photo_path'] for row in valid], chunksize=8)
+
+            for done, (row, (photo, encoding, error)) in enumerate(zip(valid, results), start=1):
+                if error:
+                    failures.append((row['line'], row['email'], error))
+                else:
+                    row['photo'], row['encoding'] = photo, encoding
+                    chunk.append(row)
+
+                if len(chunk) >= chunk_size or (done == len(valid) and chunk):
+                    try:
+                        insert_chunk(conn, chunk)
+                        imported += len(chunk)
+                    except Exception as e:
+                        failures.extend((r['line'], r['email'], f"Erro ao inserir lote: {e}") for r in chunk)
+                    chunk = []
+
+                if done % chunk_size == 0 or done == len(valid):
+                    elapsed = time.perf_counter() - start
+                    print(f"  ⏳ {done}/{len(valid)} processados, {imported} importados "
+                          f"({done / elapsed:.1f} fotos/s)")
+    finally:
+        db_connection.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {imported} usuários importados em {elapsed:.1f}s")
+
+    if failures:
+        write_report(report_path, failures)
+        print(f"⚠️  {len(failures)} falhas registradas em {report_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cadastro em lote de usuários com reconhecimento facial")
+    parser.add_argument("csv_path", help="CSV com as colunas name, email, cpf, position, photo")
+    parser.add_argument("photo_dir", help="Pasta com as fotos referenciadas no CSV")
+    parser.add_argument("--workers", type=int, default=None, help="Processos para gerar encodings (padrão: nº de CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE, help="Usuários por transação")
+    parser.add_argument("--report", default='bulk_enroll_failures.csv', help="Arquivo do relatório de falhas")
+    args = parser.parse_args()
+    bulk_enroll(args.csv_path, args.photo_dir, args.workers, args.chunk_size, args.report)
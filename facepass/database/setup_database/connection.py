@@ -1,14 +1,145 @@
+import os
+import time
 import mysql.connector
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Réplicas de leitura: "host[:porta],host[:porta]" (vazio = só o primário)
+DB_REPLICAS = os.getenv('DB_REPLICAS', '')
+# Atraso máximo de replicação tolerado (segundos) antes de voltar ao primário
+DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+# Intervalo entre verificações de saúde/atraso de cada réplica (segundos)
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '10'))
+
+
+def parse_replica_endpoints(value: str = DB_REPLICAS, default_port: int = 3306) -> List[Tuple[str, int]]:
+    """Converte "host1:3307,host2" em [(host1, 3307), (host2, default_port)]"""
+    endpoints = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(':')
+        endpoints.append((host, int(port) if port else default_port))
+    return endpoints
+
+
+class ReadReplicas:
+    """
+    Conexões com as réplicas de leitura, escolhidas em rodízio.
+
+    Cada réplica é verificada a cada `check_interval` segundos (conexão ativa e
+    atraso de replicação); réplicas fora do ar ou atrasadas mais que `max_lag`
+    são puladas e, sem nenhuma disponível, acquire() retorna None para que a
+    leitura vá ao primário. Um servidor que não está replicando (ex.: uma
+    segunda instância local usada como stand-in) é tratado como sem atraso.
+    """
+
+    def __init__(self, endpoints: List[Tuple[str, int]], user, password, database=None,
+                 max_lag: float = DB_REPLICA_MAX_LAG, check_interval: float = DB_REPLICA_CHECK_INTERVAL):
+        self.user = user
+        self.password = password
+        self.database = database
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.replicas: List[Dict[str, Any]] = [
+            {'host': host, 'port': port, 'connection': None, 'healthy': False, 'lag': None, 'checked_at': None}
+            for host, port in endpoints
+        ]
+        self._next = 0
+
+    def connect(self) -> None:
+        for replica in self.replicas:
+            self._check(replica)
+
+    def acquire(self) -> Optional[Any]:
+        """Próxima réplica saudável (rodízio) ou None para usar o primário"""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+
+            checked_at = replica['checked_at']
+            if checked_at is None or time.monotonic() - checked_at >= self.check_interval:
+                self._check(replica)
+            if replica['healthy']:
+                return replica['connection']
+        return None
+
+    def mark_failed(self, connection: Any) -> None:
+        """Tira a réplica do rodízio até a próxima verificação"""
+        for replica in self.replicas:
+            if replica['connection'] is connection:
+                replica['healthy'] = False
+                replica['checked_at'] = time.monotonic()
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [{'host': r['host'], 'port': r['port'], 'healthy': r['healthy'], 'lag': r['lag']}
+                for r in self.replicas]
+
+    def close(self) -> None:
+        for replica in self.replicas:
+            if replica['connection']:
+                try:
+                    replica['connection'].close()
+                except Exception:
+                    pass
+                replica['connection'] = None
+
+    def _check(self, replica: Dict[str, Any]) -> None:
+        replica['checked_at'] = time.monotonic()
+        try:
+            connection = replica['connection']
+            if connection is None or not connection.is_connected():
+                connection = replica['connection'] = mysql.connector.connect(
+                    host=replica['host'],
+                    user=self.user,
+                    password=self.password,
+                    database=self.database,
+                    port=replica['port'],
+                    # Sem transação aberta entre leituras: cada SELECT enxerga
+                    # o estado mais recente replicado, não um snapshot antigo
+                    autocommit=True
+                )
+            replica['lag'] = self._replication_lag(connection)
+            replica['healthy'] = replica['lag'] is not None and replica['lag'] <= self.max_lag
+        except mysql.connector.Error as err:
+            print(f"Réplica {replica['host']}:{replica['port']} indisponível: {err}")
+            replica['lag'] = None
+            replica['healthy'] = False
+
+    @staticmethod
+    def _replication_lag(connection) -> Optional[float]:
+        """Segundos de atraso; None se a replicação está parada (requer REPLICATION CLIENT)"""
+        cursor = connection.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except mysql.connector.ProgrammingError:
+                # MySQL < 8.0.22
+                cursor.execute("SHOW SLAVE STATUS")
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+
+        if row is None:
+            return 0.0
+        lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        return None if lag is None else float(lag)
 
 
 class DatabaseConnection:
-    def __init__(self, host, user, password, database=None, port=3306):
+    def __init__(self, host, user, password, database=None, port=3306,
+                 replicas: Optional[List[Tuple[str, int]]] = None):
         self.host = host
         self.user = user
         self.password = password
         self.database = database
         self.port = port
         self.connection = None
+        self.replica_endpoints = replicas or []
+        self.replicas: Optional[ReadReplicas] = None
 
     def connect(self):
         try:
@@ -24,7 +155,13 @@ class DatabaseConnection:
             print(f"Erro ao conectar ao MySQL: {err}")
             self.connection = None
 
+        if self.replica_endpoints:
+            self.replicas = ReadReplicas(self.replica_endpoints, self.user, self.password, self.database)
+            self.replicas.connect()
+
     def close(self):
+        if self.replicas:
+            self.replicas.close()
         if self.connection:
             self.connection.close()
             print("Conexão fechada.")
@@ -32,6 +169,9 @@ class DatabaseConnection:
     def get_connection(self):
         return self.connection
 
+    def get_replicas(self) -> Optional[ReadReplicas]:
+        return self.replicas
+
     def execute_query(self, query, params=None):
         if self.connection is None:
             raise RuntimeError(
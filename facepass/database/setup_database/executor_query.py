@@ -1,10 +1,132 @@
+import time
+from contextlib import contextmanager
 import mysql.connector
-from typing import List, Dict, Any
+import numpy as np
+import pandas as pd
+from mysql.connector import FieldType
+from typing import Callable, List, Dict, Any, Iterator, Optional
+from facepass.database.setup_database.query_instrumentation import query_stats, estimate_bytes
+
+# Depth of the unit of work open on each connection (id(connection) -> level).
+# Several QueryExecutor instances (one per repository) share the same connection.
+_open_transactions: Dict[int, int] = {}
+# Callbacks run after the outermost transaction on a connection commits
+_after_commit: Dict[int, List[Callable[[], None]]] = {}
+
+# Rows pulled from the server per round trip by iter_query
+DEFAULT_FETCH_SIZE = 1000
+
+# MySQL column type -> NumPy dtype used by query_arrays (anything else stays object)
+_INTEGER_TYPES = {FieldType.TINY, FieldType.SHORT, FieldType.INT24,
+                  FieldType.LONG, FieldType.LONGLONG, FieldType.YEAR}
+_FLOAT_TYPES = {FieldType.DECIMAL, FieldType.NEWDECIMAL, FieldType.FLOAT, FieldType.DOUBLE}
+_DATETIME_TYPES = {FieldType.DATETIME, FieldType.TIMESTAMP}
+
+
+def _column_dtype(type_code: int, values: tuple) -> Any:
+    if type_code in _INTEGER_TYPES:
+        # NULLs can only be represented as NaN
+        return np.float64 if None in values else np.int64
+    if type_code in _FLOAT_TYPES:
+        return np.float64
+    if type_code in _DATETIME_TYPES:
+        return 'datetime64[us]'
+    if type_code == FieldType.DATE:
+        return 'datetime64[D]'
+    return object
 
 
 class QueryExecutor:
-    def __init__(self, connection: Any):
+    def __init__(self, connection: Any, replicas: Any = None):
+        """
+        `replicas` (a ReadReplicas) routes this executor's SELECTs to a read
+        replica; writes, and reads inside a transaction, stay on `connection`.
+        """
         self.connection = connection
+        self.replicas = replicas
+
+    def in_transaction(self) -> bool:
+        return _open_transactions.get(id(self.connection), 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: groups every statement executed on this connection inside
+        the block into a single transaction, committed once at the end (or
+        rolled back on error). Nested blocks join the outermost transaction.
+        """
+        if self.connection is None:
+            raise RuntimeError(
+                "No database connection. Call connect() before executing queries.")
+
+        key = id(self.connection)
+        depth = _open_transactions.get(key, 0)
+        _open_transactions[key] = depth + 1
+        callbacks = []
+        try:
+            yield self
+            if depth == 0:
+                self.connection.commit()
+                callbacks = _after_commit.pop(key, [])
+        except Exception:
+            if depth == 0:
+                try:
+                    self.connection.rollback()
+                except Exception:
+                    pass
+            raise
+        finally:
+            if depth == 0:
+                _open_transactions.pop(key, None)
+                _after_commit.pop(key, None)
+            else:
+                _open_transactions[key] = depth
+
+        for callback in callbacks:
+            callback()
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Runs `callback` once the current unit of work commits (immediately
+        when there is none). Discarded if the transaction rolls back, so
+        in-memory state derived from a write never gets ahead of the database.
+        """
+        if self.in_transaction():
+            _after_commit.setdefault(id(self.connection), []).append(callback)
+        else:
+            callback()
+
+    def _read_connection(self) -> Any:
+        if self.replicas is None or self.in_transaction():
+            return self.connection
+        return self.replicas.acquire() or self.connection
+
+    def _run_read(self, read):
+        """
+        Runs read(connection) on a replica when available. If the replica
+        connection fails, it leaves the rotation and the read is retried
+        on the primary.
+        """
+        connection = self._read_connection()
+        if connection is not self.connection:
+            try:
+                return read(connection)
+            except (mysql.connector.InterfaceError, mysql.connector.OperationalError):
+                self.replicas.mark_failed(connection)
+        return read(self.connection)
+
+    def _commit(self) -> None:
+        # Inside a unit of work the commit is deferred to the end of the block
+        if not self.in_transaction():
+            self.connection.commit()
+
+    def _rollback(self) -> None:
+        if self.in_transaction():
+            return
+        try:
+            self.connection.rollback()
+        except Exception:
+            pass
 
     def execute_query(self, query: str, params: tuple = ()):
         """
@@ -15,27 +137,141 @@ class QueryExecutor:
             raise RuntimeError(
                 "No database connection. Call connect() before executing queries.")
 
-        cursor = self.connection.cursor(dictionary=True)
+        return self._run_read(lambda connection: self._fetch_all(connection, query, params))
+
+    def _fetch_all(self, connection: Any, query: str, params: tuple):
+        cursor = connection.cursor(dictionary=True)
+        start = time.perf_counter() if query_stats.enabled else None
 
         try:
             cursor.execute(query, params or ())
             result = cursor.fetchall()
+            if start is not None:
+                query_stats.record(query, (time.perf_counter() - start) * 1000,
+                                   len(result), estimate_bytes(result))
             return result
         except mysql.connector.Error:
             raise
         finally:
             cursor.close()
 
+    def iter_query(self, query: str, params: tuple = (), fetch_size: int = DEFAULT_FETCH_SIZE,
+                   dictionary: bool = True, chunks: bool = False) -> Iterator[Any]:
+        """
+        Executes a SELECT query on an unbuffered (server-side) cursor and yields
+        the rows as they arrive, fetching `fetch_size` rows per round trip.
+        Memory stays bounded by the fetch size, whatever the result size.
+
+        Yields dictionaries (or tuples with dictionary=False); with chunks=True
+        yields lists of up to `fetch_size` rows instead of single rows.
+
+        While the generator is open the connection is busy streaming: consume
+        it fully (or close it) before running other queries on the same
+        connection. Bulk jobs should stream from a dedicated connection.
+        """
+        if self.connection is None:
+            raise RuntimeError(
+                "No database connection. Call connect() before executing queries.")
+
+        connection = self._read_connection()
+        cursor = connection.cursor(buffered=False, dictionary=dictionary)
+        start = time.perf_counter() if query_stats.enabled else None
+        rows_read = 0
+        bytes_read = 0
+
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                batch = cursor.fetchmany(fetch_size)
+                if not batch:
+                    break
+                rows_read += len(batch)
+                if start is not None:
+                    bytes_read += estimate_bytes(batch)
+
+                if chunks:
+                    yield batch
+                else:
+                    yield from batch
+        finally:
+            # An abandoned stream leaves unread rows on the connection
+            try:
+                connection.consume_results()
+            except Exception:
+                pass
+            cursor.close()
+            if start is not None:
+                query_stats.record(query, (time.perf_counter() - start) * 1000, rows_read, bytes_read)
+
+    def query_arrays(self, query: str, params: tuple = (),
+                     dtypes: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """
+        Executes a SELECT query and returns its columns as NumPy arrays
+        ({column name: array}), built straight from the cursor tuples.
+
+        Dtypes follow the MySQL column types: integers -> int64 (float64 when
+        the column has NULLs), DECIMAL/FLOAT -> float64 (no Decimal objects),
+        DATE/DATETIME -> datetime64, everything else -> object.
+        `dtypes` overrides the dtype of specific columns.
+        """
+        if self.connection is None:
+            raise RuntimeError(
+                "No database connection. Call connect() before executing queries.")
+
+        rows, description = self._run_read(
+            lambda connection: self._fetch_tuples(connection, query, params))
+
+        dtypes = dtypes or {}
+        columns = list(zip(*rows)) if rows else [()] * len(description)
+        arrays = {}
+        for column, values in zip(description, columns):
+            name, type_code = column[0], column[1]
+            dtype = dtypes.get(name) or _column_dtype(type_code, values)
+            arrays[name] = np.array(values, dtype=dtype)
+        return arrays
+
+    def _fetch_tuples(self, connection: Any, query: str, params: tuple):
+        cursor = connection.cursor()
+        start = time.perf_counter() if query_stats.enabled else None
+
+        try:
+            cursor.execute(query, params or ())
+            rows = cursor.fetchall()
+            if start is not None:
+                query_stats.record(query, (time.perf_counter() - start) * 1000,
+                                   len(rows), estimate_bytes(rows))
+            return rows, cursor.description
+        except mysql.connector.Error:
+            raise
+        finally:
+            cursor.close()
+
+    def query_frame(self, query: str, params: tuple = (),
+                    dtypes: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Executes a SELECT query and returns a DataFrame built from
+        query_arrays (same dtype rules, one array per column).
+        """
+        return pd.DataFrame(self.query_arrays(query, params, dtypes), copy=False)
+
     def execute_query_one(self, query: str, params: tuple = ()):
         if self.connection is None:
             raise RuntimeError(
                 "No database connection. Call connect() before executing queries.")
 
-        cursor = self.connection.cursor(dictionary=True)
+        return self._run_read(lambda connection: self._fetch_one(connection, query, params))
+
+    def _fetch_one(self, connection: Any, query: str, params: tuple):
+        cursor = connection.cursor(dictionary=True)
+        start = time.perf_counter() if query_stats.enabled else None
 
         try:
             cursor.execute(query, params or ())
             result = cursor.fetchone()
+            if start is not None:
+                rows = [result] if result else []
+                query_stats.record(query, (time.perf_counter() - start) * 1000,
+                                   len(rows), estimate_bytes(rows))
             return result
         except mysql.connector.Error:
             raise
@@ -54,16 +290,16 @@ class QueryExecutor:
                 "No database connection. Call connect() before executing queries.")
 
         cursor = self.connection.cursor()
+        start = time.perf_counter() if query_stats.enabled else None
 
         try:
             cursor.execute(query, params or ())
-            self.connection.commit()
+            self._commit()
+            if start is not None:
+                query_stats.record(query, (time.perf_counter() - start) * 1000, cursor.rowcount)
             return cursor.rowcount
         except mysql.connector.Error:
-            try:
-                self.connection.rollback()
-            except Exception:
-                pass
+            self._rollback()
             raise
         finally:
             cursor.close()
@@ -74,16 +310,16 @@ class QueryExecutor:
                 "No database connection. Call connect() before executing queries.")
 
         cursor = self.connection.cursor()
+        start = time.perf_counter() if query_stats.enabled else None
 
         try:
             cursor.execute(query, params or ())
-            self.connection.commit()
+            self._commit()
+            if start is not None:
+                query_stats.record(query, (time.perf_counter() - start) * 1000, cursor.rowcount)
             return cursor.lastrowid
         except mysql.connector.Error:
-            try:
-                self.connection.rollback()
-            except Exception:
-                pass
+            self._rollback()
             raise
         finally:
             cursor.close()
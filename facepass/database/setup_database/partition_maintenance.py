@@ -0,0 +1,339 @@
+"""
+Manutenção da tabela accessRegisters: particionamento mensal e retenção.
+
+- Migra a tabela para partições mensais (RANGE sobre UNIX_TIMESTAMP(created_at))
+- Cria antecipadamente as partições dos próximos meses
+- Aplica a retenção, se configurada: primeiro descarta as imagens capturadas
+  antigas e depois remove partições (meses) inteiras além do limite
+
+A retenção é destrutiva e fica desligada por padrão: só roda com
+--image-retention-days / --retention-months (ou ACCESS_IMAGE_RETENTION_DAYS /
+ACCESS_RETENTION_MONTHS) maiores que zero.
+
+Uso (ex.: agendado diariamente via cron):
+    python -m facepass.database.setup_database.partition_maintenance [--migrate]
+    python -m facepass.database.setup_database.partition_maintenance --image-retention-days 90 --retention-months 24
+"""
+import argparse
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Tuple
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+
+dotenv.load_dotenv()
+
+TABLE = 'accessRegisters'
+FUTURE_PARTITION = 'p_future'
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', '3'))
+# 0 desativa a retenção correspondente
+ACCESS_IMAGE_RETENTION_DAYS = int(os.getenv('ACCESS_IMAGE_RETENTION_DAYS', '0'))
+ACCESS_RETENTION_MONTHS = int(os.getenv('ACCESS_RETENTION_MONTHS', '0'))
+RETENTION_BATCH_SIZE = 5000
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month.strftime('%Y%m')}"
+
+
+def partition_definition(month: date) -> str:
+    """Partição que guarda o mês `month` (limite superior: início do mês seguinte)"""
+    upper_bound = add_months(month, 1).strftime('%Y-%m-%d 00:00:00')
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (UNIX_TIMESTAMP('{upper_bound}'))"
+
+
+def list_month_partitions(cursor, database: str) -> List[Tuple[str, date]]:
+    """Retorna [(nome, mês)] das partições mensais existentes, em ordem"""
+    cursor.execute("""
+        SELECT partition_name FROM information_schema.partitions
+        WHERE table_schema = %s AND table_name = %s AND partition_name IS NOT NULL
+        ORDER BY partition_ordinal_position
+    """, (database, TABLE))
+    partitions = []
+    for (name,) in cursor.fetchall():
+        if name != FUTURE_PARTITION:
+            partitions.append((name, datetime.strptime(name[1:], '%Y%m').date()))
+    return partitions
+
+
+def is_partitioned(cursor, database: str) -> bool:
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.partitions
+        WHERE table_schema = %s AND table_name = %s AND partition_name IS NOT NULL
+    """, (database, TABLE))
+    return cursor.fetchone()[0] > 0
+
+
+def list_foreign_keys(cursor, database: str) -> List[Dict[str, Any]]:
+    """FKs que envolvem accessRegisters (como filha ou referenciada), com as regras de ação"""
+    cursor.execute("""
+        SELECT rc.table_name, rc.constraint_name, rc.referenced_table_name, rc.update_rule, rc.delete_rule,
+               kcu.column_name, kcu.referenced_column_name
+        FROM information_schema.referential_constraints rc
+        JOIN information_schema.key_column_usage kcu
+            ON kcu.constraint_schema = rc.constraint_schema
+            AND kcu.table_name = rc.table_name
+            AND kcu.constraint_name = rc.constraint_name
+        WHERE rc.constraint_schema = %s AND (rc.table_name = %s OR rc.referenced_table_name = %s)
+        ORDER BY rc.table_name, rc.constraint_name, kcu.ordinal_position
+    """, (database, TABLE, TABLE))
+
+    foreign_keys: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for table_name, name, referenced_table, update_rule, delete_rule, column, referenced_column in cursor.fetchall():
+        fk = foreign_keys.setdefault((table_name, name), {
+            'table': table_name, 'name': name, 'referenced_table': referenced_table,
+            'update_rule': update_rule, 'delete_rule': delete_rule,
+            'columns': [], 'referenced_columns': []
+        })
+        fk['columns'].append(column)
+        fk['referenced_columns'].append(referenced_column)
+    return list(foreign_keys.values())
+
+
+def add_foreign_key(cursor, fk: Dict[str, Any]) -> None:
+    columns = ", ".join(fk['columns'])
+    referenced_columns = ", ".join(fk['referenced_columns'])
+    cursor.execute(f"""
+        ALTER TABLE {fk['table']} ADD CONSTRAINT {fk['name']}
+        FOREIGN KEY ({columns}) REFERENCES {fk['referenced_table']} ({referenced_columns})
+        ON DELETE {fk['delete_rule']} ON UPDATE {fk['update_rule']}
+    """)
+
+
+def check_migration_preconditions(cursor, foreign_keys: List[Dict[str, Any]]) -> List[str]:
+    """Problemas que fariam a migração (ou a restauração das FKs) falhar no meio; vazio se pode migrar"""
+    problems = []
+
+    cursor.execute(f"SELECT COUNT(*) FROM {TABLE} WHERE created_at IS NULL")
+    null_dates = cursor.fetchone()[0]
+    if null_dates:
+        problems.append(f"{null_dates} registro(s) com created_at NULL em {TABLE}")
+
+    for fk in foreign_keys:
+        join = " AND ".join(f"p.{ref} = c.{col}" for col, ref in zip(fk['columns'], fk['referenced_columns']))
+        not_null = " AND ".join(f"c.{col} IS NOT NULL" for col in fk['columns'])
+        cursor.execute(f"""
+            SELECT COUNT(*) FROM {fk['table']} c
+            WHERE {not_null} AND NOT EXISTS (SELECT 1 FROM {fk['referenced_table']} p WHERE {join})
+        """)
+        orphans = cursor.fetchone()[0]
+        if orphans:
+            problems.append(f"{orphans} linha(s) órfã(s) em {fk['table']} ({fk['name']})")
+
+    return problems
+
+
+def migrate_to_partitions(cursor, database: str, months_ahead: int = PARTITION_MONTHS_AHEAD) -> None:
+    """
+    Converte accessRegisters para partições mensais.
+
+    O MySQL não permite chaves estrangeiras em tabelas particionadas e exige que
+    a chave primária inclua a coluna de particionamento. Por isso as FKs que
+    envolvem accessRegisters são removidas (o ON DELETE SET NULL de users passa
+    a ser feito pela aplicação) e a PK passa a ser (id, created_at).
+
+    As pré-condições são verificadas antes de qualquer alteração; se um dos
+    ALTERs falhar, as FKs removidas são recriadas antes de propagar o erro.
+    """
+    if is_partitioned(cursor, database):
+        print("  ✓ Tabela já particionada")
+        return
+
+    foreign_keys = list_foreign_keys(cursor, database)
+    problems = check_migration_preconditions(cursor, foreign_keys)
+    if problems:
+        raise RuntimeError("Migração cancelada, nada foi alterado: " + "; ".join(problems))
+
+    dropped = []
+    try:
+        for fk in foreign_keys:
+            cursor.execute(f"ALTER TABLE {fk['table']} DROP FOREIGN KEY {fk['name']}")
+            dropped.append(fk)
+            print(f"  ✓ FK '{fk['name']}' removida de '{fk['table']}'")
+
+        cursor.execute(f"""
+            ALTER TABLE {TABLE}
+                MODIFY created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                DROP PRIMARY KEY,
+                ADD PRIMARY KEY (id, created_at)
+        """)
+
+        cursor.execute(f"SELECT MIN(created_at) FROM {TABLE}")
+        oldest = cursor.fetchone()[0]
+        first_month = month_start(oldest.date() if oldest else date.today())
+        last_month = add_months(month_start(date.today()), months_ahead)
+
+        definitions = []
+        month = first_month
+        while month <= last_month:
+            definitions.append(partition_definition(month))
+            month = add_months(month, 1)
+        definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+
+        print(f"  ⏳ Particionando {TABLE} em {len(definitions)} partições...")
+        cursor.execute(f"""
+            ALTER TABLE {TABLE}
+            PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (
+                {", ".join(definitions)}
+            )
+        """)
+    except Exception:
+        print("  ❌ Falha na migração; restaurando as chaves estrangeiras...")
+        for fk in dropped:
+            add_foreign_key(cursor, fk)
+            print(f"  ✓ FK '{fk['name']}' recriada em '{fk['table']}'")
+        raise
+
+    print("  ✓ Migração para partições mensais concluída")
+
+
+def ensure_future_partitions(cursor, database: str, months_ahead: int = PARTITION_MONTHS_AHEAD) -> int:
+    """Garante partições até `months_ahead` meses à frente; retorna quantas foram criadas"""
+    partitions = list_month_partitions(cursor, database)
+    if not partitions:
+        return 0
+
+    target = add_months(month_start(date.today()), months_ahead)
+    month = add_months(partitions[-1][1], 1)
+    created = 0
+
+    while month <= target:
+        cursor.execute(f"""
+            ALTER TABLE {TABLE} REORGANIZE PARTITION {FUTURE_PARTITION} INTO (
+                {partition_definition(month)},
+                PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE
+            )
+        """)
+        print(f"  ✓ Partição '{partition_name(month)}' criada")
+        month = add_months(month, 1)
+        created += 1
+
+    return created
+
+
+def purge_old_images(conn, image_retention_days: int = ACCESS_IMAGE_RETENTION_DAYS) -> int:
+    """Remove as imagens capturadas mais antigas que a retenção, em lotes"""
+    cutoff = datetime.combine(date.today() - timedelta(days=image_retention_days), datetime.min.time())
+    cursor = conn.cursor()
+    total = 0
+    try:
+        while True:
+            cursor.execute(f"""
+                UPDATE {TABLE} SET captured_image = NULL
+                WHERE created_at < %s AND captured_image IS NOT NULL
+                LIMIT %s
+            """, (cutoff, RETENTION_BATCH_SIZE))
+            conn.commit()
+            total += cursor.rowcount
+            if cursor.rowcount < RETENTION_BATCH_SIZE:
+                return total
+    finally:
+        cursor.close()
+
+
+def drop_expired_rows(conn, database: str, retention_months: int = ACCESS_RETENTION_MONTHS) -> int:
+    """
+    Remove os registros além da retenção.
+
+    Com a tabela particionada, descarta partições inteiras (operação de
+    metadados); caso contrário, apaga em lotes.
+    """
+    cutoff = add_months(month_start(date.today()), -retention_months)
+    cursor = conn.cursor()
+    removed = 0
+    try:
+        if is_partitioned(cursor, database):
+            for name, month in list_month_partitions(cursor, database):
+                if add_months(month, 1) > cutoff:
+                    break
+                # Sem FK, as notificações precisam ser desvinculadas manualmente
+                cursor.execute(f"""
+                    UPDATE notifications SET access_register_id = NULL
+                    WHERE access_register_id IN (SELECT id FROM {TABLE} PARTITION ({name}))
+                """)
+                cursor.execute(f"ALTER TABLE {TABLE} DROP PARTITION {name}")
+                conn.commit()
+                removed += 1
+                print(f"  ✓ Partição '{name}' removida")
+            return removed
+
+        while True:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE created_at < %s LIMIT %s",
+                           (cutoff, RETENTION_BATCH_SIZE))
+            conn.commit()
+            removed += cursor.rowcount
+            if cursor.rowcount < RETENTION_BATCH_SIZE:
+                return removed
+    finally:
+        cursor.close()
+
+
+def run_maintenance(migrate: bool = False, months_ahead: int = PARTITION_MONTHS_AHEAD,
+                    image_retention_days: int = ACCESS_IMAGE_RETENTION_DAYS,
+                    retention_months: int = ACCESS_RETENTION_MONTHS) -> None:
+    host = os.getenv('DB_HOST', 'localhost')
+    user = os.getenv('DB_USER', 'root')
+    password = os.getenv('DB_PASSWORD', '')
+    database = os.getenv('DB_NAME', 'facepass_db')
+    port = int(os.getenv('DB_PORT', '3306'))
+
+    print(f"🔗 Conectando ao MySQL em {host}:{port}...")
+
+    db_connection = DatabaseConnection(host, user, password, database, port)
+    db_connection.connect()
+    conn = db_connection.get_connection()
+
+    if conn is None:
+        print("❌ Erro: Não foi possível estabelecer conexão com o banco de dados.")
+        return
+
+    cursor = conn.cursor()
+    try:
+        if migrate:
+            print(f"\n🗂️  Migrando '{TABLE}' para partições mensais...")
+            migrate_to_partitions(cursor, database, months_ahead)
+
+        if is_partitioned(cursor, database):
+            print(f"\n📅 Garantindo partições para os próximos {months_ahead} meses...")
+            created = ensure_future_partitions(cursor, database, months_ahead)
+            print(f"  ✓ {created} partição(ões) criada(s)")
+    finally:
+        cursor.close()
+
+    if image_retention_days > 0:
+        print(f"\n🖼️  Removendo imagens com mais de {image_retention_days} dias...")
+        images = purge_old_images(conn, image_retention_days)
+        print(f"  ✓ {images} imagem(ns) removida(s)")
+    else:
+        print("\n🖼️  Retenção de imagens desativada (--image-retention-days)")
+
+    if retention_months > 0:
+        print(f"\n🧹 Aplicando retenção de {retention_months} meses...")
+        removed = drop_expired_rows(conn, database, retention_months)
+        print(f"  ✓ {removed} partição(ões)/registro(s) removido(s)")
+    else:
+        print("\n🧹 Retenção de registros desativada (--retention-months)")
+
+    db_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manutenção de partições e retenção de accessRegisters")
+    parser.add_argument("--migrate", action="store_true",
+                        help="Converte a tabela para partições mensais (executar uma única vez)")
+    parser.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--image-retention-days", type=int, default=ACCESS_IMAGE_RETENTION_DAYS,
+                        help="Descarta imagens capturadas mais antigas que N dias (0 = desativado)")
+    parser.add_argument("--retention-months", type=int, default=ACCESS_RETENTION_MONTHS,
+                        help="Remove registros mais antigos que N meses (0 = desativado)")
+    args = parser.parse_args()
+    run_maintenance(args.migrate, args.months_ahead, args.image_retention_days, args.retention_months)
@@ -0,0 +1,153 @@
+import contextvars
+import logging
+import os
+import re
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+QUERY_INSTRUMENTATION = os.getenv('QUERY_INSTRUMENTATION', 'false').lower() in ('1', 'true', 'yes')
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+SLOW_QUERY_LOG_SIZE = 50
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)')
+
+
+def fingerprint(query: str) -> str:
+    """Normaliza o SQL: literais viram ?, listas IN (...) colapsam e espaços são unificados"""
+    normalized = _STRING_LITERAL.sub('?', query)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = normalized.replace('%s', '?')
+    normalized = _PLACEHOLDER_LIST.sub('(?+)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip().rstrip(';')
+
+
+def estimate_bytes(rows: List[Any]) -> int:
+    """Soma aproximada do tamanho dos valores retornados (str/bytes)"""
+    total = 0
+    for row in rows:
+        values = row.values() if isinstance(row, dict) else row
+        for value in values:
+            if isinstance(value, (bytes, bytearray, str)):
+                total += len(value)
+            elif value is not None:
+                total += 8
+    return total
+
+
+class QueryScope:
+    """Contagem de consultas dentro de um escopo (ex.: uma renderização de página)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_ms = 0.0
+        self.by_fingerprint: Dict[str, int] = {}
+
+    def add(self, query_fingerprint: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.by_fingerprint[query_fingerprint] = self.by_fingerprint.get(query_fingerprint, 0) + 1
+
+    def repeated(self, threshold: int = 5) -> Dict[str, int]:
+        """Consultas repetidas `threshold` vezes ou mais: candidatas a N+1"""
+        return {fp: count for fp, count in self.by_fingerprint.items() if count >= threshold}
+
+
+class QueryStats:
+    """
+    Agregados por fingerprint de SQL, log de consultas lentas e escopos de
+    contagem. Desativado por padrão (QUERY_INSTRUMENTATION=true liga).
+    """
+
+    def __init__(self, enabled: bool = QUERY_INSTRUMENTATION, slow_query_ms: float = SLOW_QUERY_MS):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._slow_queries: deque = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self._scope: contextvars.ContextVar[Optional[QueryScope]] = contextvars.ContextVar(
+            'facepass_query_scope', default=None)
+
+    def enable(self, slow_query_ms: Optional[float] = None) -> None:
+        self.enabled = True
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def record(self, query: str, elapsed_ms: float, rows: int, nbytes: int = 0) -> None:
+        query_fingerprint = fingerprint(query)
+
+        with self._lock:
+            stats = self._stats.get(query_fingerprint)
+            if stats is None:
+                stats = self._stats[query_fingerprint] = {
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'bytes': 0}
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['rows'] += rows
+            stats['bytes'] += nbytes
+
+            if elapsed_ms >= self.slow_query_ms:
+                self._slow_queries.append({
+                    'fingerprint': query_fingerprint,
+                    'ms': round(elapsed_ms, 2),
+                    'rows': rows,
+                    'at': datetime.now()
+                })
+                logger.warning("Consulta lenta (%.1f ms, %d linhas): %s", elapsed_ms, rows, query_fingerprint)
+
+        scope = self._scope.get()
+        if scope is not None:
+            scope.add(query_fingerprint, elapsed_ms)
+
+    @contextmanager
+    def scope(self, name: str):
+        """Conta as consultas executadas dentro do bloco (por contexto/thread)"""
+        query_scope = QueryScope(name)
+        token = self._scope.set(query_scope)
+        try:
+            yield query_scope
+        finally:
+            self._scope.reset(token)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cópia dos agregados, ordenados pelo tempo total (para testes e o painel de debug)"""
+        with self._lock:
+            queries = [
+                {'fingerprint': fp, **{key: round(value, 2) if isinstance(value, float) else value
+                                       for key, value in stats.items()}}
+                for fp, stats in self._stats.items()
+            ]
+            slow_queries = list(self._slow_queries)
+
+        queries.sort(key=lambda q: q['total_ms'], reverse=True)
+        return {
+            'enabled': self.enabled,
+            'slow_query_ms': self.slow_query_ms,
+            'total_queries': sum(q['count'] for q in queries),
+            'queries': queries,
+            'slow_queries': slow_queries
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+
+
+# Compartilhado pelo processo: todos os QueryExecutor registram aqui
+query_stats = QueryStats()
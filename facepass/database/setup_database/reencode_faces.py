@@ -0,0 +1,236 @@
+"""
+Regeneração em massa dos encodings faciais (troca de modelo/configuração).
+
+Relê users.photo_recognition com um cursor no servidor (sem carregar tudo
+em memória), recalcula os encodings num pool de processos e grava em lotes
+numa tabela sombra (face_encoding_next). O reconhecimento continua usando
+face_encoding até a troca, feita com um RENAME TABLE atômico.
+
+A troca executa o RENAME TABLE sob LOCK TABLES, o que exige MySQL 8.0.13 ou
+superior; em versões anteriores o job falha antes de processar qualquer
+foto (use --no-switch para apenas preencher a tabela sombra).
+
+O job é retomável: a própria tabela sombra serve de checkpoint (cada lote é
+confirmado junto com seus encodings) e uma nova execução continua a partir
+do último usuário gravado.
+
+Uso:
+    python -m facepass.database.setup_database.reencode_faces --workers 8
+    python -m facepass.database.setup_database.reencode_faces --restart   # descarta o progresso
+"""
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+import dotenv
+from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.database.setup_database.executor_query import QueryExecutor
+
+dotenv.load_dotenv()
+
+SHADOW_TABLE = 'face_encoding_next'
+OLD_TABLE = 'face_encoding_old'
+REENCODE_BATCH_SIZE = 256
+# RENAME TABLE com a sessão em LOCK TABLES só é aceito a partir desta versão
+RENAME_UNDER_LOCK_MIN_VERSION = (8, 0, 13)
+
+
+def encode_photo_bytes(photo: bytes) -> Optional[bytes]:
+    """Executado nos processos do pool: retorna o encoding serializado ou None"""
+    from facepass.models.faceEncoding import FaceEncoding
+    from facepass.services.face_recognition_service import FaceRecognitionService
+
+    try:
+        encoding = FaceRecognitionService(None).generate_face_encoding(bytes(photo))
+    except ValueError:
+        # Imagem rejeitada na ingestão (limites ou formato): tratada como sem rosto
+        return None
+    if encoding is None:
+        return None
+    return FaceEncoding(0, encoding).to_bytes()
+
+
+def create_shadow_table(cursor, restart: bool = False) -> None:
+    """Cria face_encoding_next com a mesma estrutura (índices e FKs) de face_encoding"""
+    if restart:
+        cursor.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+
+    cursor.execute("SHOW CREATE TABLE face_encoding")
+    ddl = cursor.fetchone()[1]
+    # Nomes de constraints são únicos no schema: deixa o MySQL gerar novos
+    ddl = re.sub(r"CONSTRAINT `[^`]+` ", "", ddl)
+    ddl = re.sub(r" AUTO_INCREMENT=\d+", "", ddl)
+    ddl = ddl.replace("CREATE TABLE `face_encoding`", f"CREATE TABLE IF NOT EXISTS `{SHADOW_TABLE}`", 1)
+    cursor.execute(ddl)
+
+
+def server_version(cursor) -> Tuple[int, int, int]:
+    """Versão do servidor (ex.: '8.0.36-0ubuntu0.22.04.1' -> (8, 0, 36))"""
+    cursor.execute("SELECT VERSION()")
+    version = cursor.fetchone()[0]
+    match = re.match(r"(\d+)\.(\d+)\.(\d+)", version)
+    if match is None:
+        raise RuntimeError(f"Versão do servidor não reconhecida: {version}")
+    return tuple(int(part) for part in match.groups())
+
+
+def check_switch_supported(cursor) -> None:
+    """Falha antes do processamento se o servidor não aceita a troca de switch_tables"""
+    version = server_version(cursor)
+    if version < RENAME_UNDER_LOCK_MIN_VERSION:
+        required = '.'.join(map(str, RENAME_UNDER_LOCK_MIN_VERSION))
+        found = '.'.join(map(str, version))
+        raise RuntimeError(
+            f"A troca de tabelas exige MySQL {required} ou superior (RENAME TABLE sob LOCK TABLES); "
+            f"servidor em {found}. Use --no-switch para apenas preencher {SHADOW_TABLE}."
+        )
+
+
+def switch_tables(conn) -> int:
+    """
+    Troca atômica: copia para a tabela sombra os encodings que não foram
+    regenerados (falhas ou usuários aprovados durante o job) e renomeia.
+
+    Retorna quantos encodings antigos foram mantidos.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {OLD_TABLE}")
+        # Bloqueia cadastros de encoding entre a cópia final e o RENAME
+        cursor.execute(f"LOCK TABLES face_encoding WRITE, {SHADOW_TABLE} WRITE")
+        try:
+            cursor.execute(f"""
+                SELECT user_id, encoding FROM face_encoding
+                WHERE user_id NOT IN (SELECT user_id FROM {SHADOW_TABLE})
+            """)
+            kept = cursor.fetchall()
+            if kept:
+                cursor.executemany(f"INSERT INTO {SHADOW_TABLE} (user_id, encoding) VALUES (%s, %s)", kept)
+                conn.commit()
+
+            cursor.execute(f"RENAME TABLE face_encoding TO {OLD_TABLE}, {SHADOW_TABLE} TO face_encoding")
+        finally:
+            cursor.execute("UNLOCK TABLES")
+        return len(kept)
+    finally:
+        cursor.close()
+
+
+def reencode_faces(read_conn, write_conn, workers: Optional[int] = None,
+                   batch_size: int = REENCODE_BATCH_SIZE, restart: bool = False,
+                   switch: bool = True, keep_old: bool = False) -> None:
+    cursor = write_conn.cursor()
+    try:
+        if switch:
+            check_switch_supported(cursor)
+        create_shadow_table(cursor, restart)
+        cursor.execute(f"SELECT COALESCE(MAX(user_id), 0) FROM {SHADOW_TABLE}")
+        checkpoint = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT COUNT(*) FROM users u
+            WHERE u.id > %s AND u.photo_recognition IS NOT NULL
+            AND EXISTS (SELECT 1 FROM face_encoding fe WHERE fe.user_id = u.id)
+        """, (checkpoint,))
+        total = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+    if checkpoint:
+        print(f"  ↪ Retomando a partir do usuário {checkpoint}")
+    print(f"  {total} fotos a processar")
+
+    # Cursor no servidor: as linhas são lidas sob demanda, um lote por vez
+    batches = QueryExecutor(read_conn).iter_query("""
+        SELECT u.id, u.photo_recognition FROM users u
+        WHERE u.id > %s AND u.photo_recognition IS NOT NULL
+        AND EXISTS (SELECT 1 FROM face_encoding fe WHERE fe.user_id = u.id)
+        ORDER BY u.id
+    """, (checkpoint,), fetch_size=batch_size, dictionary=False, chunks=True)
+
+    processed = failed = 0
+    start = time.perf_counter()
+    write_cursor = write_conn.cursor()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch in batches:
+                user_ids = [row[0] for row in batch]
+                encodings = list(pool.map(encode_photo_bytes, [row[1] for row in batch], chunksize=4))
+
+                rows = [(user_id, encoding) for user_id, encoding in zip(user_ids, encodings) if encoding is not None]
+                if rows:
+                    write_cursor.executemany(
+                        f"INSERT INTO {SHADOW_TABLE} (user_id, encoding) VALUES (%s, %s)", rows)
+                write_conn.commit()
+
+                processed += len(batch)
+                failed += len(batch) - len(rows)
+                elapsed = time.perf_counter() - start
+                rate = processed / elapsed if elapsed else 0.0
+                eta = (total - processed) / rate if rate else 0.0
+                print(f"  ⏳ {processed}/{total} ({rate:.1f} fotos/s, ~{eta:.0f}s restantes, {failed} falhas)")
+    finally:
+        write_cursor.close()
+        batches.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"  ✓ {processed} fotos processadas em {elapsed:.1f}s ({failed} sem rosto detectado)")
+
+    if not switch:
+        print("  ⏸️  Troca não realizada (--no-switch)")
+        return
+
+    kept = switch_tables(write_conn)
+    print(f"  ✓ Tabelas trocadas ({kept} encodings antigos mantidos para usuários não regenerados)")
+
+    if not keep_old:
+        cursor = write_conn.cursor()
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS {OLD_TABLE}")
+        finally:
+            cursor.close()
+
+
+def run_reencode(workers: Optional[int] = None, batch_size: int = REENCODE_BATCH_SIZE,
+                 restart: bool = False, switch: bool = True, keep_old: bool = False) -> None:
+    host = os.getenv('DB_HOST', 'localhost')
+    user = os.getenv('DB_USER', 'root')
+    password = os.getenv('DB_PASSWORD', '')
+    database = os.getenv('DB_NAME', 'facepass_db')
+    port = int(os.getenv('DB_PORT', '3306'))
+
+    print(f"🔗 Conectando ao MySQL em {host}:{port}...")
+
+    # Duas conexões: uma fica ocupada com o streaming das fotos
+    read_connection = DatabaseConnection(host, user, password, database, port)
+    write_connection = DatabaseConnection(host, user, password, database, port)
+    read_connection.connect()
+    write_connection.connect()
+
+    if read_connection.get_connection() is None or write_connection.get_connection() is None:
+        print("❌ Erro: Não foi possível estabelecer conexão com o banco de dados.")
+        return
+
+    print(f"\n🧠 Regenerando encodings faciais com {workers or os.cpu_count()} processos...")
+
+    try:
+        reencode_faces(read_connection.get_connection(), write_connection.get_connection(),
+                       workers, batch_size, restart, switch, keep_old)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+    finally:
+        read_connection.close()
+        write_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenera todos os encodings faciais a partir das fotos")
+    parser.add_argument("--workers", type=int, default=None, help="Processos para gerar encodings (padrão: nº de CPUs)")
+    parser.add_argument("--batch-size", type=int, default=REENCODE_BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="Descarta o progresso salvo e recomeça")
+    parser.add_argument("--no-switch", action="store_true", help="Apenas preenche a tabela sombra, sem trocar")
+    parser.add_argument("--keep-old", action="store_true", help=f"Mantém a tabela anterior como {OLD_TABLE}")
+    args = parser.parse_args()
+    run_reencode(args.workers, args.batch_size, args.restart, not args.no_switch, args.keep_old)
@@ -5,6 +5,76 @@ from facepass.database.setup_database.connection import DatabaseConnection
 dotenv.load_dotenv()
 
 
+def create_index_if_not_exists(cursor, database: str, table: str, index_name: str,
+                               columns: str, unique: bool = False) -> bool:
+    """Cria um índice caso ainda não exista (MySQL não suporta CREATE INDEX IF NOT EXISTS)"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = %s AND table_name = %s AND index_name = %s
+    """, (database, table, index_name))
+    if cursor.fetchone()[0] > 0:
+        return False
+
+    unique_clause = "UNIQUE " if unique else ""
+    cursor.execute(
+        f"CREATE {unique_clause}INDEX {index_name} ON {table} ({columns})")
+    return True
+
+
+def add_column_if_not_exists(cursor, database: str, table: str, column: str, definition: str) -> bool:
+    """Adiciona uma coluna a bancos criados antes dela existir (idempotente)"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s AND column_name = %s
+    """, (database, table, column))
+    if cursor.fetchone()[0] > 0:
+        return False
+
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+def deduplicate_face_encodings(cursor) -> int:
+    """Mantém apenas o encoding mais recente de cada usuário (pré-requisito do índice único)"""
+    cursor.execute("""
+        DELETE older FROM face_encoding older
+        JOIN face_encoding newer ON newer.user_id = older.user_id AND newer.id > older.id
+    """)
+    return cursor.rowcount
+
+
+def create_indexes(cursor, database: str) -> None:
+    """Cria os índices usados pelas consultas da aplicação (idempotente)"""
+    print("🗂️  Criando índices...")
+
+    if create_index_if_not_exists(cursor, database, 'users', 'idx_users_approved', 'approved'):
+        print("  ✓ Índice 'idx_users_approved' criado")
+
+    if create_index_if_not_exists(cursor, database, 'notifications', 'idx_notifications_manager_read_created',
+                                  'manager_id, is_read, created_at'):
+        print("  ✓ Índice 'idx_notifications_manager_read_created' criado")
+
+    if create_index_if_not_exists(cursor, database, 'notifications', 'idx_notifications_manager_created',
+                                  'manager_id, created_at'):
+        print("  ✓ Índice 'idx_notifications_manager_created' criado")
+
+    if create_index_if_not_exists(cursor, database, 'notifications', 'idx_notifications_read_created',
+                                  'is_read, created_at'):
+        print("  ✓ Índice 'idx_notifications_read_created' criado")
+
+    if create_index_if_not_exists(cursor, database, 'accessRegisters', 'idx_access_registers_created',
+                                  'created_at'):
+        print("  ✓ Índice 'idx_access_registers_created' criado")
+
+    removed = deduplicate_face_encodings(cursor)
+    if removed:
+        print(f"  ✓ {removed} encodings duplicados removidos")
+
+    if create_index_if_not_exists(cursor, database, 'face_encoding', 'uq_face_encoding_user',
+                                  'user_id', unique=True):
+        print("  ✓ Índice único 'uq_face_encoding_user' criado")
+
+
 def create_database():
     host = os.getenv('DB_HOST', 'localhost')
     user = os.getenv('DB_USER', 'root')
@@ -54,11 +124,16 @@ def create_database():
             id INT AUTO_INCREMENT PRIMARY KEY,
             name VARCHAR(100) NOT NULL,
             email VARCHAR(100) NOT NULL UNIQUE,
-            password_hash VARCHAR(255) NOT NULL
+            password_hash VARCHAR(255) NOT NULL,
+            session_version INT NOT NULL DEFAULT 0
         )
     """)
     print("  ✓ Tabela 'manager' criada")
 
+    # Versão dos tokens de sessão: incrementá-la revoga as sessões abertas do gestor
+    if add_column_if_not_exists(cursor, database, 'manager', 'session_version', 'INT NOT NULL DEFAULT 0'):
+        print("  ✓ Coluna 'manager.session_version' adicionada")
+
     # Tabela: accessRegisters
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS accessRegisters (
@@ -96,11 +171,29 @@ def create_database():
             id INT AUTO_INCREMENT PRIMARY KEY,
             user_id INT NOT NULL,
             encoding BLOB NOT NULL,
+            UNIQUE KEY uq_face_encoding_user (user_id),
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
         )
     """)
     print("  ✓ Tabela 'face_encoding' criada")
 
+    # Tabela: daily_hours (fato agregado por usuário/dia para horas extras)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_hours (
+            user_id INT NOT NULL,
+            work_date DATE NOT NULL,
+            first_entry DATETIME NULL,
+            last_exit DATETIME NULL,
+            minutes_worked INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, work_date),
+            INDEX idx_daily_hours_work_date (work_date),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+    print("  ✓ Tabela 'daily_hours' criada")
+
+    create_indexes(cursor, database)
+
     # Criar um manager padrão se não existir (necessário para notificações)
     cursor.execute("SELECT COUNT(*) FROM manager")
     row = cursor.fetchone()
@@ -144,6 +237,7 @@ def create_database():
     print("  3. accessRegisters")
     print("  4. notifications")
     print("  5. face_encoding")
+    print("  6. daily_hours")
 
 
 if __name__ == "__main__":
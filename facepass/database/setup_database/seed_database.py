@@ -1,9 +1,11 @@
+import argparse
 import os
-import random
-import hashlib
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import dotenv
+import numpy as np
 from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.models.faceEncoding import FaceEncoding
+from facepass.database.repository.daily_hours_repository import DailyHoursRepository
 
 dotenv.load_dotenv()
 
@@ -35,30 +37,34 @@ DENIAL_REASONS = [
 ]
 
 
-def generate_cpf():
-    """Gera um CPF fictício válido"""
-    cpf = [random.randint(0, 9) for _ in range(9)]
+FIRST_NAMES = [name.split()[0] for name in NAMES]
+LAST_NAMES = [name.split()[-1] for name in NAMES]
+
+SEED_CHUNK_SIZE = 5000
+
+
+def generate_cpfs(rng, count):
+    """Gera `count` CPFs fictícios válidos e distintos (vetorizado)"""
+    base = rng.choice(10 ** 9, size=count, replace=False)
+    digits = (base[:, None] // 10 ** np.arange(8, -1, -1)) % 10
 
     # Primeiro dígito verificador
-    sum1 = sum([(10 - i) * cpf[i] for i in range(9)])
-    d1 = 11 - (sum1 % 11)
-    d1 = 0 if d1 >= 10 else d1
-    cpf.append(d1)
+    d1 = 11 - (digits @ np.arange(10, 1, -1)) % 11
+    d1[d1 >= 10] = 0
 
     # Segundo dígito verificador
-    sum2 = sum([(11 - i) * cpf[i] for i in range(10)])
-    d2 = 11 - (sum2 % 11)
-    d2 = 0 if d2 >= 10 else d2
-    cpf.append(d2)
+    d2 = 11 - (digits @ np.arange(11, 2, -1) + d1 * 2) % 11
+    d2[d2 >= 10] = 0
 
-    return ''.join(map(str, cpf))
+    return [f"{b:09d}{a}{c}" for b, a, c in zip(base.tolist(), d1.tolist(), d2.tolist())]
 
 
-def generate_email(name):
-    """Gera email baseado no nome"""
-    first_name = name.split()[0].lower()
-    last_name = name.split()[-1].lower()
-    return f"{first_name}.{last_name}@facepass.com"
+def generate_name_and_email(index):
+    """Combina nomes e sobrenomes; os primeiros coincidem com a lista NAMES"""
+    first_name = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last_name = LAST_NAMES[(index + index // len(LAST_NAMES)) % len(LAST_NAMES)]
+    suffix = f".{index}" if index >= len(NAMES) else ""
+    return f"{first_name} {last_name}", f"{first_name.lower()}.{last_name.lower()}{suffix}@facepass.com"
 
 
 def create_placeholder_photo():
@@ -66,209 +72,189 @@ def create_placeholder_photo():
     return b'\x00' * 100  # 100 bytes vazios como placeholder
 
 
-def seed_users(cursor, count=20):
-    """Cria usuários de exemplo"""
-    print(f"\n👥 Criando {count} usuários...")
-
-    users = []
-    used_names = random.sample(NAMES, min(count, len(NAMES)))
-
-    for i, name in enumerate(used_names):
-        email = generate_email(name)
-        cpf = generate_cpf()
-        position = random.choice(POSITIONS)
-        photo = create_placeholder_photo()
-        
-        rand = random.random()
-        if rand < 0.7:
-            approved = True
-        else:
-            approved = False
-
-        created_at = datetime.now() - timedelta(days=random.randint(30, 90))
-
-        cursor.execute("""
-            INSERT INTO users (name, email, cpf, created_at, photo_recognition, position, approved)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, (name, email, cpf, created_at, photo, position, approved))
-
-        user_id = cursor.lastrowid
-        users.append({
-            'id': user_id,
-            'name': name,
-            'approved': approved,
-            'created_at': created_at
-        })
-
-    print(f"  ✓ {len(users)} usuários criados")
-    return users
+def insert_in_chunks(conn, cursor, query, rows, chunk_size=SEED_CHUNK_SIZE):
+    """executemany (INSERT multi-linha) em transações de até `chunk_size` linhas"""
+    for start in range(0, len(rows), chunk_size):
+        cursor.executemany(query, rows[start:start + chunk_size])
+        conn.commit()
 
 
-def seed_access_registers(cursor, users):
-    """Cria registros de acesso (entrada/saída) distribuídos ao longo de 30 dias"""
-    print(f"\n🚪 Criando registros de acesso...")
+def seed_users(conn, cursor, rng, count=20, days=30, chunk_size=SEED_CHUNK_SIZE):
+    """Cria usuários de exemplo; retorna (ids, aprovados) como arrays NumPy"""
+    print(f"\n👥 Criando {count} usuários...")
 
-    approved_users = [u for u in users if u['approved']]
+    cpfs = generate_cpfs(rng, count)
+    positions = rng.choice(POSITIONS, size=count).tolist()
+    approved = rng.random(count) < 0.7
+    now = np.datetime64(datetime.now(), 's')
+    created_at = (now - rng.integers(days, days + 60, size=count) * np.timedelta64(1, 'D')).tolist()
+    photo = create_placeholder_photo()
+
+    rows = []
+    for i in range(count):
+        name, email = generate_name_and_email(i)
+        rows.append((name, email, cpfs[i], created_at[i], photo, positions[i], bool(approved[i])))
+
+    insert_in_chunks(conn, cursor, """
+        INSERT INTO users (name, email, cpf, created_at, photo_recognition, position, approved)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, rows, chunk_size)
+
+    # A tabela foi truncada: os ids seguem a ordem de inserção
+    cursor.execute("SELECT id FROM users ORDER BY id")
+    user_ids = np.array([row[0] for row in cursor.fetchall()], dtype=np.int64)
+
+    print(f"  ✓ {count} usuários criados")
+    return user_ids, approved
+
+
+def seed_face_encodings(conn, cursor, rng, user_ids, chunk_size=SEED_CHUNK_SIZE):
+    """Cria encodings sintéticos de 128 dimensões para os usuários aprovados"""
+    print(f"\n🧠 Criando {len(user_ids)} encodings sintéticos...")
+
+    query = "INSERT INTO face_encoding (user_id, encoding) VALUES (%s, %s)"
+    for start in range(0, len(user_ids), chunk_size):
+        chunk_ids = user_ids[start:start + chunk_size]
+        vectors = rng.normal(0.0, 0.1, size=(len(chunk_ids), 128))
+        rows = [(int(user_id), FaceEncoding(int(user_id), vector).to_bytes())
+                for user_id, vector in zip(chunk_ids, vectors)]
+        cursor.executemany(query, rows)
+        conn.commit()
 
-    if not approved_users:
+    print(f"  ✓ {len(user_ids)} encodings criados")
+
+
+def generate_day_events(rng, day_start, approved_ids, events_per_day, denied_per_day, now):
+    """
+    Gera os acessos de um dia como arrays NumPy: (user_ids, horários, tipos,
+    permitidos, motivos). user_id -1 representa rosto não reconhecido.
+    """
+    minute = np.timedelta64(60, 's')
+    hour = np.timedelta64(3600, 's')
+
+    attending = approved_ids[rng.random(len(approved_ids)) < 0.8]
+    n = len(attending)
+
+    # Entrada entre 7h e 10h
+    user_parts = [attending]
+    time_parts = [day_start + 7 * hour + rng.integers(0, 180, size=n) * minute]
+    type_parts = [np.full(n, 'entrada', dtype=object)]
+
+    # Saídas/retornos intermediários (ex.: almoço) entre 11h e 14h
+    middle = max(events_per_day - 2, 0) // 2 * 2
+    if middle:
+        offsets = np.sort(rng.integers(0, 180, size=(n, middle)), axis=1)
+        user_parts.append(np.repeat(attending, middle))
+        time_parts.append((day_start + 11 * hour + offsets * minute).ravel())
+        type_parts.append(np.tile(np.array(['saida', 'entrada'], dtype=object), n * middle // 2))
+
+    # Saída entre 17h e 19h para 90% dos presentes
+    leaving = attending[rng.random(n) < 0.9]
+    user_parts.append(leaving)
+    time_parts.append(day_start + 17 * hour + rng.integers(0, 120, size=len(leaving)) * minute)
+    type_parts.append(np.full(len(leaving), 'saida', dtype=object))
+
+    allowed_count = sum(len(part) for part in user_parts)
+
+    # Acessos negados: 50% de usuários aprovados, 50% não reconhecidos
+    denied = rng.poisson(denied_per_day)
+    denied_users = np.where(rng.random(denied) < 0.5, rng.choice(approved_ids, size=denied), -1)
+    user_parts.append(denied_users)
+    time_parts.append(day_start + 6 * hour + rng.integers(0, 14 * 60, size=denied) * minute)
+    type_parts.append(np.full(denied, 'entrada', dtype=object))
+
+    user_ids = np.concatenate(user_parts)
+    times = np.concatenate(time_parts)
+    types = np.concatenate(type_parts)
+    allowed = np.arange(len(user_ids)) < allowed_count
+    reasons = np.full(len(user_ids), None, dtype=object)
+    reasons[~allowed] = rng.choice(np.array(DENIAL_REASONS, dtype=object), size=denied)
+
+    # Ordem cronológica; no dia atual, apenas o que já aconteceu
+    order = np.argsort(times, kind='stable')
+    order = order[times[order] <= now]
+    return user_ids[order], times[order], types[order], allowed[order], reasons[order]
+
+
+def seed_access_registers(conn, cursor, rng, approved_ids, days=30, events_per_day=2,
+                          denied_per_day=0.33, with_images=True, chunk_size=SEED_CHUNK_SIZE):
+    """Cria registros de acesso (entrada/saída) distribuídos ao longo de `days` dias"""
+    print(f"\n🚪 Criando registros de acesso ({days} dias)...")
+
+    if len(approved_ids) == 0:
         print("  ⚠️  Nenhum usuário aprovado encontrado, pulando registros de acesso")
-        return []
-
-    access_records = []
-    now = datetime.now()
-
-    # Criar acessos para os últimos 30 dias
-    for day_offset in range(30, -1, -1):  # Últimos 30 dias até hoje
-        date = now - timedelta(days=day_offset)
-
-        # Apenas dias úteis (segunda a sexta)
-        if date.weekday() >= 5:
+        return {'allowed': 0, 'denied': 0}
+
+    query = """
+        INSERT INTO accessRegisters
+        (user_id, created_at, type_access, access_allowed, reason_denied, captured_image)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    photo = create_placeholder_photo() if with_images else None
+    now = np.datetime64(datetime.now(), 's')
+    today = date.today()
+    counts = {'allowed': 0, 'denied': 0}
+    buffer = []
+
+    for day_offset in range(days, -1, -1):  # Últimos N dias até hoje
+        day = today - timedelta(days=day_offset)
+
+        # Apenas dias úteis (segunda a sexta); hoje sempre tem movimento
+        if day.weekday() >= 5 and day != today:
             continue
 
-        for user in approved_users:
-            if random.random() < 0.8:
-                entry_hour = random.randint(7, 9)
-                entry_minute = random.randint(0, 59)
-                entry_time = date.replace(
-                    hour=entry_hour, minute=entry_minute, second=0)
-
-                # Criar entrada
-                cursor.execute("""
-                    INSERT INTO accessRegisters
-                    (user_id, created_at, type_access, access_allowed, reason_denied, captured_image)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (user['id'], entry_time, 'entrada', True, None, create_placeholder_photo()))
-
-                entry_id = cursor.lastrowid
-                access_records.append({
-                    'id': entry_id,
-                    'user_id': user['id'],
-                    'type': 'entrada',
-                    'time': entry_time
-                })
-
-                if random.random() < 0.9:
-                    exit_hour = random.randint(17, 18)
-                    exit_minute = random.randint(0, 59)
-                    exit_time = date.replace(
-                        hour=exit_hour, minute=exit_minute, second=0)
-
-                    cursor.execute("""
-                        INSERT INTO accessRegisters
-                        (user_id, created_at, type_access, access_allowed, reason_denied, captured_image)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (user['id'], exit_time, 'saida', True, None, create_placeholder_photo()))
-
-                    exit_id = cursor.lastrowid
-                    access_records.append({
-                        'id': exit_id,
-                        'user_id': user['id'],
-                        'type': 'saida',
-                        'time': exit_time
-                    })
-
-    # Criar alguns acessos HOJE com usuários presentes
-    print(f"  ✓ Criando acessos de HOJE com usuários presentes...")
-    today = datetime.now()
-
-    # Garantir que alguns usuários estão presentes agora
-    present_count = min(random.randint(3, 7), len(approved_users))
-    present_users = random.sample(approved_users, present_count)
-
-    for user in present_users:
-        # Entrada hoje (entre 7h e 9h)
-        entry_hour = random.randint(7, 9)
-        entry_minute = random.randint(0, 59)
-        entry_time = today.replace(
-            hour=entry_hour, minute=entry_minute, second=0)
-
-        cursor.execute("""
-            INSERT INTO accessRegisters
-            (user_id, created_at, type_access, access_allowed, reason_denied, captured_image)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (user['id'], entry_time, 'entrada', True, None, create_placeholder_photo()))
-
-        access_records.append({
-            'id': cursor.lastrowid,
-            'user_id': user['id'],
-            'type': 'entrada',
-            'time': entry_time
-        })
-
-    # Criar alguns acessos negados (tentativas falhadas)
-    denied_count = random.randint(5, 15)
-    print(f"  ✓ Criando {denied_count} acessos negados...")
-
-    for _ in range(denied_count):
-        # Distribuir ao longo dos últimos 30 dias
-        days_ago = random.randint(0, 30)
-        denied_date = now - timedelta(days=days_ago)
-        denied_hour = random.randint(6, 20)
-        denied_minute = random.randint(0, 59)
-        denied_time = denied_date.replace(
-            hour=denied_hour, minute=denied_minute, second=0)
-
-        reason = random.choice(DENIAL_REASONS)
-
-        # 50% com user_id (usuário não aprovado), 50% sem user_id (não reconhecido)
-        user_id = random.choice(approved_users)[
-            'id'] if random.random() < 0.5 else None
-
-        cursor.execute("""
-            INSERT INTO accessRegisters
-            (user_id, created_at, type_access, access_allowed, reason_denied, captured_image)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (user_id, denied_time, 'entrada', False, reason, create_placeholder_photo()))
-
-        access_records.append({
-            'id': cursor.lastrowid,
-            'user_id': user_id,
-            'type': 'entrada',
-            'time': denied_time,
-            'denied': True
-        })
-
-    print(f"  ✓ {len(access_records)} registros de acesso criados")
-    print(f"  ✓ {present_count} usuários atualmente PRESENTES")
-    return access_records
-
-
-def seed_notifications(cursor, access_records):
-    """Cria notificações baseadas nos acessos negados"""
-    print(f"\n🔔 Criando notificações...")
+        day_start = np.datetime64(day, 's')
+        user_ids, times, types, allowed, reasons = generate_day_events(
+            rng, day_start, approved_ids, events_per_day, denied_per_day, now)
 
-    # Pegar acessos negados
-    denied_records = [r for r in access_records if r.get('denied', False)]
+        allowed_today = int(allowed.sum())
+        counts['allowed'] += allowed_today
+        counts['denied'] += len(allowed) - allowed_today
 
-    if not denied_records:
-        print("  ⚠️  Nenhum acesso negado encontrado, pulando notificações")
-        return []
+        buffer.extend(zip(
+            [user_id if user_id >= 0 else None for user_id in user_ids.tolist()],
+            times.tolist(), types.tolist(), allowed.tolist(), reasons.tolist(),
+            [photo] * len(user_ids)
+        ))
 
-    notifications = []
+        if len(buffer) >= chunk_size:
+            insert_in_chunks(conn, cursor, query, buffer, chunk_size)
+            print(f"  ⏳ {day.isoformat()}: {counts['allowed'] + counts['denied']} registros")
+            buffer = []
 
-    # Criar notificações para acessos negados
-    for record in denied_records:
-        notif_type = random.choice(NOTIFICATION_TYPES)
-        message = f"Tentativa de acesso negado. Motivo: {notif_type}"
-        is_read = random.choice([True, False])
+    insert_in_chunks(conn, cursor, query, buffer, chunk_size)
 
-        cursor.execute("""
-            INSERT INTO notifications
-            (manager_id, access_register_id, created_at, type_notification, message, is_read)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (1, record['id'], record['time'], notif_type, message, is_read))
+    print(f"  ✓ {counts['allowed'] + counts['denied']} registros de acesso criados")
+    print(f"  ✓ {counts['denied']} acessos negados")
+    return counts
 
-        notifications.append({
-            'id': cursor.lastrowid,
-            'type': notif_type,
-            'is_read': is_read
-        })
-
-    print(f"  ✓ {len(notifications)} notificações criadas")
-    return notifications
 
+def seed_notifications(conn, cursor):
+    """Cria notificações para os acessos negados (INSERT ... SELECT no banco)"""
+    print(f"\n🔔 Criando notificações...")
 
-def seed_database():
+    placeholders = ", ".join(["%s"] * len(NOTIFICATION_TYPES))
+    cursor.execute(f"""
+        INSERT INTO notifications
+        (manager_id, access_register_id, created_at, type_notification, message, is_read)
+        SELECT 1, id, created_at, type_notification,
+               CONCAT('Tentativa de acesso negado. Motivo: ', type_notification), RAND() < 0.5
+        FROM (
+            SELECT id, created_at, ELT(1 + id % {len(NOTIFICATION_TYPES)}, {placeholders}) AS type_notification
+            FROM accessRegisters
+            WHERE access_allowed = FALSE
+        ) denied
+    """, tuple(NOTIFICATION_TYPES))
+    conn.commit()
+
+    cursor.execute("SELECT COUNT(*), COALESCE(SUM(is_read), 0) FROM notifications")
+    total, read = cursor.fetchone()
+    print(f"  ✓ {total} notificações criadas")
+    return {'total': int(total), 'read': int(read)}
+
+
+def seed_database(users=20, days=30, events_per_day=2, denied_per_day=0.33,
+                  with_images=True, chunk_size=SEED_CHUNK_SIZE, seed=None):
     """Função principal de seed"""
     print("="*60)
     print("🌱 SEED DATABASE - Populando banco de dados")
@@ -294,42 +280,43 @@ def seed_database():
     cursor = conn.cursor()
     print("✅ Conexão estabelecida com sucesso!")
 
+    rng = np.random.default_rng(seed)
+
     try:
-        # Limpar dados existentes (exceto manager)
+        # Limpar dados existentes (exceto manager); TRUNCATE também reinicia os ids
         print("\n🧹 Limpando dados antigos...")
-        cursor.execute("DELETE FROM notifications")
-        cursor.execute("DELETE FROM face_encoding")
-        cursor.execute("DELETE FROM accessRegisters")
-        cursor.execute("DELETE FROM users")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in ("notifications", "daily_hours", "face_encoding", "accessRegisters", "users"):
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
         print("  ✓ Dados antigos removidos")
 
         # Seed
-        users = seed_users(cursor, count=20)
-        access_records = seed_access_registers(cursor, users)
-        notifications = seed_notifications(cursor, access_records)
-
-        # Commit
-        conn.commit()
+        user_ids, approved = seed_users(conn, cursor, rng, users, days, chunk_size)
+        approved_ids = user_ids[approved]
+        seed_face_encodings(conn, cursor, rng, approved_ids, chunk_size)
+        access_counts = seed_access_registers(conn, cursor, rng, approved_ids, days, events_per_day,
+                                              denied_per_day, with_images, chunk_size)
+        notification_counts = seed_notifications(conn, cursor)
+
+        # Materializar horas trabalhadas por usuário/dia
+        print("\n⏱️  Reconstruindo daily_hours...")
+        daily_rows = DailyHoursRepository(conn).rebuild()
+        print(f"  ✓ {daily_rows} linhas (usuário, dia) gravadas")
 
         # Estatísticas finais
         print("✅ SEED COMPLETO!")
         print("="*60)
         print(f"\n📊 Resumo:")
-        print(f"  👥 Usuários: {len(users)}")
-        print(f"     - Aprovados: {len([u for u in users if u['approved']])}")
-        print(
-            f"     - Pendentes: {len([u for u in users if not u['approved']])}")
-        print(f"  🚪 Registros de Acesso: {len(access_records)}")
-        print(
-            f"     - Permitidos: {len([r for r in access_records if not r.get('denied', False)])}")
-        print(
-            f"     - Negados: {len([r for r in access_records if r.get('denied', False)])}")
-        print(f"  🔔 Notificações: {len(notifications)}")
-        print(
-            f"     - Lidas: {len([n for n in notifications if n['is_read']])}")
-        print(
-            f"     - Não lidas: {len([n for n in notifications if not n['is_read']])}")
-        
+        print(f"  👥 Usuários: {len(user_ids)}")
+        print(f"     - Aprovados: {len(approved_ids)}")
+        print(f"     - Pendentes: {len(user_ids) - len(approved_ids)}")
+        print(f"  🚪 Registros de Acesso: {access_counts['allowed'] + access_counts['denied']}")
+        print(f"     - Permitidos: {access_counts['allowed']}")
+        print(f"     - Negados: {access_counts['denied']}")
+        print(f"  🔔 Notificações: {notification_counts['total']}")
+        print(f"     - Lidas: {notification_counts['read']}")
+        print(f"     - Não lidas: {notification_counts['total'] - notification_counts['read']}")
 
     except Exception as e:
         print(f"\n❌ Erro durante seed: {str(e)}")
@@ -341,4 +328,16 @@ def seed_database():
 
 
 if __name__ == "__main__":
-    seed_database()
+    parser = argparse.ArgumentParser(description="Popula o banco com dados de exemplo ou de carga")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--events-per-day", type=int, default=2,
+                        help="Acessos por usuário presente em cada dia (2 = entrada e saída)")
+    parser.add_argument("--denied-per-day", type=float, default=0.33,
+                        help="Média de acessos negados por dia")
+    parser.add_argument("--no-images", action="store_true", help="Não grava imagem capturada nos acessos")
+    parser.add_argument("--chunk-size", type=int, default=SEED_CHUNK_SIZE, help="Linhas por transação")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório")
+    args = parser.parse_args()
+    seed_database(args.users, args.days, args.events_per_day, args.denied_per_day,
+                  not args.no_images, args.chunk_size, args.seed)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import NamedTuple, Optional
 import datetime
 
 
@@ -47,3 +47,27 @@ class Usuario:
             elif isinstance(created_at_value, datetime.datetime):
                 usuario.created_at = created_at_value
         return usuario
+
+
+class UsuarioResumo(NamedTuple):
+    """Lightweight row model for user listings (without the recognition photo)."""
+
+    id: int
+    name: str
+    email: str
+    cpf: str
+    created_at: datetime.datetime
+    position: str
+    approved: bool
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'UsuarioResumo':
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            email=data.get("email"),
+            cpf=data.get("cpf"),
+            created_at=data.get("created_at"),
+            position=data.get("position"),
+            approved=bool(data.get("approved")),
+        )
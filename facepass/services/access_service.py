@@ -1,15 +1,26 @@
 from typing import Optional
 from facepass.database.repository.register_repository import RegistroRepository
 from facepass.database.repository.user_repository import UsuarioRepository
+from facepass.database.repository.daily_hours_repository import DailyHoursRepository
 from facepass.models.registerAccess import RegistroAcesso
 from facepass.services.notification_service import NotificationService
 from facepass.database.repository.notification_repository import NotificationRepository
+from facepass.services.presence_tracker import presence_tracker
+from facepass.services.metrics import span
+from facepass.services.ttl_cache import TTLCache
+
+COUNTERS_CACHE_TTL_SECONDS = 10.0
+
+# Compartilhado entre sessões: as contagens são globais
+_counters_cache = TTLCache(COUNTERS_CACHE_TTL_SECONDS)
 
 
 class AccessService:
-    def __init__(self, acesso_repository: RegistroRepository, notification_repository: NotificationRepository, usuario_repository: UsuarioRepository):
+    def __init__(self, acesso_repository: RegistroRepository, notification_repository: NotificationRepository, usuario_repository: UsuarioRepository,
+                 daily_hours_repository: Optional[DailyHoursRepository] = None):
         self.acesso_repository = acesso_repository
         self.usuario_repository = usuario_repository
+        self.daily_hours_repository = daily_hours_repository
         self.notification_service = NotificationService(
             notification_repository)
 
@@ -17,14 +28,25 @@ class AccessService:
         if not registro:
             raise ValueError("Registro de acesso inválido.")
 
-        self.acesso_repository.save_register(registro)
+        # Registro, horas do dia e notificação gravados numa única transação
+        with self.acesso_repository.executor.transaction():
+            with span('register_insert'):
+                self.acesso_repository.save_register(registro)
+
+            if self.daily_hours_repository and registro.access_allowed and registro.user_id:
+                self.daily_hours_repository.record_event(
+                    registro.user_id, registro.created_at, registro.type_access)
+
+            if not registro.access_allowed:
+                with span('notification_insert'):
+                    self.notification_service.notify_access_denied(
+                        registro_acesso=registro,
+                        manager_id=manager_id,
+                        user_name=user_name
+                    )
 
-        if not registro.access_allowed:
-            self.notification_service.notify_access_denied(
-                registro_acesso=registro,
-                manager_id=manager_id,
-                user_name=user_name
-            )
+        presence_tracker.record(registro)
+        _counters_cache.invalidate()
 
     def get_access_logs_by_period(self, start_date: str, end_date: str):
         return self.acesso_repository.get_register_by_period(start_date, end_date)
@@ -41,15 +63,17 @@ class AccessService:
     def list_all_access_records(self):
         return self.acesso_repository.list_all_registers()
 
+    def get_counters(self) -> dict:
+        """Contagens globais de acessos (COUNT no banco, com cache de curta duração)"""
+        return dict(_counters_cache.get_or_load(
+            'access_counts', self.acesso_repository.get_access_count_by_status))
+
     def get_success_rate(self) -> float:
-        all_records = self.acesso_repository.list_all_registers()
-        if not all_records:
+        counters = self.get_counters()
+        if not counters['total']:
             return 0.0
 
-        total_attempts = len(all_records)
-        successful_attempts = sum(1 for record in all_records if record['access_allowed'])
-
-        success_rate = (successful_attempts / total_attempts) * 100
+        success_rate = (counters['permitidos'] / counters['total']) * 100
         return success_rate
 
     def get_registers_by_filters(self, filters: dict):
@@ -61,6 +85,15 @@ class AccessService:
             end_date=filters.get('end_date', "")
         )
 
+    def iter_registers_by_filters(self, filters: dict):
+        return self.acesso_repository.iter_registers_by_filters(
+            user_name=filters.get('user_name', ""),
+            status=filters.get('status', ""),
+            location=filters.get('location', ""),
+            start_date=filters.get('start_date', ""),
+            end_date=filters.get('end_date', "")
+        )
+
     def get_today_access_count(self) -> int:
         return self.acesso_repository.get_today_access_count()
 
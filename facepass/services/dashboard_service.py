@@ -1,13 +1,25 @@
 """
 Dashboard Service - Lógica de negócio para o dashboard de gestão
 """
+from datetime import date as date_type
+from facepass.services.presence_tracker import presence_tracker as default_presence_tracker
 
 
 class DashboardService:
-    def __init__(self, dashboard_repository, user_service, notification_service):
+    def __init__(self, dashboard_repository, user_service, notification_service, presence_tracker=None):
         self.dashboard_repository = dashboard_repository
         self.user_service = user_service
         self.notification_service = notification_service
+        self.presence_tracker = presence_tracker or default_presence_tracker
+
+    def _get_today_attendance(self):
+        """Presença do dia servida pelo PresenceTracker em memória"""
+        self.presence_tracker.ensure_seeded(
+            self.dashboard_repository.get_attendance_snapshot)
+        # Acessos registrados por outros processos (API, modo de vídeo, ferramentas em lote)
+        self.presence_tracker.catch_up(self.dashboard_repository.get_registers_since)
+        users = self.dashboard_repository.list_approved_users_basic()
+        return self.presence_tracker.build_attendance(users)
 
     def get_quick_stats(self):
         try:
@@ -53,7 +65,10 @@ class DashboardService:
             dict: Lista de todos os usuários com status de presença
         """
         try:
-            users = self.dashboard_repository.get_all_users_attendance(date)
+            if not date or date == date_type.today().strftime('%Y-%m-%d'):
+                users = self._get_today_attendance()
+            else:
+                users = self.dashboard_repository.get_all_users_attendance(date)
 
             # Contar estatísticas
             present_count = sum(1 for u in users if u.get('status') == 'Presente')
@@ -170,8 +185,8 @@ class DashboardService:
             # Valor da hora extra em R$
             OVERTIME_RATE = 30.0
 
-            # Calcular custo total (convertendo Decimal para float)
-            total_overtime_hours = sum(float(user.get('total_overtime_hours', 0)) for user in overtime_data)
+            # Calcular custo total (coluna float64, somada no NumPy)
+            total_overtime_hours = float(overtime_data['total_overtime_hours'].sum())
             total_cost = total_overtime_hours * OVERTIME_RATE
 
             return {
@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+from typing import Optional, Tuple
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Intervalo mínimo entre verificações de mudança da galeria no banco (segundos)
+GALLERY_CHECK_SECONDS = float(os.getenv('GALLERY_CHECK_SECONDS', '5'))
+# Recarga completa periódica: upserts de encoding não mudam contagem nem id máximo
+GALLERY_MAX_AGE_SECONDS = float(os.getenv('GALLERY_MAX_AGE_SECONDS', '300'))
+
+
+class FaceGallery:
+    """
+    Galeria de encodings mantida em memória como uma matriz (N x 128), para
+    processos que atendem muitas tentativas de acesso (ex.: API de quiosques).
+
+    É recarregada quando a assinatura da tabela (contagem e id máximo) muda,
+    verificada no máximo a cada `check_seconds`, ou quando fica mais velha que
+    `max_age_seconds`. Pode ser compartilhada entre threads.
+    """
+
+    def __init__(self, check_seconds: float = GALLERY_CHECK_SECONDS,
+                 max_age_seconds: float = GALLERY_MAX_AGE_SECONDS):
+        self.check_seconds = check_seconds
+        self.max_age_seconds = max_age_seconds
+        # (matriz, user_ids) trocados juntos numa única atribuição
+        self._data = (np.empty((0, 128)), np.empty(0, dtype=np.int64))
+        self._signature = None
+        self._loaded_at = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data[1])
+
+    def ensure_fresh(self, repository) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_seconds:
+                return
+            self._checked_at = now
+
+            signature = repository.get_encodings_signature()
+            expired = self._loaded_at is None or now - self._loaded_at >= self.max_age_seconds
+            if signature == self._signature and not expired:
+                return
+
+            encodings = repository.get_all_encodings()
+            if encodings:
+                self._data = (np.vstack([encoding.encoding for encoding in encodings]),
+                              np.array([encoding.user_id for encoding in encodings], dtype=np.int64))
+            else:
+                self._data = (np.empty((0, 128)), np.empty(0, dtype=np.int64))
+            self._signature = signature
+            self._loaded_at = now
+
+    def search(self, encoding) -> Optional[Tuple[int, float]]:
+        """Usuário mais próximo e a distância euclidiana, ou None com galeria vazia"""
+        matrix, user_ids = self._data
+        if not len(user_ids):
+            return None
+
+        distances = np.linalg.norm(matrix - encoding, axis=1)
+        best = int(np.argmin(distances))
+        return int(user_ids[best]), float(distances[best])
+
+    def invalidate(self) -> None:
+        """Força a recarga na próxima tentativa"""
+        with self._lock:
+            self._checked_at = None
+            self._loaded_at = None
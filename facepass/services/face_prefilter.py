@@ -0,0 +1,102 @@
+import os
+import threading
+from typing import Dict, List, Tuple
+import cv2
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Pré-filtro de presença de rosto (Haar cascade do OpenCV) antes da detecção do dlib,
+# aplicado só às tentativas de acesso (identify_face); o cadastro usa o dlib direto
+FACE_PREFILTER = os.getenv('FACE_PREFILTER', 'true').lower() in ('1', 'true', 'yes')
+# Largura da cópia reduzida em que o cascade roda
+FACE_PREFILTER_WIDTH = int(os.getenv('FACE_PREFILTER_WIDTH', '240'))
+FACE_PREFILTER_MIN_NEIGHBORS = int(os.getenv('FACE_PREFILTER_MIN_NEIGHBORS', '3'))
+# Margem em volta de cada candidato (fração do lado) na região entregue ao dlib
+FACE_PREFILTER_PADDING = float(os.getenv('FACE_PREFILTER_PADDING', '0.5'))
+FACE_PREFILTER_CASCADE = os.getenv(
+    'FACE_PREFILTER_CASCADE',
+    os.path.join(cv2.data.haarcascades, 'haarcascade_frontalface_default.xml')
+)
+
+# (top, right, bottom, left), mesmo formato de face_recognition.face_locations
+Box = Tuple[int, int, int, int]
+
+
+class FacePrefilter:
+    """
+    Etapa barata que antecede a detecção HOG do dlib.
+
+    Roda um Haar cascade numa cópia em tons de cinza com `width` pixels de
+    largura e devolve as regiões candidatas (com margem) em coordenadas da
+    imagem original. Sem candidatos, a imagem é rejeitada sem passar pelo
+    dlib; com candidatos, o dlib só procura dentro dessas regiões.
+
+    Cada thread usa seu próprio CascadeClassifier.
+    """
+
+    def __init__(self, enabled: bool = FACE_PREFILTER, width: int = FACE_PREFILTER_WIDTH,
+                 min_neighbors: int = FACE_PREFILTER_MIN_NEIGHBORS, padding: float = FACE_PREFILTER_PADDING,
+                 cascade_path: str = FACE_PREFILTER_CASCADE):
+        self.enabled = enabled
+        self.width = width
+        self.min_neighbors = min_neighbors
+        self.padding = padding
+        self.cascade_path = cascade_path
+        self.checked = 0
+        self.rejected = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _classifier(self) -> cv2.CascadeClassifier:
+        classifier = getattr(self._local, 'classifier', None)
+        if classifier is None:
+            classifier = cv2.CascadeClassifier(self.cascade_path)
+            if classifier.empty():
+                raise RuntimeError(f"Não foi possível carregar o cascade: {self.cascade_path}")
+            self._local.classifier = classifier
+        return classifier
+
+    def candidates(self, image: np.ndarray) -> List[Box]:
+        """Regiões (top, right, bottom, left) que podem conter um rosto numa imagem RGB; maiores primeiro"""
+        height, width = image.shape[:2]
+        scale = min(1.0, self.width / float(width))
+
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        if scale < 1.0:
+            gray = cv2.resize(gray, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.equalizeHist(gray)
+
+        detections = self._classifier().detectMultiScale(
+            gray, scaleFactor=1.1, minNeighbors=self.min_neighbors, minSize=(20, 20)
+        )
+
+        regions = []
+        for x, y, w, h in sorted(detections, key=lambda d: d[2] * d[3], reverse=True):
+            margin = max(w, h) * self.padding
+            regions.append((
+                max(0, int((y - margin) / scale)),
+                min(width, int((x + w + margin) / scale)),
+                min(height, int((y + h + margin) / scale)),
+                max(0, int((x - margin) / scale))
+            ))
+
+        with self._lock:
+            self.checked += 1
+            if not regions:
+                self.rejected += 1
+        return regions
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            checked, rejected = self.checked, self.rejected
+        return {
+            'checked': checked,
+            'rejected': rejected,
+            'reject_rate': round(rejected / checked, 3) if checked else 0.0
+        }
+
+
+# Instância padrão do processo, configurada pelas variáveis de ambiente
+face_prefilter = FacePrefilter()
@@ -1,10 +1,13 @@
 from typing import Optional, List, Tuple
-import io
 import face_recognition
 import numpy as np
 import logging
 from facepass.models.faceEncoding import FaceEncoding
 from facepass.database.repository.face_encoding_repository import FaceEncodingRepository
+from facepass.services.face_gallery import FaceGallery
+from facepass.services.image_ingest import decode_image
+from facepass.services.face_prefilter import FacePrefilter, face_prefilter
+from facepass.services.metrics import span
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -13,35 +16,54 @@ logger = logging.getLogger(__name__)
 class FaceRecognitionService:
     """Serviço responsável pelo reconhecimento facial"""
 
-    def __init__(self, face_encoding_repository: FaceEncodingRepository):
+    def __init__(self, face_encoding_repository: FaceEncodingRepository, gallery: Optional[FaceGallery] = None,
+                 prefilter: Optional[FacePrefilter] = None):
         self.repository = face_encoding_repository
         self.tolerance = 0.6  # Limiar de similaridade para considerar match
+        # Galeria em memória compartilhada (opcional); sem ela, busca no banco a cada tentativa
+        self.gallery = gallery
+        # Haar cascade antes do dlib (só na identificação); a instância padrão segue FACE_PREFILTER
+        self.prefilter = prefilter if prefilter is not None else face_prefilter
+
+    def generate_face_encoding(self, image_bytes: bytes, use_prefilter: bool = False):
+        """
+        Gera o encoding facial a partir de uma imagem.
+
+        A imagem passa pela etapa de ingestão (image_ingest.decode_image):
+        limites de bytes e pixels verificados antes da decodificação e JPEGs
+        decodificados já na resolução usada pela detecção. Imagens rejeitadas
+        levantam InvalidImageError; sem rosto, retorna None.
+
+        Com `use_prefilter` (tentativas de acesso) e o pré-filtro habilitado,
+        imagens sem candidato a rosto são descartadas antes do dlib, que só
+        procura dentro das regiões candidatas. O cadastro (fotos de aprovação,
+        bulk_enroll, reencode_faces) usa sempre a detecção completa do dlib.
+        """
+        # Suporte para diferentes tipos de entrada:
+        # - bytes/bytearray: dados brutos da imagem
+        # - file-like: um objeto com .read()
+        # - str: caminho de arquivo
+        if hasattr(image_bytes, "read"):
+            # file-like object (ex: uploaded file)
+            image_bytes = image_bytes.read()
+        elif not isinstance(image_bytes, (bytes, bytearray)):
+            # assume path-like (str)
+            with open(image_bytes, 'rb') as image_file:
+                image_bytes = image_file.read()
+
+        with span('image_decode'):
+            image = decode_image(image_bytes)
 
-    def generate_face_encoding(self, image_bytes: bytes):
-        """Gera o encoding facial a partir de uma imagem"""
         try:
-            # Suporte para diferentes tipos de entrada:
-            # - bytes/bytearray: dados brutos da imagem
-            # - file-like: um objeto com .read()
-            # - str: caminho de arquivo
-            if isinstance(image_bytes, (bytes, bytearray)):
-                image_file = io.BytesIO(image_bytes)
-                image = face_recognition.load_image_file(image_file)
-            elif hasattr(image_bytes, "read"):
-                # file-like object (ex: uploaded file)
-                image = face_recognition.load_image_file(image_bytes)
-            else:
-                # assume path-like (str)
-                image = face_recognition.load_image_file(image_bytes)
-            
             # Detectar faces na imagem
-            face_locations = face_recognition.face_locations(image)
+            face_locations = self._locate_faces(image, use_prefilter)
             
             if not face_locations:
                 return None  # Nenhum rosto detectado
             
             # Gerar encoding para o primeiro rosto encontrado
-            face_encodings = face_recognition.face_encodings(image, face_locations)
+            with span('face_encoding'):
+                face_encodings = face_recognition.face_encodings(image, face_locations)
             
             if not face_encodings:
                 return None
@@ -53,6 +75,36 @@ class FaceRecognitionService:
             return None
         
 
+    def _locate_faces(self, image: np.ndarray, use_prefilter: bool) -> List[Tuple[int, int, int, int]]:
+        if not (use_prefilter and self.prefilter.enabled):
+            with span('face_detection'):
+                return face_recognition.face_locations(image)
+
+        with span('face_prefilter'):
+            regions = self.prefilter.candidates(image)
+        if not regions:
+            return []
+
+        # Só o primeiro rosto é usado: para na primeira região confirmada pelo dlib
+        with span('face_detection'):
+            for top, right, bottom, left in regions:
+                roi = np.ascontiguousarray(image[top:bottom, left:right])
+                found = face_recognition.face_locations(roi)
+                if found:
+                    return [(t + top, r + left, b + top, l + left) for t, r, b, l in found]
+        return []
+
+    def detect_faces(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Localiza rostos (top, right, bottom, left) numa imagem RGB já decodificada"""
+        with span('face_detection'):
+            return face_recognition.face_locations(image)
+
+    def encode_face(self, image: np.ndarray, location: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        """Encoding de um rosto já localizado numa imagem RGB"""
+        with span('face_encoding'):
+            face_encodings = face_recognition.face_encodings(image, [location])
+        return face_encodings[0] if face_encodings else None
+
     def save_user_face(self, user_id: int, image_bytes: bytes) -> Optional[FaceEncoding]:
         """Gera e salva o encoding facial de um usuário
         
@@ -64,34 +116,50 @@ class FaceRecognitionService:
         if encoding is None:
             return None
             
+        return self.save_encoding(user_id, encoding)
+
+    def save_encoding(self, user_id: int, encoding) -> FaceEncoding:
+        """Salva um encoding já calculado para o usuário"""
         face_encoding = FaceEncoding(user_id, encoding)
-        return self.repository.save_encoding(face_encoding)
+        saved = self.repository.save_encoding(face_encoding)
+        if self.gallery is not None:
+            self.gallery.invalidate()
+        return saved
 
     def identify_face(self, image_bytes: bytes) -> Optional[Tuple[int, float]]:
         """
         Identifica um rosto comparando com os encodings salvos
         Retorna uma tupla com (user_id, confidence) ou None se não encontrar match
         """
-        # Gerar encoding da imagem fornecida
-        unknown_encoding = self.generate_face_encoding(image_bytes)
+        # Gerar encoding da imagem fornecida (tentativas vazias são descartadas pelo pré-filtro)
+        unknown_encoding = self.generate_face_encoding(image_bytes, use_prefilter=True)
         if unknown_encoding is None:
             return None
+
+        return self.identify_encoding(unknown_encoding)
+
+    def identify_encoding(self, unknown_encoding) -> Optional[Tuple[int, float]]:
+        """Compara um encoding já calculado com a galeria; retorna (user_id, confidence) ou None"""
+        if self.gallery is not None:
+            return self._identify_in_gallery(unknown_encoding)
             
         # Buscar todos os encodings salvos
-        saved_encodings = self.repository.get_all_encodings()
+        with span('gallery_fetch'):
+            saved_encodings = self.repository.get_all_encodings()
         if not saved_encodings:
             return None
             
-        # Preparar arrays para comparação
-        known_encodings = [enc.encoding for enc in saved_encodings]
-        known_user_ids = [enc.user_id for enc in saved_encodings]
-        
-        # Calcular distâncias entre o encoding desconhecido e todos os salvos
-        distances = face_recognition.face_distance(known_encodings, unknown_encoding)
-        
-        # Encontrar o match mais próximo
-        best_match_index = np.argmin(distances)
-        min_distance = distances[best_match_index]
+        with span('distance_search'):
+            # Preparar arrays para comparação
+            known_encodings = [enc.encoding for enc in saved_encodings]
+            known_user_ids = [enc.user_id for enc in saved_encodings]
+            
+            # Calcular distâncias entre o encoding desconhecido e todos os salvos
+            distances = face_recognition.face_distance(known_encodings, unknown_encoding)
+            
+            # Encontrar o match mais próximo
+            best_match_index = np.argmin(distances)
+            min_distance = distances[best_match_index]
         
         # Se a distância for menor que o limiar, retorna o user_id e a confiança
         if min_distance <= self.tolerance:
@@ -100,6 +168,19 @@ class FaceRecognitionService:
             
         return None
 
+    def _identify_in_gallery(self, unknown_encoding) -> Optional[Tuple[int, float]]:
+        with span('gallery_fetch'):
+            self.gallery.ensure_fresh(self.repository)
+
+        with span('distance_search'):
+            match = self.gallery.search(unknown_encoding)
+
+        if match is not None and match[1] <= self.tolerance:
+            user_id, min_distance = match
+            return (user_id, 1 - min_distance)
+
+        return None
+
     def verify_face_match(self, user_id: int, image_bytes: bytes) -> Optional[float]:
         """
         Verifica se uma imagem corresponde ao usuário específico
@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional, Tuple
+
+# (top, right, bottom, left), mesmo formato de face_recognition.face_locations
+Box = Tuple[int, int, int, int]
+
+
+def iou(a: Box, b: Box) -> float:
+    """Intersecção sobre união de duas caixas"""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    if bottom <= top or right <= left:
+        return 0.0
+    intersection = (bottom - top) * (right - left)
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    return intersection / float(area_a + area_b - intersection)
+
+
+def centroid(box: Box) -> Tuple[float, float]:
+    return (box[3] + box[1]) / 2.0, (box[0] + box[2]) / 2.0
+
+
+class FaceTrack:
+    """Um rosto acompanhado entre quadros, com o resultado da identificação"""
+
+    def __init__(self, track_id: int, box: Box, frame_index: int):
+        self.id = track_id
+        self.box = box
+        self.first_frame = frame_index
+        self.last_seen = frame_index
+        self.missed = 0
+        # (user_id, confiança) do melhor match até agora, ou None
+        self.identity: Optional[Tuple[int, float]] = None
+        self.attempts = 0
+        self.last_attempt_frame: Optional[int] = None
+        self.emitted = False
+
+
+class FaceTracker:
+    """
+    Rastreador simples por IoU com fallback por distância entre centroides.
+
+    A cada quadro processado, as detecções são associadas gulosamente às
+    trilhas existentes (maior IoU primeiro; sem sobreposição, o centroide mais
+    próximo dentro de `max_centroid_distance` larguras de caixa). Detecções
+    sem trilha abrem uma nova; trilhas sem detecção por mais de `max_missed`
+    quadros processados são encerradas.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_centroid_distance: float = 0.5, max_missed: int = 5):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_distance = max_centroid_distance
+        self.max_missed = max_missed
+        self.tracks: Dict[int, FaceTrack] = {}
+        self._next_id = 1
+
+    def update(self, boxes: List[Box], frame_index: int) -> Tuple[List[FaceTrack], List[FaceTrack]]:
+        """Associa as detecções do quadro; retorna (trilhas ativas neste quadro, trilhas encerradas)"""
+        candidates = []
+        for track in self.tracks.values():
+            for index, box in enumerate(boxes):
+                overlap = iou(track.box, box)
+                if overlap >= self.iou_threshold:
+                    candidates.append((overlap, track.id, index))
+                    continue
+
+                width = max(track.box[1] - track.box[3], 1)
+                (x1, y1), (x2, y2) = centroid(track.box), centroid(box)
+                distance = ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5 / width
+                if distance <= self.max_centroid_distance:
+                    # Sempre abaixo de qualquer IoU aceito
+                    candidates.append((-distance, track.id, index))
+
+        matched_tracks, matched_boxes = set(), set()
+        active = []
+        for _, track_id, index in sorted(candidates, reverse=True):
+            if track_id in matched_tracks or index in matched_boxes:
+                continue
+            matched_tracks.add(track_id)
+            matched_boxes.add(index)
+            track = self.tracks[track_id]
+            track.box = boxes[index]
+            track.last_seen = frame_index
+            track.missed = 0
+            active.append(track)
+
+        for index, box in enumerate(boxes):
+            if index not in matched_boxes:
+                track = FaceTrack(self._next_id, box, frame_index)
+                self._next_id += 1
+                self.tracks[track.id] = track
+                active.append(track)
+
+        ended = []
+        for track_id, track in list(self.tracks.items()):
+            if track_id in matched_tracks or track.last_seen == frame_index:
+                continue
+            track.missed += 1
+            if track.missed > self.max_missed:
+                ended.append(self.tracks.pop(track_id))
+
+        return active, ended
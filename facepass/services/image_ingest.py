@@ -0,0 +1,63 @@
+import io
+import os
+from typing import Tuple
+import numpy as np
+from PIL import Image, ImageOps
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Limites verificados antes da decodificação (só o cabeçalho é lido)
+IMAGE_MAX_BYTES = int(os.getenv('IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', str(50_000_000)))
+# Maior lado desejado para detecção/encoding; JPEGs são decodificados já reduzidos
+IMAGE_TARGET_SIDE = int(os.getenv('IMAGE_TARGET_SIDE', '1280'))
+
+
+class InvalidImageError(ValueError):
+    """Imagem rejeitada na entrada (tamanho, resolução ou formato)"""
+
+
+def target_size(size: Tuple[int, int], max_side: int) -> Tuple[int, int]:
+    width, height = size
+    ratio = max_side / float(max(width, height))
+    if ratio >= 1:
+        return width, height
+    return max(1, round(width * ratio)), max(1, round(height * ratio))
+
+
+def decode_image(data: bytes, max_side: int = IMAGE_TARGET_SIDE, max_bytes: int = IMAGE_MAX_BYTES,
+                 max_pixels: int = IMAGE_MAX_PIXELS) -> np.ndarray:
+    """
+    Decodifica uma imagem para um array RGB (uint8) com o maior lado próximo
+    de `max_side`.
+
+    JPEGs usam a redução na própria decodificação (escala DCT do libjpeg via
+    Image.draft: 1/2, 1/4 ou 1/8), sem materializar a imagem inteira; outros
+    formatos são decodificados e reduzidos. A orientação EXIF é aplicada.
+    """
+    if len(data) > max_bytes:
+        raise InvalidImageError(f"Imagem maior que o limite de {max_bytes // (1024 * 1024)} MB")
+
+    try:
+        image = Image.open(io.BytesIO(data))
+    except (OSError, Image.DecompressionBombError) as e:
+        raise InvalidImageError(f"Formato de imagem inválido: {e}")
+
+    width, height = image.size
+    if width * height > max_pixels:
+        raise InvalidImageError(f"Resolução {width}x{height} acima do limite de {max_pixels} pixels")
+
+    size = target_size(image.size, max_side)
+    try:
+        if image.format == 'JPEG':
+            # Escolhe a maior redução que ainda mantém pelo menos `size`
+            image.draft('RGB', size)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+        if max(image.size) > max_side:
+            image.thumbnail((max_side, max_side), Image.BILINEAR)
+    except (OSError, SyntaxError) as e:
+        raise InvalidImageError(f"Imagem corrompida: {e}")
+
+    return np.asarray(image)
@@ -1,13 +1,14 @@
 import streamlit as st
 import os
 from typing import Dict, Any, Optional
-from facepass.database.setup_database.connection import DatabaseConnection
+from facepass.database.setup_database.connection import DatabaseConnection, parse_replica_endpoints
 from facepass.database.repository.user_repository import UsuarioRepository
 from facepass.database.repository.notification_repository import NotificationRepository
 from facepass.database.repository.register_repository import RegistroRepository
 from facepass.database.repository.face_encoding_repository import FaceEncodingRepository
 from facepass.database.repository.manager_repository import ManagerRepository
 from facepass.database.repository.dashboard_repository import DashboardRepository
+from facepass.database.repository.daily_hours_repository import DailyHoursRepository
 from facepass.services.access_service import AccessService
 from facepass.services.user_service import UsuarioService
 from facepass.services.notification_service import NotificationService
@@ -27,7 +28,8 @@ def initialize_database_connection() -> Optional[DatabaseConnection]:
             os.getenv("DB_HOST"),
             os.getenv("DB_USER"),
             os.getenv("DB_PASSWORD"),
-            os.getenv("DB_NAME")
+            os.getenv("DB_NAME"),
+            replicas=parse_replica_endpoints()
         )
         cnx.connect()
         return cnx
@@ -36,14 +38,15 @@ def initialize_database_connection() -> Optional[DatabaseConnection]:
         return None
 
 
-def initialize_repositories(connection) -> Dict[str, Any]:
+def initialize_repositories(connection, replicas=None) -> Dict[str, Any]:
     return {
         'usuario_repository': UsuarioRepository(connection),
         'notification_repository': NotificationRepository(connection),
-        'access_repository': RegistroRepository(connection),
+        'access_repository': RegistroRepository(connection, replicas=replicas),
         'face_encoding_repository': FaceEncodingRepository(connection),
         'manager_repository': ManagerRepository(connection),
-        'dashboard_repository': DashboardRepository(connection)
+        'dashboard_repository': DashboardRepository(connection, replicas),
+        'daily_hours_repository': DailyHoursRepository(connection)
     }
 
 
@@ -60,7 +63,8 @@ def initialize_services(repositories: Dict[str, Any]) -> Dict[str, Any]:
     access_service = AccessService(
         repositories['access_repository'],
         repositories['notification_repository'],
-        repositories['usuario_repository']
+        repositories['usuario_repository'],
+        repositories['daily_hours_repository']
     )
 
     face_recognition_service = FaceRecognitionService(
@@ -127,12 +131,8 @@ def load_initial_data(services: Dict[str, Any], controllers: Dict[str, Any]) ->
             'approval_rate': 0.0
         }
 
-    initial_data['acessos_registrados'] = services['access_service'].list_all_access_records()
-
     initial_data['taxas_sucesso'] = services['access_service'].get_success_rate()
 
-    initial_data['notificacoes'] = services['notification_service'].list_all_notifications()
-
     return initial_data
 
 
@@ -170,6 +170,7 @@ def clean_db_services() -> None:
             'db_connection', 'connection',
             'usuario_repository', 'notification_repository', 'access_repository',
             'face_encoding_repository', 'manager_repository', 'dashboard_repository',
+            'daily_hours_repository',
             'user_service', 'notification_service', 'access_service',
             'face_recognition_service', 'manager_service', 'dashboard_service',
             'face_recognition_controller', 'user_controller', 'manager_controller',
@@ -193,7 +194,7 @@ def init_services() -> None:
 
         connection = db_connection.get_connection()
 
-        repositories = initialize_repositories(connection)
+        repositories = initialize_repositories(connection, db_connection.get_replicas())
 
         services = initialize_services(repositories)
 
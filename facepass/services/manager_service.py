@@ -1,35 +1,179 @@
+import os
+import secrets
+import threading
+import time
 import bcrypt
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 from facepass.models.manager import Gestor
 from facepass.database.repository.manager_repository import ManagerRepository
+from facepass.services.session_token_service import SessionTokenService
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+AUTH_MAX_WORKERS = int(os.getenv('AUTH_MAX_WORKERS', '2'))
+AUTH_MAX_PENDING = AUTH_MAX_WORKERS * 4
+AUTH_TIMEOUT_SECONDS = 10.0
+LOGIN_MAX_FAILURES = int(os.getenv('LOGIN_MAX_FAILURES', '5'))
+LOGIN_WINDOW_SECONDS = int(os.getenv('LOGIN_WINDOW_SECONDS', '300'))
+
+
+class LoginRateLimiter:
+    """Limita tentativas de login falhas por email numa janela deslizante"""
+
+    def __init__(self, max_failures: int = LOGIN_MAX_FAILURES, window_seconds: int = LOGIN_WINDOW_SECONDS):
+        self.max_failures = max_failures
+        self.window_seconds = window_seconds
+        self._failures: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, key: str, now: float) -> deque:
+        """Descarta falhas fora da janela; emails sem falhas recentes deixam de ser guardados"""
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and failures[0] <= now - self.window_seconds:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+        return failures
+
+    def retry_after(self, email: str) -> float:
+        """Segundos até liberar novas tentativas (0 se não estiver bloqueado)"""
+        key = email.lower()
+        now = time.monotonic()
+        with self._lock:
+            failures = self._prune(key, now)
+            if len(failures) < self.max_failures:
+                return 0.0
+            return failures[0] + self.window_seconds - now
+
+    def register_failure(self, email: str) -> None:
+        key = email.lower()
+        now = time.monotonic()
+        with self._lock:
+            self._prune(key, now)
+            self._failures.setdefault(key, deque()).append(now)
+
+    def reset(self, email: str) -> None:
+        with self._lock:
+            self._failures.pop(email.lower(), None)
+
+
+# Estado compartilhado entre sessões: o custo do bcrypt é limitado por processo
+_auth_executor = ThreadPoolExecutor(max_workers=AUTH_MAX_WORKERS, thread_name_prefix='bcrypt')
+_auth_slots = threading.BoundedSemaphore(AUTH_MAX_PENDING)
+_login_rate_limiter = LoginRateLimiter()
+# Hash usado quando o email não existe, para que o tempo de resposta não revele contas
+_dummy_hash: Optional[str] = None
 
 
 class ManagerService:
-    def __init__(self, manager_repository: ManagerRepository):
+    def __init__(self, manager_repository: ManagerRepository,
+                 token_service: Optional[SessionTokenService] = None,
+                 rate_limiter: Optional[LoginRateLimiter] = None):
         self.manager_repository = manager_repository
+        self.token_service = token_service or SessionTokenService()
+        self.rate_limiter = rate_limiter or _login_rate_limiter
 
     @staticmethod
     def hash_password(password: str) -> str:
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """Indica se o hash foi gerado com custo diferente do configurado"""
+        try:
+            return int(hashed.split('$')[2]) != BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return True
+
+    def _verify_password_bounded(self, password: str, hashed: str) -> bool:
+        """Executa o bcrypt no pool de autenticação, com limite de concorrência"""
+        if not _auth_slots.acquire(timeout=AUTH_TIMEOUT_SECONDS):
+            raise TimeoutError("Serviço de autenticação sobrecarregado. Tente novamente.")
+        try:
+            future = _auth_executor.submit(self.verify_password, password, hashed)
+        except Exception:
+            _auth_slots.release()
+            raise
+        # O slot só é liberado quando o bcrypt termina, mesmo que a espera abaixo expire
+        future.add_done_callback(lambda _future: _auth_slots.release())
+        return future.result(timeout=AUTH_TIMEOUT_SECONDS)
+
+    @classmethod
+    def _get_dummy_hash(cls) -> str:
+        global _dummy_hash
+        if _dummy_hash is None:
+            _dummy_hash = cls.hash_password(secrets.token_hex(16))
+        return _dummy_hash
+
     def authenticate(self, email: str, password: str) -> Optional[Gestor]:
         if not email or not password:
             raise ValueError("Email e senha são obrigatórios.")
 
+        retry_after = self.rate_limiter.retry_after(email)
+        if retry_after > 0:
+            raise PermissionError(
+                f"Muitas tentativas de login. Tente novamente em {int(retry_after) + 1} segundos.")
+
         manager_data = self.manager_repository.get_manager_by_email(email)
 
         if not manager_data:
+            # Mesmo custo de uma senha errada: a existência do email não é observável pelo tempo
+            self._verify_password_bounded(password, self._get_dummy_hash())
+            self.rate_limiter.register_failure(email)
             return None
 
-        if not self.verify_password(password, manager_data['password_hash']):
+        if not self._verify_password_bounded(password, manager_data['password_hash']):
+            self.rate_limiter.register_failure(email)
             return None
 
+        self.rate_limiter.reset(email)
+
+        # Rehash transparente quando o custo configurado mudou
+        if self.needs_rehash(manager_data['password_hash']):
+            manager_data['password_hash'] = self.hash_password(password)
+            self.manager_repository.update_manager(manager_data['id'], manager_data)
+
         return Gestor.from_dict(manager_data)
 
+    def issue_session_token(self, gestor: Gestor) -> str:
+        return self.token_service.issue({
+            'id': gestor.id,
+            'name': gestor.name,
+            'email': gestor.email,
+            'ver': self.manager_repository.get_session_version(gestor.id)
+        })
+
+    def validate_session_token(self, token: str) -> Optional[Dict]:
+        """
+        Valida o token de sessão sem executar bcrypt. Além da assinatura e da
+        expiração, confere a versão de sessão do gestor (uma consulta por
+        chave primária): tokens emitidos antes de um logout ou troca de senha
+        são recusados.
+        """
+        claims = self.token_service.verify(token)
+        if not claims:
+            return None
+
+        version = self.manager_repository.get_session_version(claims['id'])
+        if version is None or claims.get('ver') != version:
+            return None
+
+        return claims
+
+    def revoke_sessions(self, manager_id: int) -> None:
+        """Revoga todos os tokens de sessão emitidos para o gestor"""
+        self.manager_repository.increment_session_version(manager_id)
+
     def get_manager_by_id(self, manager_id: int) -> Optional[Gestor]:
         manager_data = self.manager_repository.get_manager_by_id(manager_id)
 
@@ -89,6 +233,10 @@ class ManagerService:
 
         self.manager_repository.update_manager(manager_id, manager_data)
 
+        if password:
+            # Troca de senha encerra as sessões abertas
+            self.revoke_sessions(manager_id)
+
     def delete_manager(self, manager_id: int) -> None:
         existing = self.manager_repository.get_manager_by_id(manager_id)
         if not existing:
@@ -0,0 +1,199 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Exportação opcional: arquivo reescrito a cada tentativa e/ou endpoint HTTP local
+METRICS_FILE = os.getenv('METRICS_FILE', '')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histograma cumulativo no formato do Prometheus (limites em segundos)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Histogramas rotulados, compartilhados pelo processo, exportáveis em texto Prometheus"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def drain(self) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple]:
+        """Retorna e zera os histogramas, para enviá-los a outro processo (ex.: workers da API)"""
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+        return {key: (histogram.buckets, histogram.counts, histogram.sum, histogram.count)
+                for key, histogram in histograms.items()}
+
+    def merge(self, drained: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple]) -> None:
+        """Soma histogramas retornados por drain() em outro processo"""
+        with self._lock:
+            for key, (buckets, counts, total, count) in drained.items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(buckets)
+                for index, value in enumerate(counts):
+                    histogram.counts[index] += value
+                histogram.sum += total
+                histogram.count += count
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            names = sorted({name for name, _ in self._histograms})
+            for name in names:
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                    prefix = f"{label_text}," if label_text else ""
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+                    suffix = f"{{{label_text}}}" if label_text else ""
+                    lines.append(f"{name}_sum{suffix} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{suffix} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Grava o texto de forma atômica (formato do textfile collector do node_exporter)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+class StageTrace:
+    """Tempos por etapa (perf_counter) de uma única operação"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.stages: List[Tuple[str, float]] = []
+        self.started_at = time.perf_counter()
+        self.total = 0.0
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages.append((stage, seconds))
+
+    def breakdown(self) -> List[Dict[str, float]]:
+        """Lista de {'stage', 'ms', 'percent'} na ordem de execução"""
+        total = self.total or sum(seconds for _, seconds in self.stages) or 1.0
+        return [
+            {'stage': stage, 'ms': round(seconds * 1000, 2), 'percent': round(seconds * 100 / total, 1)}
+            for stage, seconds in self.stages
+        ]
+
+
+metrics = MetricsRegistry()
+metrics.describe('facepass_stage_seconds', 'Duração de cada etapa de uma operação (segundos)')
+metrics.describe('facepass_operation_seconds', 'Duração total de uma operação (segundos)')
+
+_current_trace: contextvars.ContextVar[Optional[StageTrace]] = contextvars.ContextVar('facepass_trace', default=None)
+_last_traces: Dict[str, StageTrace] = {}
+
+
+@contextmanager
+def span(stage: str):
+    """Mede uma etapa da operação em andamento; sem operação ativa, não faz nada"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        trace.add(stage, elapsed)
+        metrics.observe('facepass_stage_seconds', elapsed, operation=trace.operation, stage=stage)
+
+
+@contextmanager
+def trace_operation(operation: str):
+    """Abre o contexto de medição de uma operação; os `span` internos são agregados nela"""
+    trace = StageTrace(operation)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.total = time.perf_counter() - trace.started_at
+        metrics.observe('facepass_operation_seconds', trace.total, operation=operation)
+        _last_traces[operation] = trace
+        if METRICS_FILE:
+            metrics.write_prometheus(METRICS_FILE)
+
+
+def get_last_trace(operation: str) -> Optional[StageTrace]:
+    return _last_traces.get(operation)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: int = METRICS_PORT) -> bool:
+    """Sobe o endpoint /metrics em 127.0.0.1 (uma vez por processo); port 0 desativa"""
+    global _server
+    if not port:
+        return False
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(('127.0.0.1', port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return True
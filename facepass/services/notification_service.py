@@ -1,14 +1,77 @@
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 from facepass.models.user import Usuario
 from facepass.models.notification import Notificacao
 from facepass.models.registerAccess import RegistroAcesso
 from facepass.database.repository.notification_repository import NotificationRepository
+from facepass.services.ttl_cache import TTLCache
+
+
+UNREAD_COUNTER_RESYNC_SECONDS = 60.0
+NOTIFICATIONS_PAGE_SIZE = 20
+COUNTERS_CACHE_TTL_SECONDS = 10.0
+
+
+class UnreadNotificationCounter:
+    """
+    Contador em memória de notificações não lidas por gestor.
+
+    É semeado a partir do banco na primeira leitura, mantido a cada inserção
+    e marcação como lida, e ressincronizado periodicamente para absorver
+    alterações feitas por outros processos.
+    """
+
+    def __init__(self, resync_seconds: float = UNREAD_COUNTER_RESYNC_SECONDS):
+        self.resync_seconds = resync_seconds
+        self._counts: Dict[int, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, manager_id: int, loader: Callable[[int], int]) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._counts.get(manager_id)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        count = loader(manager_id)
+
+        with self._lock:
+            self._counts[manager_id] = (time.monotonic() + self.resync_seconds, count)
+        return count
+
+    def add(self, manager_id: int, delta: int) -> None:
+        with self._lock:
+            entry = self._counts.get(manager_id)
+            if entry is not None:
+                self._counts[manager_id] = (entry[0], max(0, entry[1] + delta))
+
+    def invalidate(self, manager_id: Optional[int] = None) -> None:
+        with self._lock:
+            if manager_id is None:
+                self._counts.clear()
+            else:
+                self._counts.pop(manager_id, None)
+
+
+# Compartilhados entre sessões: inserções ocorrem em sessões diferentes das de leitura
+_unread_counter = UnreadNotificationCounter()
+_counters_cache = TTLCache(COUNTERS_CACHE_TTL_SECONDS)
 
 
 class NotificationService:
-    def __init__(self, notification_repository: NotificationRepository):
+    def __init__(self, notification_repository: NotificationRepository,
+                 unread_counter: Optional[UnreadNotificationCounter] = None):
         self.notification_repository = notification_repository
+        self.unread_counter = unread_counter or _unread_counter
+
+    def _save(self, notificacao: Notificacao) -> None:
+        self.notification_repository.save_notification(notificacao)
+        if not notificacao.is_read:
+            # Dentro de uma transação, o contador só muda após o commit
+            self.notification_repository.executor.on_commit(
+                lambda: self.unread_counter.add(notificacao.manager_id, 1))
 
     def notify_new_user_pending_approval(self, usuario: Usuario, manager_id: int) -> None:
         if not usuario:
@@ -29,7 +92,7 @@ class NotificationService:
             is_read=False
         )
 
-        self.notification_repository.save_notification(notificacao)
+        self._save(notificacao)
 
     def notify_access_denied(self, registro_acesso: RegistroAcesso, manager_id: int, user_name: Optional[str] = None) -> None:
         if not registro_acesso:
@@ -59,23 +122,84 @@ class NotificationService:
                 is_read=False
             )
 
-            self.notification_repository.save_notification(notificacao)
+            self._save(notificacao)
 
     def list_unread_notifications(self, manager_id: Optional[int] = None):
         if manager_id:
-            all_notifications = self.notification_repository.get_notifications_by_manager(
-                manager_id)
-
-            return [n for n in all_notifications if not n['is_read']]
+            return self.notification_repository.get_unread_notifications_by_manager(manager_id)
         return self.notification_repository.list_unread_notifications()
 
     def mark_as_read(self, notification_id: int) -> None:
-        self.notification_repository.mark_notification_as_read(notification_id)
+        manager_id = self.notification_repository.get_notification_manager_id(
+            notification_id)
+        if self.notification_repository.mark_notification_as_read(notification_id):
+            self.unread_counter.add(manager_id, -1)
 
     def delete_notification(self, notification_id: int) -> None:
+        manager_id = self.notification_repository.get_notification_manager_id(
+            notification_id)
         self.notification_repository.delete_notification(notification_id)
+        self.unread_counter.invalidate(manager_id)
+
+    def mark_all_as_read(self, manager_id: int) -> int:
+        updated = self.notification_repository.mark_all_as_read(manager_id)
+        self.unread_counter.add(manager_id, -updated)
+        return updated
+
+    def mark_as_read_by_filter(self, manager_id: int, type_notification: Optional[str] = None,
+                               start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> int:
+        if start_date and end_date and start_date >= end_date:
+            raise ValueError("A data inicial deve ser anterior à data final.")
+
+        updated = self.notification_repository.mark_as_read_by_filter(
+            manager_id, type_notification, start_date, end_date)
+        self.unread_counter.add(manager_id, -updated)
+        return updated
+
+    def delete_read_older_than(self, manager_id: int, days: int) -> int:
+        if days < 0:
+            raise ValueError("A quantidade de dias deve ser positiva.")
+
+        return self.notification_repository.delete_read_older_than(manager_id, days)
 
     def list_all_notifications(self, manager_id: Optional[int] = None):
         if manager_id:
             return self.notification_repository.get_notifications_by_manager(manager_id)
         return self.notification_repository.list_all_notifications()
+
+    def get_counters(self) -> dict:
+        """Contagens globais de notificações (COUNT no banco, com cache de curta duração)"""
+        return dict(_counters_cache.get_or_load(
+            'notification_counts', self.notification_repository.get_notification_counts))
+
+    def get_unread_count(self, manager_id: int) -> int:
+        return self.unread_counter.get(
+            manager_id, self.notification_repository.get_unread_count_by_manager)
+
+    def get_statistics(self, manager_id: int) -> dict:
+        counts = self.notification_repository.get_notification_counts_by_manager(
+            manager_id)
+        unread = self.get_unread_count(manager_id)
+        return {
+            'total': counts['total'],
+            'unread': unread,
+            'read': max(0, counts['total'] - unread)
+        }
+
+    def list_notifications_page(self, manager_id: int, is_read: Optional[bool] = None,
+                                cursor: Optional[Tuple[datetime, int]] = None,
+                                page_size: int = NOTIFICATIONS_PAGE_SIZE) -> Tuple[list, Optional[Tuple[datetime, int]]]:
+        """
+        Retorna uma página do feed detalhado e o cursor da próxima página
+        (None quando não há mais resultados).
+        """
+        rows = self.notification_repository.get_notifications_with_details(
+            manager_id, limit=page_size + 1, before=cursor, is_read=is_read)
+
+        if len(rows) <= page_size:
+            return rows, None
+
+        page = rows[:page_size]
+        last = page[-1]
+        return page, (last['created_at'], last['id'])
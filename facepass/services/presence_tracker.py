@@ -0,0 +1,186 @@
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, List, Optional, Any
+from dotenv import load_dotenv
+from facepass.models.registerAccess import RegistroAcesso
+
+load_dotenv()
+
+# Atraso máximo esperado entre gravar um registro e confirmar a transação (segundos)
+PRESENCE_SETTLE_SECONDS = float(os.getenv('PRESENCE_SETTLE_SECONDS', '60'))
+
+STATUS_ORDER = {'Presente': 1, 'Saiu': 2, 'Ausente': 3}
+
+
+class UserPresence:
+    """Estado de presença de um usuário no dia: última entrada, última saída e contagem"""
+
+    __slots__ = ('last_entry', 'last_exit', 'access_count')
+
+    def __init__(self, last_entry: Optional[datetime] = None, last_exit: Optional[datetime] = None,
+                 access_count: int = 0):
+        self.last_entry = last_entry
+        self.last_exit = last_exit
+        self.access_count = access_count
+
+    @property
+    def status(self) -> str:
+        if self.last_entry is not None and (self.last_exit is None or self.last_entry > self.last_exit):
+            return 'Presente'
+        if self.last_entry is None:
+            return 'Ausente'
+        return 'Saiu'
+
+    def apply(self, type_access: str, access_allowed: bool, created_at: datetime) -> None:
+        self.access_count += 1
+        if not access_allowed:
+            return
+        if type_access == 'entrada' and (self.last_entry is None or created_at > self.last_entry):
+            self.last_entry = created_at
+        elif type_access == 'saida' and (self.last_exit is None or created_at > self.last_exit):
+            self.last_exit = created_at
+
+
+class PresenceTracker:
+    """
+    Máquina de estados de presença mantida em memória para o dia corrente.
+
+    É semeada uma vez por dia a partir do banco e atualizada a cada tentativa
+    de acesso registrada, evitando reagrupar os registros do dia a cada
+    renderização do dashboard.
+
+    record() só enxerga os acessos deste processo; os gravados por outros
+    (API de quiosques, modo de vídeo, ferramentas em lote) entram pelo
+    catch_up(), chamado a cada leitura do dashboard.
+
+    Ids de auto-incremento não são confirmados em ordem (transações
+    concorrentes), então nada é descartado por "id menor que o último visto":
+    a semeadura agrega só registros com mais de `settle_seconds`, e cada
+    catch_up relê os últimos `settle_seconds`, aplicando apenas ids ainda não
+    contabilizados no dia.
+    """
+
+    def __init__(self, settle_seconds: float = PRESENCE_SETTLE_SECONDS,
+                 now: Callable[[], datetime] = datetime.now):
+        self.settle_seconds = settle_seconds
+        self._now = now
+        self._day: Optional[date] = None
+        # Registros com created_at anterior estão no agregado da semeadura
+        self._seeded_before: Optional[datetime] = None
+        # Início da janela relida pelo próximo catch_up
+        self._horizon: Optional[datetime] = None
+        # Ids aplicados individualmente no dia (record ou catch_up)
+        self._applied_ids = set()
+        self._presence: Dict[int, UserPresence] = {}
+        self._lock = threading.Lock()
+
+    def _settled_before(self, day: date) -> datetime:
+        """Limite abaixo do qual os registros do dia são considerados confirmados"""
+        return max(datetime.combine(day, time.min), self._now() - timedelta(seconds=self.settle_seconds))
+
+    def ensure_seeded(self, loader: Callable[[str, datetime], List[Dict[str, Any]]]) -> None:
+        """
+        Semeia o estado do dia a partir do banco, se ainda não foi feito hoje.
+
+        `loader` recebe a data ('YYYY-MM-DD') e o limite `settled_before` e
+        retorna uma linha por usuário (user_id, last_entry, last_exit,
+        total_accesses) agregando os registros do dia anteriores ao limite.
+        """
+        today = self._now().date()
+        with self._lock:
+            if self._day == today:
+                return
+
+            settled_before = self._settled_before(today)
+            rows = loader(today.strftime('%Y-%m-%d'), settled_before)
+            self._presence = {
+                row['user_id']: UserPresence(row['last_entry'], row['last_exit'], int(row['total_accesses']))
+                for row in rows
+                if row['user_id'] is not None
+            }
+            self._seeded_before = settled_before
+            self._horizon = settled_before
+            self._applied_ids = set()
+            self._day = today
+
+    def catch_up(self, loader: Callable[[datetime, str], List[Dict[str, Any]]]) -> None:
+        """
+        Aplica registros gravados por outros processos (ex.: API de quiosques).
+
+        `loader` recebe o início da janela (`since`) e a data ('YYYY-MM-DD') e
+        retorna os registros do dia com created_at >= since (id, user_id,
+        created_at, type_access, access_allowed).
+        """
+        with self._lock:
+            if self._day is None:
+                return
+            day = self._day
+            since = self._horizon
+            next_horizon = max(since, self._settled_before(day))
+
+        rows = loader(since, day.strftime('%Y-%m-%d'))
+
+        with self._lock:
+            if self._day != day:
+                return
+            for row in rows:
+                self._apply(row['id'], row['user_id'], row['type_access'], row['access_allowed'],
+                            row['created_at'])
+            self._horizon = max(self._horizon, next_horizon)
+
+    def record(self, registro: RegistroAcesso) -> None:
+        """Aplica uma tentativa de acesso recém-registrada ao estado do dia"""
+        if registro.user_id is None or registro.created_at is None:
+            return
+
+        with self._lock:
+            if self._day != registro.created_at.date():
+                return
+            self._apply(registro.id, registro.user_id, registro.type_access, registro.access_allowed,
+                        registro.created_at)
+
+    def _apply(self, register_id: Optional[int], user_id: Optional[int], type_access: str,
+               access_allowed: Any, created_at: datetime) -> None:
+        # Chamado com o lock adquirido
+        if user_id is None or created_at < self._seeded_before:
+            # Sem usuário ou já contabilizado no agregado da semeadura
+            return
+        if register_id:
+            if register_id in self._applied_ids:
+                return
+            self._applied_ids.add(register_id)
+
+        presence = self._presence.get(user_id)
+        if presence is None:
+            presence = self._presence[user_id] = UserPresence()
+        presence.apply(type_access, bool(access_allowed), created_at)
+
+    def invalidate(self) -> None:
+        """Força uma nova semeadura na próxima leitura"""
+        with self._lock:
+            self._day = None
+
+    def build_attendance(self, users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Combina a lista de usuários aprovados com o estado de presença do dia"""
+        with self._lock:
+            attendance = []
+            for user in users:
+                presence = self._presence.get(user['id']) or UserPresence()
+                attendance.append({
+                    'id': user['id'],
+                    'name': user['name'],
+                    'position': user['position'],
+                    'email': user['email'],
+                    'last_entry_time': presence.last_entry,
+                    'last_exit_time': presence.last_exit,
+                    'access_count': presence.access_count,
+                    'status': presence.status
+                })
+
+        attendance.sort(key=lambda u: (STATUS_ORDER[u['status']], (u['name'] or '').lower()))
+        return attendance
+
+
+# Compartilhado entre sessões: acessos são registrados em sessões diferentes do dashboard
+presence_tracker = PresenceTracker()
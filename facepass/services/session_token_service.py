@@ -0,0 +1,61 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from typing import Optional, Dict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Sem SESSION_SECRET configurado, os tokens valem apenas enquanto o processo estiver ativo
+SESSION_SECRET = os.getenv('SESSION_SECRET') or secrets.token_hex(32)
+SESSION_TTL_SECONDS = int(os.getenv('SESSION_TTL_SECONDS', '28800'))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+class SessionTokenService:
+    """Emite e valida tokens de sessão assinados (HMAC-SHA256) com expiração"""
+
+    def __init__(self, secret: str = SESSION_SECRET, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.secret = secret.encode('utf-8')
+        self.ttl_seconds = ttl_seconds
+
+    def _sign(self, payload: str) -> str:
+        digest = hmac.new(self.secret, payload.encode('ascii'), hashlib.sha256).digest()
+        return _b64encode(digest)
+
+    def issue(self, claims: Dict) -> str:
+        """Gera um token `payload.assinatura` contendo as claims e a expiração"""
+        data = dict(claims)
+        data['exp'] = int(time.time()) + self.ttl_seconds
+        payload = _b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token: str) -> Optional[Dict]:
+        """Retorna as claims se o token for autêntico e não estiver expirado"""
+        if not token or token.count('.') != 1:
+            return None
+
+        payload, signature = token.split('.')
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+
+        try:
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, TypeError):
+            return None
+
+        if claims.get('exp', 0) < time.time():
+            return None
+
+        return claims
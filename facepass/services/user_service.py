@@ -2,6 +2,9 @@ from facepass.models.user import Usuario
 from facepass.database.repository.user_repository import UsuarioRepository
 from facepass.services.notification_service import NotificationService
 from facepass.database.repository.notification_repository import NotificationRepository
+from facepass.services.ttl_cache import TTLCache
+
+STATISTICS_CACHE_TTL_SECONDS = 30.0
 
 
 class UsuarioService:
@@ -9,6 +12,7 @@ class UsuarioService:
         self.usuario_repository = usuario_repository
         self.notification_service = NotificationService(
             notification_repository)
+        self.statistics_cache = TTLCache(STATISTICS_CACHE_TTL_SECONDS)
 
     def create_user(self, usuario: Usuario, manager_id: int) -> Usuario | None:
         if usuario is None:
@@ -17,15 +21,18 @@ class UsuarioService:
         usuario.approved = False
         usuario.id = 0
 
-        usuario_salvo = self.usuario_repository.save_user(usuario)
+        # Usuário e notificação são gravados juntos (um único commit)
+        with self.usuario_repository.executor.transaction():
+            usuario_salvo = self.usuario_repository.save_user(usuario)
 
-        if usuario_salvo is None:
-            raise RuntimeError("Falha ao salvar usuário.")
+            if usuario_salvo is None:
+                raise RuntimeError("Falha ao salvar usuário.")
 
-        # Notifica gestor sobre novo cadastro pendente (US1)
-        self.notification_service.notify_new_user_pending_approval(
-            usuario_salvo, manager_id)
+            # Notifica gestor sobre novo cadastro pendente (US1)
+            self.notification_service.notify_new_user_pending_approval(
+                usuario_salvo, manager_id)
 
+        self.statistics_cache.invalidate()
         return usuario_salvo
 
     def approve_user(self, user_id: int) -> None:
@@ -34,9 +41,11 @@ class UsuarioService:
             raise ValueError("Usuário não encontrado.")
 
         self.usuario_repository.approve_user(user_id)
+        self.statistics_cache.invalidate()
 
     def reject_user(self, user_id: int) -> None:
         self.usuario_repository.remove_user(user_id)
+        self.statistics_cache.invalidate()
     
     def remove_user(self, user_id: int) -> None:
         existing_user = self.usuario_repository.get_user_by_id(user_id)
@@ -44,6 +53,7 @@ class UsuarioService:
                 raise ValueError("Usuário não encontrado.")
 
         self.usuario_repository.remove_user(user_id)
+        self.statistics_cache.invalidate()
 
     def list_pending_approvals(self):
         return self.usuario_repository.list_unapproved_users()
@@ -61,6 +71,7 @@ class UsuarioService:
             raise ValueError("Usuário não encontrado.")
 
         self.usuario_repository.save_user(usuario)
+        self.statistics_cache.invalidate()
 
     def list_all_users(self):
         return self.usuario_repository.list_all_users()
@@ -71,13 +82,9 @@ class UsuarioService:
     def get_user_by_email(self, email: str):
         return self.usuario_repository.get_user_by_email(email)
 
+    def get_user_photo(self, user_id: int):
+        return self.usuario_repository.get_user_photo(user_id)
+
     def get_statistics(self) -> dict:
-        total = self.usuario_repository.get_user_count()
-        approved = self.usuario_repository.get_approved_user_count()
-        pending = self.usuario_repository.get_pending_user_count()
-
-        return {
-            'total': total,
-            'approved': approved,
-            'pending': pending
-        }
+        return dict(self.statistics_cache.get_or_load(
+            'user_statistics', self.usuario_repository.get_user_statistics))
@@ -0,0 +1,162 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+from facepass.services.face_recognition_service import FaceRecognitionService
+from facepass.services.face_tracker import FaceTrack, FaceTracker
+
+
+class StreamStats:
+    """Contadores de uma execução do modo de vídeo"""
+
+    def __init__(self):
+        self.frames_read = 0
+        self.frames_processed = 0
+        self.encodings = 0
+        self.events = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def summary(self) -> Dict[str, float]:
+        elapsed = self.elapsed or 1e-9
+        return {
+            'frames_read': self.frames_read,
+            'frames_processed': self.frames_processed,
+            'encodings': self.encodings,
+            'events': self.events,
+            'seconds': round(elapsed, 2),
+            'fps': round(self.frames_read / elapsed, 1),
+            'processed_fps': round(self.frames_processed / elapsed, 1)
+        }
+
+
+class VideoStreamProcessor:
+    """
+    Reconhecimento contínuo sobre um fluxo de vídeo.
+
+    Processa um a cada `frame_skip + 1` quadros: detecta os rostos numa cópia
+    reduzida (`detection_scale`), associa-os às trilhas do FaceTracker e só
+    gera encoding + identificação para trilhas novas ou, enquanto a confiança
+    estiver abaixo de `confident_threshold`, numa nova checagem a cada
+    `recheck_frames` quadros (até `max_attempts` tentativas). Cada trilha
+    gera um único evento de acesso, entregue a `on_access`.
+    """
+
+    def __init__(self, face_recognition_service: FaceRecognitionService,
+                 on_access: Callable[[FaceTrack, Optional[Tuple[int, float]], Optional[bytes]], None],
+                 frame_skip: int = 2, detection_scale: float = 0.5, confident_threshold: float = 0.5,
+                 max_attempts: int = 3, recheck_frames: int = 10, tracker: Optional[FaceTracker] = None):
+        self.face_recognition_service = face_recognition_service
+        self.on_access = on_access
+        self.frame_skip = frame_skip
+        self.detection_scale = detection_scale
+        self.confident_threshold = confident_threshold
+        self.max_attempts = max_attempts
+        self.recheck_frames = recheck_frames
+        self.tracker = tracker or FaceTracker()
+        self.stats = StreamStats()
+        # Recorte do rosto na última tentativa, guardado no registro de acesso
+        self._snapshots: Dict[int, np.ndarray] = {}
+
+    def process_frame(self, frame: np.ndarray, frame_index: int) -> List[FaceTrack]:
+        """Processa um quadro BGR (formato do OpenCV); retorna as trilhas que geraram evento"""
+        self.stats.frames_processed += 1
+        scale = self.detection_scale
+
+        small = cv2.resize(frame, (0, 0), fx=scale, fy=scale) if scale != 1 else frame
+        small_boxes = self.face_recognition_service.detect_faces(np.ascontiguousarray(small[:, :, ::-1]))
+        boxes = [tuple(int(round(value / scale)) for value in box) for box in small_boxes]
+
+        active, ended = self.tracker.update(boxes, frame_index)
+
+        emitted = []
+        rgb = None
+        for track in active:
+            if not self._needs_identification(track, frame_index):
+                continue
+            if rgb is None:
+                rgb = np.ascontiguousarray(frame[:, :, ::-1])
+            self._identify(track, frame, rgb, frame_index)
+
+            confident = track.identity is not None and track.identity[1] >= self.confident_threshold
+            if confident or track.attempts >= self.max_attempts:
+                self._emit(track)
+                emitted.append(track)
+
+        # Rostos que saíram antes de esgotar as tentativas: evento com o melhor resultado
+        for track in ended:
+            if not track.emitted and track.attempts:
+                self._emit(track)
+                emitted.append(track)
+            self._snapshots.pop(track.id, None)
+
+        return emitted
+
+    def run(self, capture, max_frames: Optional[int] = None, report_every: float = 5.0,
+            report: Optional[Callable[[Dict[str, float]], None]] = None) -> Dict[str, float]:
+        """Lê `capture` (cv2.VideoCapture) até o fim ou `max_frames`; retorna o resumo"""
+        self.stats = StreamStats()
+        last_report = time.perf_counter()
+        frame_index = 0
+
+        while max_frames is None or frame_index < max_frames:
+            if frame_index % (self.frame_skip + 1):
+                # Quadro pulado: avança o fluxo sem converter a imagem
+                if not capture.grab():
+                    break
+            else:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                self.process_frame(frame, frame_index)
+
+            frame_index += 1
+            self.stats.frames_read += 1
+
+            if report and time.perf_counter() - last_report >= report_every:
+                report(self.stats.summary())
+                last_report = time.perf_counter()
+
+        # Encerra as trilhas abertas no fim do fluxo
+        for track in list(self.tracker.tracks.values()):
+            if not track.emitted and track.attempts:
+                self._emit(track)
+        self.tracker.tracks.clear()
+        self._snapshots.clear()
+
+        return self.stats.summary()
+
+    def _needs_identification(self, track: FaceTrack, frame_index: int) -> bool:
+        if track.emitted or track.attempts >= self.max_attempts:
+            return False
+        return track.last_attempt_frame is None or frame_index - track.last_attempt_frame >= self.recheck_frames
+
+    def _identify(self, track: FaceTrack, frame: np.ndarray, rgb: np.ndarray, frame_index: int) -> None:
+        track.attempts += 1
+        track.last_attempt_frame = frame_index
+        self.stats.encodings += 1
+
+        top, right, bottom, left = track.box
+        self._snapshots[track.id] = frame[max(top, 0):bottom, max(left, 0):right].copy()
+
+        encoding = self.face_recognition_service.encode_face(rgb, track.box)
+        if encoding is None:
+            return
+        match = self.face_recognition_service.identify_encoding(encoding)
+        if match is not None and (track.identity is None or match[1] > track.identity[1]):
+            track.identity = match
+
+    def _emit(self, track: FaceTrack) -> None:
+        track.emitted = True
+        self.stats.events += 1
+
+        snapshot = self._snapshots.get(track.id)
+        image_bytes = None
+        if snapshot is not None and snapshot.size:
+            ok, buffer = cv2.imencode('.jpg', snapshot)
+            if ok:
+                image_bytes = buffer.tobytes()
+        self.on_access(track, track.identity, image_bytes)
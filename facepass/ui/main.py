@@ -1,6 +1,8 @@
 import streamlit as st
 from facepass.ui.ui_pages import notifications, approve_registration, registers, facial_recognition, user_registration, manager_login, dashboard
 from facepass.services.init_services import init_services, clean_db_services
+from facepass.services.metrics import start_metrics_server
+from facepass.database.setup_database.query_instrumentation import query_stats
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -20,6 +22,14 @@ def sidebar():
         manager_name = st.session_state.get('manager_name', 'Gestor')
         st.sidebar.success(f"✅ **{manager_name}**")
 
+        notification_controller = st.session_state.get('notification_controller')
+        if notification_controller:
+            unread_result = notification_controller.get_unread_count(
+                st.session_state.get('manager_id'))
+            if unread_result['success'] and unread_result['data'] > 0:
+                st.sidebar.warning(
+                    f"🔔 {unread_result['data']} notificação(ões) não lida(s)")
+
     st.sidebar.markdown("---")
     st.sidebar.subheader("📍 Navegação")
 
@@ -166,6 +176,15 @@ def home_page():
     # Obter estatísticas do session_state
     stats = st.session_state.get('user_stats', {})
 
+    # Contadores leves (COUNT no banco com cache curto), sem carregar tabelas inteiras
+    access_service = st.session_state.get('access_service')
+    notification_service = st.session_state.get('notification_service')
+    try:
+        access_counters = access_service.get_counters() if access_service else {}
+        notification_counters = notification_service.get_counters() if notification_service else {}
+    except Exception:
+        access_counters, notification_counters = {}, {}
+
     with col_stat1:
         st.metric("👥 Usuários Cadastrados", stats.get('total_users', 0),
                   help="Total de usuários no sistema")
@@ -179,14 +198,14 @@ def home_page():
                   help="Usuários aguardando aprovação")
 
     with col_stat4:
-        st.metric("📊 Acessos Totais", len(st.session_state.get('acessos_registrados', [])),
+        st.metric("📊 Acessos Totais", access_counters.get('total', 0),
                   help="Total de tentativas de acesso")
 
     with col_stat5:
         st.metric("📈 Taxa de usuários aprovados", f"{stats.get('approval_rate', 0.0):.2f}%",
                   help="Percentual de usuários aprovados")
     with col_stat6:
-        st.metric("🔔 Notificações", len(st.session_state.get('notificacoes', [])),
+        st.metric("🔔 Notificações", notification_counters.get('total', 0),
                   help="Total de notificações geradas")
 
     st.markdown("---")
@@ -215,26 +234,35 @@ def main():
     # Inicializar serviços e conexões
     init_services()
 
+    # Endpoint /metrics (Prometheus), se METRICS_PORT estiver configurado
+    start_metrics_server()
+
+    # Restaurar sessão do gestor a partir do token (recarregamento de página)
+    manager_login.restore_session()
+
     # Navegação
     page = sidebar()
 
-    # Roteamento de páginas
-    if page == "🏠 Início":
-        home_page()
-    elif page == "📝 Cadastro de Usuário":
-        user_registration.app()
-    elif page == "🔐 Reconhecimento Facial":
-        facial_recognition.app()
-    elif page == "👨‍💼 Login de Gestor":
-        manager_login.app()
-    elif page == "📊 Dashboard":
-        dashboard.app()
-    elif page == "👤 Gestão de Cadastros":
-        approve_registration.app()
-    elif page == "📜 Relatórios de Acesso":
-        registers.app()
-    elif page == "🔔 Notificações":
-        notifications.app()
+    # Roteamento de páginas (consultas contadas por renderização)
+    with query_stats.scope(page) as scope:
+        st.session_state['query_scope'] = scope
+
+        if page == "🏠 Início":
+            home_page()
+        elif page == "📝 Cadastro de Usuário":
+            user_registration.app()
+        elif page == "🔐 Reconhecimento Facial":
+            facial_recognition.app()
+        elif page == "👨‍💼 Login de Gestor":
+            manager_login.app()
+        elif page == "📊 Dashboard":
+            dashboard.app()
+        elif page == "👤 Gestão de Cadastros":
+            approve_registration.app()
+        elif page == "📜 Relatórios de Acesso":
+            registers.app()
+        elif page == "🔔 Notificações":
+            notifications.app()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
 from PIL import Image
 import streamlit as st
 import io
-from facepass.models.user import Usuario
 import time
 
 
@@ -40,8 +39,6 @@ def app():
             return
 
         usuarios_pendentes = result['data']
-        usuarios_pendentes = [Usuario.from_dict(
-            user) for user in usuarios_pendentes]
 
         if not usuarios_pendentes:
             st.info("📭 Não há usuários pendentes de aprovação no momento.")
@@ -54,17 +51,20 @@ def app():
                     col1, col2 = st.columns([1, 2])
 
                     with col1:
-                        # Exibir foto do usuário
-                        if user.photo_recognition:
-                            try:
-                                image = Image.open(
-                                    io.BytesIO(user.photo_recognition))
-                                st.image(
-                                    image, caption="Foto de Reconhecimento", width=200)
-                            except Exception:
-                                st.warning("⚠️ Erro ao carregar foto")
-                        else:
-                            st.warning("Sem foto cadastrada")
+                        # Foto carregada sob demanda (a listagem não traz o BLOB)
+                        if st.checkbox("📷 Exibir foto", key=f"show_photo_{user.id}"):
+                            photo_result = user_controller.get_user_photo(
+                                user.id)
+                            if photo_result['success']:
+                                try:
+                                    image = Image.open(
+                                        io.BytesIO(photo_result['data']))
+                                    st.image(
+                                        image, caption="Foto de Reconhecimento", width=200)
+                                except Exception:
+                                    st.warning("⚠️ Erro ao carregar foto")
+                            else:
+                                st.warning("Sem foto cadastrada")
 
                     with col2:
                         # Informações do usuário
@@ -86,33 +86,27 @@ def app():
                     with col_btn1:
                         if st.button("✅ Aprovar", key=f"aprovar_{user.id}", use_container_width=True):
                             with st.spinner("Processando aprovação..."):
-                                # Aprovar via controller
-                                approve_result = user_controller.approve_user(
-                                    user.id, approved=True)
-
-                                if approve_result['success']:
-                                    # Obter face_recognition_controller e cadastrar encoding facial
-                                    face_recognition_controller = st.session_state.get(
-                                        'face_recognition_controller')
-
-                                    if face_recognition_controller:
-                                        encoding_result = face_recognition_controller.save_user_face_encoding(
-                                            user.id, user.photo_recognition
-                                        )
-
-                                        if not encoding_result['success']:
-                                            st.warning(
-                                                f"⚠️ Usuário aprovado, mas houve erro ao salvar o encoding facial: {encoding_result['message']}")
-                                        else:
-                                            st.success(
-                                                f"✅ Usuário {user.name} aprovado com sucesso!")
-                                            st.balloons()
-                                    else:
+                                face_recognition_controller = st.session_state.get(
+                                    'face_recognition_controller')
+
+                                if face_recognition_controller:
+                                    # Aprovação e encoding facial na mesma transação
+                                    approve_result = face_recognition_controller.approve_user_with_face(
+                                        user.id)
+                                    if approve_result['success']:
+                                        st.success(
+                                            f"✅ Usuário {user.name} aprovado com sucesso!")
+                                        st.balloons()
+                                else:
+                                    approve_result = user_controller.approve_user(
+                                        user.id, approved=True)
+                                    if approve_result['success']:
                                         st.warning(
                                             f"⚠️ Usuário aprovado, mas serviço de reconhecimento facial indisponível")
                                         st.success(
                                             f"✅ Usuário {user.name} aprovado (sem reconhecimento facial)!")
 
+                                if approve_result['success']:
                                     time.sleep(2)
                                     if f'confirm_reject_{user.id}' in st.session_state:
                                         del st.session_state[f'confirm_reject_{user.id}']
@@ -170,9 +164,6 @@ def app():
 
         todos_usuarios = result['data']
 
-        todos_usuarios = [Usuario.from_dict(
-            user) for user in todos_usuarios]
-
         # Aplicar filtros
         if filter_name:
             todos_usuarios = [
@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from facepass.database.setup_database.query_instrumentation import query_stats
 
 
 def app():
@@ -62,6 +63,11 @@ def app():
     # Seção de Horas Extras
     render_overtime_section(dashboard_service)
 
+    # Diagnóstico de consultas (apenas com QUERY_INSTRUMENTATION ativo)
+    if query_stats.enabled:
+        st.markdown("---")
+        render_query_debug_panel()
+
 
 def render_quick_cards(dashboard_service):
     """Renderiza os cards com estatísticas rápidas"""
@@ -300,14 +306,12 @@ def render_access_timeline_chart(dashboard_service):
         st.error(f"❌ {result.get('message', 'Erro ao carregar dados')}")
         return
 
-    data = result.get('data', [])
+    df = result.get('data', [])
 
-    if not data:
+    if len(df) == 0:
         st.info("Nenhum dado disponível para o período.")
         return
 
-    df = pd.DataFrame(data)
-
     # Criar gráfico
     fig = go.Figure()
 
@@ -356,14 +360,12 @@ def render_access_by_hour_chart(dashboard_service):
         st.error(f"❌ {result.get('message', 'Erro ao carregar dados')}")
         return
 
-    data = result.get('data', [])
+    df = result.get('data', [])
 
-    if not data:
+    if len(df) == 0:
         st.info("Nenhum acesso registrado hoje.")
         return
 
-    df = pd.DataFrame(data)
-
     # Criar gráfico
     fig = go.Figure()
 
@@ -402,14 +404,12 @@ def render_success_rate_chart(dashboard_service):
         st.error(f"❌ {result.get('message', 'Erro ao carregar dados')}")
         return
 
-    data = result.get('data', [])
+    df = result.get('data', [])
 
-    if not data:
+    if len(df) == 0:
         st.info("Nenhum dado disponível.")
         return
 
-    df = pd.DataFrame(data)
-
     # Criar gráfico
     fig = go.Figure()
 
@@ -442,14 +442,12 @@ def render_top_users_chart(dashboard_service):
         st.error(f"❌ {result.get('message', 'Erro ao carregar dados')}")
         return
 
-    data = result.get('data', [])
+    df = result.get('data', [])
 
-    if not data:
+    if len(df) == 0:
         st.info("Nenhum dado disponível.")
         return
 
-    df = pd.DataFrame(data)
-
     # Criar gráfico
     fig = go.Figure(go.Bar(
         x=df['access_count'],
@@ -478,14 +476,12 @@ def render_notifications_chart(dashboard_service):
         st.error(f"❌ {result.get('message', 'Erro ao carregar dados')}")
         return
 
-    data = result.get('data', [])
+    df = result.get('data', [])
 
-    if not data:
+    if len(df) == 0:
         st.info("Nenhuma notificação registrada.")
         return
 
-    df = pd.DataFrame(data)
-
     # Criar gráfico
     fig = px.pie(
         df,
@@ -528,7 +524,7 @@ def render_overtime_section(dashboard_service):
         st.error(f"❌ {result.get('message', 'Erro ao carregar dados de horas extras')}")
         return
 
-    overtime_data = result.get('data', [])
+    df_overtime = result.get('data', [])
     total_overtime_hours = result.get('total_overtime_hours', 0)
     overtime_rate = result.get('overtime_rate', 30.0)
     total_cost = result.get('total_cost', 0)
@@ -558,14 +554,14 @@ def render_overtime_section(dashboard_service):
         )
 
     with col4:
-        employees_with_overtime = len(overtime_data)
+        employees_with_overtime = len(df_overtime)
         st.metric(
             label="👥 Funcionários com H.E.",
             value=employees_with_overtime,
             help="Número de funcionários que fizeram horas extras"
         )
 
-    if not overtime_data:
+    if employees_with_overtime == 0:
         st.info(f"Nenhuma hora extra registrada nos últimos {period_days} dias.")
         return
 
@@ -577,8 +573,6 @@ def render_overtime_section(dashboard_service):
     with col_chart:
         st.subheader("📊 Horas Extras por Funcionário")
 
-        df_overtime = pd.DataFrame(overtime_data)
-
         # Criar gráfico de barras horizontal
         fig = go.Figure()
 
@@ -587,18 +581,18 @@ def render_overtime_section(dashboard_service):
             x=df_overtime['total_overtime_hours'],
             orientation='h',
             marker_color='orange',
-            text=df_overtime['total_overtime_hours'].apply(lambda x: f"{float(x):.2f}h"),
+            text=df_overtime['total_overtime_hours'].map("{:.2f}h".format),
             textposition='auto',
             hovertemplate='<b>%{y}</b><br>' +
                           'Horas Extras: %{x:.2f}h<br>' +
                           'Custo: R$ %{customdata:.2f}<extra></extra>',
-            customdata=df_overtime['total_overtime_hours'].apply(lambda x: float(x) * overtime_rate)
+            customdata=df_overtime['total_overtime_hours'] * overtime_rate
         ))
 
         fig.update_layout(
             xaxis_title="Horas Extras (h)",
             yaxis_title="Funcionário",
-            height=max(400, len(overtime_data) * 30),  # Altura dinâmica
+            height=max(400, employees_with_overtime * 30),  # Altura dinâmica
             showlegend=False
         )
 
@@ -610,8 +604,8 @@ def render_overtime_section(dashboard_service):
         # Criar DataFrame para tabela
         df_cost = pd.DataFrame({
             'Funcionário': df_overtime['name'],
-            'H. Extras': df_overtime['total_overtime_hours'].apply(lambda x: f"{float(x):.2f}h"),
-            'Custo': df_overtime['total_overtime_hours'].apply(lambda x: f"R$ {float(x) * overtime_rate:,.2f}")
+            'H. Extras': df_overtime['total_overtime_hours'].map("{:.2f}h".format),
+            'Custo': (df_overtime['total_overtime_hours'] * overtime_rate).map("R$ {:,.2f}".format)
         })
 
         st.dataframe(
@@ -631,9 +625,9 @@ def render_overtime_section(dashboard_service):
             'Nome': df_overtime['name'],
             'Cargo': df_overtime['position'],
             'Dias Trab.': df_overtime['days_worked'],
-            'H. Totais': df_overtime['total_hours_worked'].apply(lambda x: f"{float(x):.2f}h"),
-            'H. Extras': df_overtime['total_overtime_hours'].apply(lambda x: f"{float(x):.2f}h"),
-            'Custo H.E.': df_overtime['total_overtime_hours'].apply(lambda x: f"R$ {float(x) * overtime_rate:,.2f}")
+            'H. Totais': df_overtime['total_hours_worked'].map("{:.2f}h".format),
+            'H. Extras': df_overtime['total_overtime_hours'].map("{:.2f}h".format),
+            'Custo H.E.': (df_overtime['total_overtime_hours'] * overtime_rate).map("R$ {:,.2f}".format)
         })
 
         st.dataframe(
@@ -655,7 +649,7 @@ def render_overtime_section(dashboard_service):
             )
 
         with col_stat2:
-            total_days_worked = df_overtime['days_worked'].sum()
+            total_days_worked = int(df_overtime['days_worked'].sum())
             st.metric(
                 "Total de Dias Trabalhados",
                 total_days_worked
@@ -667,3 +661,43 @@ def render_overtime_section(dashboard_service):
                 "Máximo de H.E. (Individual)",
                 f"{max_overtime:.2f}h"
             )
+
+
+def render_query_debug_panel():
+    """Renderiza o painel de diagnóstico das consultas ao banco"""
+    with st.expander("🛠️ Diagnóstico de Consultas"):
+        snapshot = query_stats.snapshot()
+        scope = st.session_state.get('query_scope')
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Consultas (processo)", snapshot['total_queries'])
+        with col2:
+            st.metric("Consultas nesta página", scope.count if scope else 0)
+        with col3:
+            st.metric("Limite de consulta lenta", f"{snapshot['slow_query_ms']:.0f} ms")
+
+        if scope:
+            repeated = scope.repeated()
+            if repeated:
+                st.warning("⚠️ Consultas repetidas nesta renderização (possível N+1):")
+                st.dataframe(pd.DataFrame(
+                    [{'consulta': fp, 'execuções': count} for fp, count in repeated.items()]),
+                    use_container_width=True, hide_index=True)
+
+        if snapshot['queries']:
+            st.markdown("**Consultas por tempo total**")
+            df = pd.DataFrame(snapshot['queries']).rename(columns={
+                'fingerprint': 'consulta', 'count': 'execuções', 'total_ms': 'total (ms)',
+                'max_ms': 'máx (ms)', 'rows': 'linhas', 'bytes': 'bytes'})
+            st.dataframe(df.head(20), use_container_width=True, hide_index=True)
+
+        if snapshot['slow_queries']:
+            st.markdown("**Consultas lentas recentes**")
+            st.dataframe(pd.DataFrame(snapshot['slow_queries']).rename(columns={
+                'fingerprint': 'consulta', 'at': 'horário', 'rows': 'linhas'}),
+                use_container_width=True, hide_index=True)
+
+        if st.button("🔄 Zerar estatísticas"):
+            query_stats.reset()
+            st.rerun()
@@ -197,6 +197,18 @@ def app():
                     st.metric("Status", "Negado ❌")
                     st.markdown(f"**Data/Hora:** {resultado['data_hora'].strftime('%d/%m/%Y %H:%M:%S')}")
 
+        # Tempos por etapa da última tentativa (diagnóstico)
+        if st.checkbox("⏱️ Exibir tempos por etapa"):
+            face_recognition_controller = st.session_state.get('face_recognition_controller')
+            breakdown = face_recognition_controller.get_last_access_breakdown() if face_recognition_controller else None
+
+            if breakdown and breakdown['success']:
+                st.metric("Tempo total", f"{breakdown['data']['total_ms']:.1f} ms")
+                for etapa in breakdown['data']['stages']:
+                    st.markdown(f"- **{etapa['stage']}**: {etapa['ms']:.1f} ms ({etapa['percent']:.1f}%)")
+            else:
+                st.info("📭 Nenhuma medição disponível.")
+
         # Botão para tentar novamente
         st.markdown("<br>", unsafe_allow_html=True)
 
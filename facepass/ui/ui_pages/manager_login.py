@@ -1,5 +1,77 @@
+import json
 import streamlit as st
+import streamlit.components.v1 as components
 import time
+from facepass.services.session_token_service import SESSION_TTL_SECONDS
+
+# O token fica num cookie (fora da URL, do histórico e de links copiados)
+SESSION_COOKIE = "facepass_session"
+
+
+def write_session_cookie(token: str) -> None:
+    """Grava o cookie de sessão no navegador; token vazio apaga o cookie"""
+    max_age = SESSION_TTL_SECONDS if token else 0
+    components.html(f"""
+        <script>
+            const secure = window.parent.location.protocol === 'https:' ? '; Secure' : '';
+            window.parent.document.cookie = {json.dumps(SESSION_COOKIE)} + '=' + {json.dumps(token)}
+                + '; Path=/; Max-Age={max_age}; SameSite=Strict' + secure;
+        </script>
+    """, height=0)
+
+
+def store_manager_session(manager_data: dict) -> None:
+    """Armazena os dados do gestor autenticado na sessão"""
+    st.session_state['manager_authenticated'] = True
+    st.session_state['manager_id'] = manager_data['id']
+    st.session_state['manager_name'] = manager_data['name']
+    st.session_state['manager_email'] = manager_data['email']
+    st.session_state['manager_session_token'] = manager_data['session_token']
+
+
+def restore_session() -> None:
+    """Restaura a sessão do gestor após recarregar a página (sem bcrypt)"""
+    # Cookie pendente de login/logout: gravado numa execução sem st.rerun() logo em seguida
+    pending_cookie = st.session_state.pop('pending_session_cookie', None)
+    if pending_cookie is not None:
+        write_session_cookie(pending_cookie)
+
+    if st.session_state.get('manager_authenticated', False):
+        return
+
+    # st.context.cookies reflete a requisição que abriu a sessão: um token já
+    # recusado (expirado ou revogado) não é verificado de novo
+    session_token = st.context.cookies.get(SESSION_COOKIE)
+    manager_controller = st.session_state.get('manager_controller')
+
+    if not session_token or not manager_controller:
+        return
+    if session_token == st.session_state.get('rejected_session_token'):
+        return
+
+    result = manager_controller.restore_session(session_token)
+
+    if result['success']:
+        store_manager_session(result['data'])
+    else:
+        st.session_state['rejected_session_token'] = session_token
+        write_session_cookie('')
+
+
+def logout() -> None:
+    """Revoga os tokens do gestor no servidor e limpa a sessão e o cookie"""
+    manager_controller = st.session_state.get('manager_controller')
+    manager_id = st.session_state.get('manager_id')
+    if manager_controller and manager_id:
+        manager_controller.logout(manager_id)
+
+    st.session_state['rejected_session_token'] = st.session_state.get('manager_session_token')
+    st.session_state['manager_authenticated'] = False
+    st.session_state['manager_id'] = None
+    st.session_state['manager_name'] = None
+    st.session_state['manager_email'] = None
+    st.session_state['manager_session_token'] = None
+    st.session_state['pending_session_cookie'] = ''
 
 
 def app():
@@ -17,10 +89,7 @@ def app():
 
         with col1:
             if st.button("🚪 Fazer Logout", use_container_width=True):
-                st.session_state['manager_authenticated'] = False
-                st.session_state['manager_id'] = None
-                st.session_state['manager_name'] = None
-                st.session_state['manager_email'] = None
+                logout()
                 st.rerun()
 
         with col2:
@@ -86,11 +155,8 @@ def app():
 
             if result['success']:
                 # Login bem-sucedido - armazenar dados na sessão
-                manager_data = result['data']
-                st.session_state['manager_authenticated'] = True
-                st.session_state['manager_id'] = manager_data['id']
-                st.session_state['manager_name'] = manager_data['name']
-                st.session_state['manager_email'] = manager_data['email']
+                store_manager_session(result['data'])
+                st.session_state['pending_session_cookie'] = result['data']['session_token']
 
                 st.success(f"✅ {result['message']}")
                 st.balloons()
@@ -139,6 +205,8 @@ def app():
     with st.expander("🔒 Segurança"):
         st.markdown("""
             - As senhas são armazenadas usando hash bcrypt
+            - Tentativas de login falhas são limitadas por email
+            - A sessão expira automaticamente após algumas horas e é revogada no logout
             - Nunca compartilhe suas credenciais
             - Faça logout ao finalizar o uso
             - Utilize senhas fortes e únicas
@@ -1,5 +1,5 @@
 import streamlit as st
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
 
 def app():
@@ -23,6 +23,11 @@ def app():
         st.error("❌ Erro: Serviço de notificações indisponível.")
         return
 
+    # Mensagem da ação anterior: st.success seguido de st.rerun nunca chega a aparecer
+    flash = st.session_state.pop('notifications_flash', None)
+    if flash:
+        st.success(flash)
+
     # Obter estatísticas
     stats_result = notification_controller.get_statistics(manager_id)
 
@@ -61,13 +66,84 @@ def app():
         if st.button("🔄 Atualizar", use_container_width=True):
             st.rerun()
 
+    # Ações em massa (um único UPDATE/DELETE no banco)
+    with st.expander("🧹 Ações em Massa"):
+        if st.button("✓ Marcar todas como lidas", disabled=stats['unread'] == 0,
+                     use_container_width=True):
+            bulk_result = notification_controller.mark_all_as_read(manager_id)
+            if bulk_result['success']:
+                st.session_state['notifications_flash'] = f"✅ {bulk_result['message']}"
+                st.rerun()
+            else:
+                st.error(f"❌ {bulk_result['message']}")
+
+        st.markdown("**Marcar como lidas por tipo/período**")
+        col_bulk1, col_bulk2, col_bulk3 = st.columns(3)
+
+        with col_bulk1:
+            bulk_type = st.selectbox(
+                "Tipo",
+                ["Todos", "access_denied", "new_user_pending"],
+                format_func=lambda t: {
+                    "Todos": "Todos",
+                    "access_denied": "Acesso Negado",
+                    "new_user_pending": "Novo Cadastro Pendente"
+                }[t],
+                key="bulk_type"
+            )
+
+        with col_bulk2:
+            bulk_start = st.date_input(
+                "De", value=datetime.now() - timedelta(days=30), key="bulk_start")
+
+        with col_bulk3:
+            bulk_end = st.date_input("Até", value=datetime.now(), key="bulk_end")
+
+        if st.button("✓ Marcar filtradas como lidas", use_container_width=True):
+            bulk_result = notification_controller.mark_as_read_by_filter(
+                manager_id,
+                type_notification=None if bulk_type == "Todos" else bulk_type,
+                start_date=datetime.combine(bulk_start, time.min),
+                end_date=datetime.combine(bulk_end + timedelta(days=1), time.min)
+            )
+            if bulk_result['success']:
+                st.session_state['notifications_flash'] = f"✅ {bulk_result['message']}"
+                st.rerun()
+            else:
+                st.error(f"❌ {bulk_result['message']}")
+                for error in bulk_result['errors']:
+                    st.error(f"• {error}")
+
+        st.markdown("**Limpar notificações lidas antigas**")
+        col_del1, col_del2 = st.columns([2, 1])
+
+        with col_del1:
+            older_than_days = st.number_input(
+                "Remover lidas com mais de (dias)", min_value=0, value=30, step=1,
+                key="bulk_delete_days")
+
+        with col_del2:
+            st.markdown("<br>", unsafe_allow_html=True)
+            if st.button("🗑️ Remover", use_container_width=True):
+                bulk_result = notification_controller.delete_read_older_than(
+                    manager_id, int(older_than_days))
+                if bulk_result['success']:
+                    st.session_state['notifications_flash'] = f"✅ {bulk_result['message']}"
+                    st.rerun()
+                else:
+                    st.error(f"❌ {bulk_result['message']}")
+
     st.markdown("---")
 
-    # Buscar notificações baseado no filtro
-    if filter_type == "Não Lidas":
-        result = notification_controller.list_unread_notifications(manager_id)
-    else:
-        result = notification_controller.list_all_notifications(manager_id)
+    # Paginação por keyset: pilha de cursores por filtro
+    if st.session_state.get('notif_cursor_filter') != filter_type:
+        st.session_state['notif_cursor_filter'] = filter_type
+        st.session_state['notif_cursors'] = [None]
+
+    cursors = st.session_state['notif_cursors']
+
+    result = notification_controller.list_notifications_page(
+        manager_id, status=filter_type, cursor=cursors[-1])
 
     if not result['success']:
         st.error(f"❌ {result['message']}")
@@ -76,16 +152,13 @@ def app():
         return
 
     notifications = result['data']
-
-    # Aplicar filtro de "Lidas" se necessário
-    if filter_type == "Lidas":
-        notifications = [n for n in notifications if n['is_read']]
+    next_cursor = result['next_cursor']
 
     if not notifications:
         st.info("📭 Nenhuma notificação no momento.")
     else:
         st.success(
-            f"📬 **{len(notifications)} notificação(ões) encontrada(s)**")
+            f"📬 **Página {len(cursors)} - {len(notifications)} notificação(ões)**")
 
         for notif in notifications:
             notif_id = notif['id']
@@ -173,7 +246,7 @@ def app():
                                     notif_id)
 
                                 if mark_result['success']:
-                                    st.success("✅ Marcada como lida!")
+                                    st.session_state['notifications_flash'] = "✅ Marcada como lida!"
                                     st.rerun()
                                 else:
                                     st.error(f"❌ {mark_result['message']}")
@@ -190,7 +263,7 @@ def app():
                                     notif_id)
 
                                 if delete_result['success']:
-                                    st.success("✅ Notificação removida!")
+                                    st.session_state['notifications_flash'] = "✅ Notificação removida!"
                                     del st.session_state[f'confirm_delete_notif_{notif_id}']
                                     st.rerun()
                                 else:
@@ -201,6 +274,22 @@ def app():
 
                 st.markdown("<br>", unsafe_allow_html=True)
 
+    # Navegação entre páginas
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+
+    with col_prev:
+        if st.button("⬅️ Anterior", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+
+    with col_page:
+        st.caption(f"Página {len(cursors)}")
+
+    with col_next:
+        if st.button("Próxima ➡️", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
+
     st.markdown("---")
 
     # Informações sobre notificações
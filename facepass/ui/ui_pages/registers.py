@@ -114,14 +114,21 @@ def app():
 
     with col_export1:
         if registros and st.button("📥 Exportar CSV", width='stretch'):
-            # Gerar CSV dos registros
-            csv_content = access_controller.export_registers_csv(registros)
-            st.download_button(
-                label="⬇️ Download CSV",
-                data=csv_content,
-                file_name=f"relatorio_acessos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+            # Gerar CSV dos registros (lidos em streaming com os mesmos filtros e
+            # escritos linha a linha em um buffer, sem montar a string inteira)
+            with access_controller.export_registers_csv_by_filters(
+                user_name=filter_user,
+                status=filter_status,
+                location=filter_location,
+                start_date=filter_date_start.strftime('%Y-%m-%d'),
+                end_date=filter_date_end.strftime('%Y-%m-%d')
+            ) as csv_file:
+                st.download_button(
+                    label="⬇️ Download CSV",
+                    data=csv_file,
+                    file_name=f"relatorio_acessos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
         elif not registros:
             st.button("📥 Exportar CSV", width='stretch', disabled=True)
 
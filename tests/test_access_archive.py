@@ -0,0 +1,59 @@
+"""
+Leitura do arquivo morto dos registros de acesso (sem MySQL).
+"""
+from datetime import datetime
+import pytest
+
+pytest.importorskip("dotenv")
+
+from facepass.database.repository.access_archive import AccessArchive
+
+
+def register(register_id, created_at, image=None):
+    return {
+        'id': register_id,
+        'user_id': 7,
+        'created_at': created_at,
+        'type_access': 'entrada',
+        'access_allowed': True,
+        'reason_denied': None,
+        'captured_image': image
+    }
+
+
+def write_part(archive, part_id, rows):
+    writer = archive.open_part('2024-01', part_id)
+    for row in rows:
+        writer.write(row)
+    writer.close()
+
+
+def test_read_period_returns_rows_and_images(tmp_path):
+    archive = AccessArchive(str(tmp_path))
+    write_part(archive, '1', [register(1, datetime(2024, 1, 5, 8), b'jpeg-1'),
+                              register(2, datetime(2024, 1, 20, 18))])
+
+    rows = archive.read_period(datetime(2024, 1, 1), datetime(2024, 1, 10))
+
+    assert [row['id'] for row in rows] == [1]
+    assert rows[0]['captured_image'] == b'jpeg-1'
+
+
+def test_read_period_dedups_ids_from_interrupted_runs(tmp_path):
+    archive = AccessArchive(str(tmp_path))
+    # A segunda execução republica os ids que a primeira não chegou a apagar
+    write_part(archive, '1', [register(1, datetime(2024, 1, 5)), register(2, datetime(2024, 1, 6))])
+    write_part(archive, '2', [register(2, datetime(2024, 1, 6)), register(3, datetime(2024, 1, 7))])
+
+    rows = archive.read_period(datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+    assert sorted(row['id'] for row in rows) == [1, 2, 3]
+
+
+def test_unpublished_part_is_not_read(tmp_path):
+    archive = AccessArchive(str(tmp_path))
+    writer = archive.open_part('2024-01', '1')
+    writer.write(register(1, datetime(2024, 1, 5)))
+    writer.abort()
+
+    assert archive.read_period(datetime(2024, 1, 1), datetime(2024, 2, 1)) == []
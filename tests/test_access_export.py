@@ -0,0 +1,60 @@
+"""
+Exportação CSV dos registros de acesso em streaming (sem MySQL).
+"""
+from datetime import datetime
+import pytest
+
+pytest.importorskip("bcrypt")
+pytest.importorskip("mysql.connector")
+pytest.importorskip("dotenv")
+
+from facepass.controllers.access_controller import AccessController
+
+
+class StreamingAccessService:
+    """Entrega os registros um a um, como o iter_query do repositório"""
+
+    def __init__(self, registers):
+        self.registers = registers
+        self.filters = None
+        self.consumed = 0
+
+    def iter_registers_by_filters(self, filters):
+        self.filters = filters
+        for register in self.registers:
+            self.consumed += 1
+            yield register
+
+
+def register(register_id, allowed=True):
+    return {'id': register_id, 'user_name': f'U{register_id}', 'created_at': datetime(2024, 5, 10, 9, 30),
+            'access_allowed': allowed, 'type_access': 'entrada', 'reason_denied': '' if allowed else 'Fora do horário'}
+
+
+def test_csv_lines_are_generated_lazily():
+    service = StreamingAccessService([register(1), register(2)])
+    lines = AccessController(service).iter_registers_csv(service.iter_registers_by_filters({}))
+
+    assert next(lines).startswith("ID,Usuario")
+    assert next(lines) == "1,U1,10/05/2024 09:30:00,Permitido,entrada,\n"
+    assert service.consumed == 1
+
+
+def test_export_by_filters_returns_buffer_for_download():
+    service = StreamingAccessService([register(1), register(2, allowed=False)])
+
+    csv_file = AccessController(service).export_registers_csv_by_filters(status='Negado', start_date='2024-05-10')
+
+    assert service.filters['status'] == 'Negado'
+    assert csv_file.read().decode('utf-8').splitlines() == [
+        "ID,Usuario,Data/Hora,Status,Tipo Acesso,Motivo Negacao",
+        "1,U1,10/05/2024 09:30:00,Permitido,entrada,",
+        "2,U2,10/05/2024 09:30:00,Negado,entrada,Fora do horário",
+    ]
+
+
+def test_export_without_registers():
+    controller = AccessController(StreamingAccessService([]))
+
+    assert controller.export_registers_csv_by_filters().read() == "Nenhum registro disponivel".encode('utf-8')
+    assert controller.export_registers_csv([]) == "Nenhum registro disponivel"
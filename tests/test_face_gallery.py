@@ -0,0 +1,73 @@
+"""
+Galeria de encodings em memória (FaceGallery) com um repositório stand-in.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("dotenv")
+
+from facepass.models.faceEncoding import FaceEncoding
+from facepass.services.face_gallery import FaceGallery
+
+
+class InMemoryRepository:
+    def __init__(self, encodings):
+        self.encodings = encodings
+        self.loads = 0
+
+    def get_encodings_signature(self):
+        return (len(self.encodings), max((e.id for e in self.encodings), default=0))
+
+    def get_all_encodings(self):
+        self.loads += 1
+        return list(self.encodings)
+
+
+def encoding(user_id, value):
+    return FaceEncoding(user_id, np.full(128, value, dtype=np.float64), id=user_id)
+
+
+def test_search_returns_closest_user_and_distance():
+    gallery = FaceGallery(check_seconds=0, max_age_seconds=300)
+    gallery.ensure_fresh(InMemoryRepository([encoding(1, 0.0), encoding(2, 1.0)]))
+
+    user_id, distance = gallery.search(np.full(128, 0.9))
+
+    assert user_id == 2
+    assert distance == pytest.approx(np.sqrt(128 * 0.01))
+
+
+def test_empty_gallery_has_no_match():
+    gallery = FaceGallery(check_seconds=0)
+    gallery.ensure_fresh(InMemoryRepository([]))
+
+    assert len(gallery) == 0
+    assert gallery.search(np.zeros(128)) is None
+
+
+def test_reloads_only_when_signature_changes():
+    repository = InMemoryRepository([encoding(1, 0.0)])
+    gallery = FaceGallery(check_seconds=0, max_age_seconds=300)
+
+    gallery.ensure_fresh(repository)
+    gallery.ensure_fresh(repository)
+    assert repository.loads == 1
+
+    repository.encodings.append(encoding(2, 1.0))
+    gallery.ensure_fresh(repository)
+    assert repository.loads == 2
+    assert len(gallery) == 2
+
+
+def test_check_interval_and_invalidate():
+    repository = InMemoryRepository([encoding(1, 0.0)])
+    gallery = FaceGallery(check_seconds=3600, max_age_seconds=3600)
+    gallery.ensure_fresh(repository)
+
+    repository.encodings.append(encoding(2, 1.0))
+    gallery.ensure_fresh(repository)
+    assert len(gallery) == 1
+
+    gallery.invalidate()
+    gallery.ensure_fresh(repository)
+    assert len(gallery) == 2
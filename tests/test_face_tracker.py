@@ -0,0 +1,63 @@
+"""
+Rastreamento de rostos entre quadros (FaceTracker) com caixas sintéticas.
+"""
+from facepass.services.face_tracker import FaceTracker, iou
+
+
+def box(left, top, size=100):
+    """Caixa quadrada no formato (top, right, bottom, left)"""
+    return (top, left + size, top + size, left)
+
+
+def test_iou():
+    assert iou(box(0, 0), box(0, 0)) == 1.0
+    assert iou(box(0, 0), box(200, 0)) == 0.0
+    assert iou(box(0, 0), box(50, 0)) == 5000 / 15000
+
+
+def test_small_moves_keep_the_track_by_iou():
+    tracker = FaceTracker()
+    (first,), _ = tracker.update([box(0, 0)], 0)
+    (second,), _ = tracker.update([box(20, 10)], 1)
+
+    assert second is first
+    assert first.box == box(20, 10) and first.last_seen == 1
+
+
+def test_centroid_fallback_when_overlap_is_below_threshold():
+    tracker = FaceTracker(iou_threshold=0.3, max_centroid_distance=0.5)
+    (first,), _ = tracker.update([box(0, 0)], 0)
+
+    # IoU ~0.27, centroide a ~0.49 largura de caixa
+    moved = box(35, 35)
+    assert iou(first.box, moved) < 0.3
+    (second,), _ = tracker.update([moved], 1)
+    assert second is first
+
+    # Longe demais: nova trilha
+    active, _ = tracker.update([box(400, 400)], 2)
+    assert active[0].id != first.id
+
+
+def test_two_faces_are_matched_to_their_own_tracks():
+    tracker = FaceTracker()
+    active, _ = tracker.update([box(0, 0), box(300, 0)], 0)
+    ids = {track.box[3]: track.id for track in active}
+
+    active, _ = tracker.update([box(310, 5), box(10, 5)], 1)
+
+    assert {track.box[3]: track.id for track in active} == {310: ids[300], 10: ids[0]}
+
+
+def test_track_expires_after_max_missed_frames():
+    tracker = FaceTracker(max_missed=2)
+    (track,), _ = tracker.update([box(0, 0)], 0)
+
+    assert tracker.update([], 1) == ([], [])
+    assert tracker.update([], 2) == ([], [])
+    active, ended = tracker.update([], 3)
+
+    assert ended == [track] and track.missed == 3
+    assert tracker.tracks == {}
+    (reopened,), _ = tracker.update([box(0, 0)], 4)
+    assert reopened.id != track.id
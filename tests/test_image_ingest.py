@@ -0,0 +1,80 @@
+"""
+Etapa de ingestão de imagens (decode_image): limites, redução e orientação.
+"""
+import io
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("dotenv")
+
+from facepass.services.image_ingest import InvalidImageError, decode_image, target_size
+
+
+def encode(size, fmt='JPEG', exif=None):
+    image = Image.new('RGB', size, (200, 120, 40))
+    buffer = io.BytesIO()
+    if exif is not None:
+        image.save(buffer, fmt, exif=exif)
+    else:
+        image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_target_size_keeps_aspect_and_never_upscales():
+    assert target_size((4000, 3000), 1280) == (1280, 960)
+    assert target_size((640, 480), 1280) == (640, 480)
+
+
+def test_rejects_payload_over_byte_limit():
+    with pytest.raises(InvalidImageError, match="MB"):
+        decode_image(b'\xff' * (2 * 1024 * 1024 + 1), max_bytes=2 * 1024 * 1024)
+
+
+def test_rejects_resolution_over_pixel_limit_before_decoding(monkeypatch):
+    data = encode((400, 300))
+    monkeypatch.setattr(Image.Image, 'load', lambda self: pytest.fail("decodificou a imagem"))
+
+    with pytest.raises(InvalidImageError, match="400x300"):
+        decode_image(data, max_pixels=100_000)
+
+
+def test_jpeg_is_downscaled_by_draft(monkeypatch):
+    from PIL.JpegImagePlugin import JpegImageFile
+
+    decoded_sizes = []
+    original_draft = JpegImageFile.draft
+
+    def spy(self, mode, size):
+        result = original_draft(self, mode, size)
+        decoded_sizes.append(self.size)
+        return result
+
+    monkeypatch.setattr(JpegImageFile, 'draft', spy)
+
+    image = decode_image(encode((2000, 1000)), max_side=250)
+
+    # Escala DCT de 1/8: o libjpeg já entrega 250x125, sem decodificar 2000x1000
+    assert decoded_sizes[0] == (250, 125)
+    assert image.shape == (125, 250, 3) and image.dtype == np.uint8
+
+
+def test_other_formats_are_decoded_and_reduced():
+    image = decode_image(encode((1000, 500), fmt='PNG'), max_side=200)
+
+    assert image.shape == (100, 200, 3)
+
+
+def test_exif_orientation_is_applied():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotacionar 90° no sentido horário
+
+    image = decode_image(encode((200, 100), exif=exif), max_side=1280)
+
+    assert image.shape == (200, 100, 3)
+
+
+@pytest.mark.parametrize('data', [b'', b'not an image', encode((800, 600))[:400]])
+def test_invalid_or_truncated_input_raises(data):
+    with pytest.raises(InvalidImageError):
+        decode_image(data)
@@ -0,0 +1,79 @@
+"""
+Limite de tentativas de login e revogação de tokens de sessão (sem MySQL).
+"""
+import pytest
+
+pytest.importorskip("bcrypt")
+pytest.importorskip("mysql.connector")
+pytest.importorskip("dotenv")
+
+from facepass.services.manager_service import LoginRateLimiter, ManagerService
+from facepass.services.session_token_service import SessionTokenService
+
+
+class InMemoryManagerRepository:
+    def __init__(self):
+        self.managers = {}
+
+    def get_manager_by_email(self, email):
+        return next((dict(m) for m in self.managers.values() if m['email'] == email), None)
+
+    def get_manager_by_id(self, manager_id):
+        manager = self.managers.get(manager_id)
+        return dict(manager) if manager else None
+
+    def get_session_version(self, manager_id):
+        manager = self.managers.get(manager_id)
+        return manager['session_version'] if manager else None
+
+    def increment_session_version(self, manager_id):
+        self.managers[manager_id]['session_version'] += 1
+
+    def update_manager(self, manager_id, manager_data):
+        self.managers[manager_id].update(manager_data)
+
+
+@pytest.fixture
+def service():
+    repository = InMemoryManagerRepository()
+    repository.managers[1] = {
+        'id': 1, 'name': 'Admin', 'email': 'admin@facepass.com',
+        'password_hash': ManagerService.hash_password('admin123'), 'session_version': 0
+    }
+    return ManagerService(repository, SessionTokenService('segredo'), LoginRateLimiter(3, 60))
+
+
+def test_rate_limiter_forgets_emails_outside_window(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr('facepass.services.manager_service.time.monotonic', lambda: clock[0])
+    limiter = LoginRateLimiter(max_failures=2, window_seconds=10)
+
+    assert limiter.retry_after('nunca@falhou.com') == 0.0
+    assert limiter._failures == {}
+
+    limiter.register_failure('A@x.com')
+    limiter.register_failure('a@x.com')
+    assert limiter.retry_after('a@x.com') == pytest.approx(10.0)
+
+    clock[0] += 11
+    assert limiter.retry_after('a@x.com') == 0.0
+    assert limiter._failures == {}
+
+
+def test_unknown_email_still_runs_bcrypt(service, monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, '_verify_password_bounded', lambda password, hashed: calls.append(hashed))
+
+    assert service.authenticate('ninguem@facepass.com', 'qualquer') is None
+    assert len(calls) == 1
+
+
+def test_revoked_token_is_rejected(service):
+    gestor = service.authenticate('admin@facepass.com', 'admin123')
+    token = service.issue_session_token(gestor)
+    assert service.validate_session_token(token)['id'] == 1
+
+    service.revoke_sessions(1)
+
+    assert service.validate_session_token(token) is None
+    assert service.validate_session_token(service.issue_session_token(gestor)) is not None
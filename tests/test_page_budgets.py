@@ -0,0 +1,92 @@
+"""
+Orçamentos de consultas e de latência por página do Streamlit.
+
+Cada página é renderizada com streamlit.testing.v1.AppTest contra o banco
+configurado no .env (popule-o antes, ex.: seed_database) e o teste falha se
+a renderização exceder o número de consultas ou o tempo configurados.
+
+    python -m facepass.database.setup_database.seed_database
+    pytest tests/test_page_budgets.py
+
+PAGE_BUDGET_LATENCY_FACTOR multiplica os limites de tempo (ex.: 3 em CI lento).
+"""
+import os
+import pytest
+
+pytest.importorskip("streamlit")
+mysql_connector = pytest.importorskip("mysql.connector")
+dotenv = pytest.importorskip("dotenv")
+
+from streamlit.testing.v1 import AppTest
+
+dotenv.load_dotenv()
+
+LATENCY_FACTOR = float(os.getenv('PAGE_BUDGET_LATENCY_FACTOR', '1'))
+
+# página -> (máximo de consultas, máximo de ms) por renderização
+PAGE_BUDGETS = {
+    'dashboard': (20, 1500),
+    'registers': (5, 800),
+    'notifications': (6, 800),
+    'approve_registration': (4, 500),
+}
+
+
+def render_page_with_budget(page_name):
+    """Script executado pelo AppTest: inicializa os serviços e mede a renderização da página"""
+    import importlib
+    import time
+    import streamlit as st
+    from facepass.services.init_services import init_services
+    from facepass.database.setup_database.query_instrumentation import query_stats
+
+    init_services()
+    st.session_state['manager_authenticated'] = True
+    st.session_state.setdefault('manager_id', 1)
+    st.session_state.setdefault('manager_name', 'Gestor de Teste')
+
+    query_stats.enable()
+    page = importlib.import_module(f'facepass.ui.ui_pages.{page_name}')
+
+    with query_stats.scope(page_name) as scope:
+        start = time.perf_counter()
+        page.app()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    st.session_state['budget_result'] = {
+        'queries': scope.count,
+        'ms': elapsed_ms,
+        'repeated': scope.repeated()
+    }
+
+
+@pytest.fixture(scope="module", autouse=True)
+def require_database():
+    try:
+        conn = mysql_connector.connect(
+            host=os.getenv('DB_HOST', 'localhost'),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', ''),
+            database=os.getenv('DB_NAME', 'facepass_db'),
+            port=int(os.getenv('DB_PORT', '3306'))
+        )
+    except mysql_connector.Error as e:
+        pytest.skip(f"Banco de dados indisponível: {e}")
+    conn.close()
+
+
+@pytest.mark.parametrize("page_name", sorted(PAGE_BUDGETS))
+def test_page_within_budget(page_name):
+    max_queries, max_ms = PAGE_BUDGETS[page_name]
+
+    app_test = AppTest.from_function(render_page_with_budget, args=(page_name,), default_timeout=30)
+    app_test.run()
+
+    assert not app_test.exception, f"{page_name} lançou exceção: {app_test.exception}"
+
+    result = app_test.session_state['budget_result']
+    assert result['queries'] <= max_queries, (
+        f"{page_name}: {result['queries']} consultas (orçamento {max_queries}); "
+        f"repetidas: {result['repeated']}")
+    assert result['ms'] <= max_ms * LATENCY_FACTOR, (
+        f"{page_name}: {result['ms']:.0f} ms (orçamento {max_ms * LATENCY_FACTOR:.0f} ms)")
@@ -0,0 +1,84 @@
+"""
+Migração de accessRegisters para partições, com um cursor stand-in (sem MySQL).
+"""
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("dotenv")
+
+from facepass.database.setup_database.partition_maintenance import migrate_to_partitions
+
+FOREIGN_KEYS = [
+    ('accessRegisters', 'fk_register_user', 'users', 'CASCADE', 'SET NULL', 'user_id', 'id'),
+    ('notifications', 'fk_notification_register', 'accessRegisters', 'CASCADE', 'SET NULL',
+     'access_register_id', 'id'),
+]
+
+
+class FakeCursor:
+    def __init__(self, null_dates=0, orphans=0, fail_on=None):
+        self.null_dates = null_dates
+        self.orphans = orphans
+        self.fail_on = fail_on
+        self.statements = []
+        self._result = []
+
+    def execute(self, query, params=()):
+        text = " ".join(query.split())
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError(f"falha simulada: {self.fail_on}")
+        self.statements.append(text)
+
+        if 'information_schema.partitions' in text:
+            self._result = [(0,)]
+        elif 'information_schema.referential_constraints' in text:
+            self._result = list(FOREIGN_KEYS)
+        elif 'created_at IS NULL' in text:
+            self._result = [(self.null_dates,)]
+        elif 'NOT EXISTS' in text:
+            self._result = [(self.orphans,)]
+        elif 'MIN(created_at)' in text:
+            self._result = [(None,)]
+        else:
+            self._result = []
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+    def alters(self):
+        return [statement for statement in self.statements if statement.startswith('ALTER')]
+
+
+def test_preconditions_abort_before_any_change():
+    cursor = FakeCursor(null_dates=2, orphans=1)
+
+    with pytest.raises(RuntimeError, match="nada foi alterado"):
+        migrate_to_partitions(cursor, 'facepass_db')
+
+    assert cursor.alters() == []
+
+
+def test_failed_partitioning_restores_foreign_keys():
+    cursor = FakeCursor(fail_on='PARTITION BY RANGE')
+
+    with pytest.raises(RuntimeError, match="falha simulada"):
+        migrate_to_partitions(cursor, 'facepass_db')
+
+    restored = [statement for statement in cursor.alters() if 'ADD CONSTRAINT' in statement]
+    assert len(restored) == 2
+    assert 'ADD CONSTRAINT fk_register_user FOREIGN KEY (user_id) REFERENCES users (id)' in restored[0]
+    assert 'ON DELETE SET NULL' in restored[1]
+
+
+def test_successful_migration_drops_foreign_keys_and_partitions():
+    cursor = FakeCursor()
+
+    migrate_to_partitions(cursor, 'facepass_db', months_ahead=1)
+
+    alters = cursor.alters()
+    assert sum('DROP FOREIGN KEY' in statement for statement in alters) == 2
+    assert 'PARTITION BY RANGE' in alters[-1]
+    assert not any('ADD CONSTRAINT' in statement for statement in alters)
@@ -0,0 +1,198 @@
+"""
+Estado de presença do dia mantido pelo PresenceTracker (sem MySQL).
+"""
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("dotenv")
+
+from facepass.models.registerAccess import RegistroAcesso
+from facepass.services.presence_tracker import PresenceTracker, UserPresence
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class FakeAccessTable:
+    """Registros de acesso confirmados, consultados como o DashboardRepository faria"""
+
+    def __init__(self):
+        self.rows = []
+
+    def commit(self, register_id, user_id, created_at, type_access='entrada', access_allowed=True):
+        self.rows.append({'id': register_id, 'user_id': user_id, 'created_at': created_at,
+                          'type_access': type_access, 'access_allowed': access_allowed})
+
+    def snapshot(self, day, settled_before):
+        users = {}
+        for row in self.rows:
+            if row['created_at'].strftime('%Y-%m-%d') != day or row['created_at'] >= settled_before:
+                continue
+            user = users.setdefault(row['user_id'], {'user_id': row['user_id'], 'last_entry': None,
+                                                     'last_exit': None, 'total_accesses': 0})
+            user['total_accesses'] += 1
+            column = 'last_entry' if row['type_access'] == 'entrada' else 'last_exit'
+            if row['access_allowed'] and (user[column] is None or row['created_at'] > user[column]):
+                user[column] = row['created_at']
+        return list(users.values())
+
+    def since(self, since, day):
+        return sorted((row for row in self.rows
+                       if row['created_at'] >= since and row['created_at'].strftime('%Y-%m-%d') == day),
+                      key=lambda row: row['id'])
+
+
+def attendance(tracker, *user_ids):
+    users = [{'id': user_id, 'name': f'U{user_id}', 'position': None, 'email': None} for user_id in user_ids]
+    return {row['id']: row for row in tracker.build_attendance(users)}
+
+
+@pytest.fixture
+def setup():
+    clock = Clock(datetime(2024, 5, 10, 9, 0, 0))
+    table = FakeAccessTable()
+    tracker = PresenceTracker(settle_seconds=60, now=clock)
+    return clock, table, tracker
+
+
+def refresh(tracker, table):
+    tracker.ensure_seeded(table.snapshot)
+    tracker.catch_up(table.since)
+
+
+def test_catch_up_applies_lower_id_committed_late(setup):
+    clock, table, tracker = setup
+    refresh(tracker, table)
+
+    # Transação do id 2 é confirmada antes da do id 1 (workers concorrentes)
+    table.commit(2, user_id=20, created_at=clock.now)
+    clock.now += timedelta(seconds=1)
+    refresh(tracker, table)
+
+    table.commit(1, user_id=10, created_at=clock.now - timedelta(seconds=1))
+    clock.now += timedelta(seconds=5)
+    refresh(tracker, table)
+
+    rows = attendance(tracker, 10, 20)
+    assert rows[10]['status'] == 'Presente'
+    assert rows[20]['status'] == 'Presente'
+
+
+def test_catch_up_does_not_double_count_the_trailing_window(setup):
+    clock, table, tracker = setup
+    refresh(tracker, table)
+
+    table.commit(1, user_id=10, created_at=clock.now)
+    for _ in range(5):
+        clock.now += timedelta(seconds=10)
+        refresh(tracker, table)
+
+    assert attendance(tracker, 10)[10]['access_count'] == 1
+
+
+def test_seeding_counts_settled_rows_once(setup):
+    clock, table, tracker = setup
+    table.commit(1, user_id=10, created_at=clock.now - timedelta(hours=1))
+    # Ainda dentro da janela de confirmação: fica para o catch_up
+    table.commit(2, user_id=10, created_at=clock.now - timedelta(seconds=10), type_access='saida')
+
+    refresh(tracker, table)
+    refresh(tracker, table)
+
+    row = attendance(tracker, 10)[10]
+    assert row['access_count'] == 2
+    assert row['status'] == 'Saiu'
+
+
+def registro(register_id, user_id, created_at, type_access='entrada', access_allowed=True):
+    return RegistroAcesso(register_id, user_id, created_at, type_access, access_allowed)
+
+
+def test_user_presence_apply_keeps_latest_allowed_times():
+    presence = UserPresence()
+    assert presence.status == 'Ausente'
+
+    entry = datetime(2024, 5, 10, 8, 0)
+    presence.apply('entrada', True, entry)
+    presence.apply('entrada', True, entry - timedelta(hours=1))
+    assert presence.last_entry == entry
+    assert presence.status == 'Presente'
+
+    presence.apply('saida', False, entry + timedelta(hours=1))
+    assert presence.last_exit is None
+    assert presence.status == 'Presente'
+
+    presence.apply('saida', True, entry + timedelta(hours=2))
+    assert presence.status == 'Saiu'
+    assert presence.access_count == 4
+
+
+def test_ensure_seeded_loads_once_per_day_with_settle_limit(setup):
+    clock, table, tracker = setup
+    calls = []
+
+    def loader(day, settled_before):
+        calls.append((day, settled_before))
+        return [{'user_id': 10, 'last_entry': clock.now - timedelta(hours=1), 'last_exit': None,
+                 'total_accesses': 3}, {'user_id': None, 'last_entry': None, 'last_exit': None,
+                                        'total_accesses': 1}]
+
+    tracker.ensure_seeded(loader)
+    tracker.ensure_seeded(loader)
+
+    assert calls == [('2024-05-10', clock.now - timedelta(seconds=60))]
+    row = attendance(tracker, 10, 20)
+    assert (row[10]['status'], row[10]['access_count']) == ('Presente', 3)
+    assert row[20]['status'] == 'Ausente'
+
+
+def test_record_and_catch_up_count_the_same_id_once(setup):
+    clock, table, tracker = setup
+    refresh(tracker, table)
+
+    table.commit(1, user_id=10, created_at=clock.now)
+    tracker.record(registro(1, 10, clock.now))
+    tracker.record(registro(1, 10, clock.now))
+    clock.now += timedelta(seconds=5)
+    refresh(tracker, table)
+
+    assert attendance(tracker, 10)[10]['access_count'] == 1
+
+
+def test_catch_up_sees_registers_from_other_processes(setup):
+    clock, table, tracker = setup
+    refresh(tracker, table)
+
+    # Gravado pela API de quiosques: record() deste processo nunca é chamado
+    table.commit(1, user_id=10, created_at=clock.now)
+    table.commit(2, user_id=10, created_at=clock.now + timedelta(seconds=1), type_access='saida')
+    clock.now += timedelta(seconds=2)
+    refresh(tracker, table)
+
+    assert attendance(tracker, 10)[10]['status'] == 'Saiu'
+
+
+def test_day_rollover_reseeds_and_ignores_previous_day(setup):
+    clock, table, tracker = setup
+    refresh(tracker, table)
+    table.commit(1, user_id=10, created_at=clock.now)
+    tracker.record(registro(1, 10, clock.now))
+    assert attendance(tracker, 10)[10]['status'] == 'Presente'
+
+    clock.now = datetime(2024, 5, 11, 7, 0)
+    refresh(tracker, table)
+    # Registro atrasado do dia anterior não entra no novo dia
+    tracker.record(registro(2, 20, datetime(2024, 5, 10, 23, 59)))
+
+    rows = attendance(tracker, 10, 20)
+    assert rows[10]['status'] == 'Ausente' and rows[10]['access_count'] == 0
+    assert rows[20]['access_count'] == 0
+
+    table.commit(3, user_id=10, created_at=clock.now)
+    tracker.record(registro(3, 10, clock.now))
+    assert attendance(tracker, 10)[10]['status'] == 'Presente'
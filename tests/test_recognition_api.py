@@ -0,0 +1,177 @@
+"""
+API HTTP de reconhecimento com workers stand-in (sem MySQL nem dlib).
+"""
+import asyncio
+import json
+import pytest
+
+pytest.importorskip("dotenv")
+
+from facepass.api.recognition_server import (
+    HttpError, MAX_BODY_BYTES, RecognitionApi, is_loopback, read_request, serve
+)
+
+
+class StubWorkers:
+    """Substitui o pool de processos: registra as chamadas e responde na hora"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def run(self, method, *args):
+        self.calls.append((method, args))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return {'success': True, 'message': method, 'data': None, 'errors': []}
+
+    def health(self):
+        return {'workers': 1, 'gallery_size': 3, 'prefilter': {'checked': 0, 'rejected': 0, 'reject_rate': 0.0}}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def parse(raw: bytes):
+    reader = asyncio.StreamReader()
+    reader.feed_data(raw)
+    reader.feed_eof()
+    return await read_request(reader)
+
+
+async def exchange(api: RecognitionApi, raw: bytes):
+    """Envia uma requisição crua a um servidor local e retorna (status, corpo JSON)"""
+    server = await asyncio.start_server(api.handle_connection, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        body = json.loads(await reader.readexactly(length))
+        writer.close()
+    return status, body
+
+
+def post(path: str, body: bytes, content_type: str = 'image/jpeg', token: str = '') -> bytes:
+    head = f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+    if token:
+        head += f"Authorization: Bearer {token}\r\n"
+    return head.encode('latin-1') + b"\r\n" + body
+
+
+def multipart(*images: bytes) -> tuple:
+    boundary = 'fronteira'
+    parts = b''.join(
+        (f"--{boundary}\r\nContent-Disposition: form-data; name=\"foto{i}\"; filename=\"{i}.jpg\"\r\n"
+         f"Content-Type: image/jpeg\r\n\r\n").encode() + image + b"\r\n"
+        for i, image in enumerate(images))
+    return parts + f"--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def test_read_request_parses_line_headers_query_and_body():
+    request = run(parse(post('/access?manager_id=7&location=Portaria%20B', b'jpeg')))
+
+    assert request.method == 'POST'
+    assert request.path == '/access'
+    assert request.int_param('manager_id') == 7
+    assert request.query['location'] == 'Portaria B'
+    assert request.images() == [b'jpeg']
+
+
+@pytest.mark.parametrize('length, status', [('-1', 400), ('abc', 400), (str(MAX_BODY_BYTES + 1), 413)])
+def test_read_request_rejects_bad_content_length(length, status):
+    raw = f"POST /access HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+
+    with pytest.raises(HttpError) as error:
+        run(parse(raw))
+    assert error.value.status == status
+
+
+def test_multipart_images_are_extracted():
+    body, content_type = multipart(b'primeira', b'segunda')
+    request = run(parse(post('/access/batch', body, content_type)))
+
+    assert request.images() == [b'primeira', b'segunda']
+
+
+def test_unsupported_content_type_is_415():
+    request = run(parse(post('/access', b'{}', 'application/json')))
+
+    with pytest.raises(HttpError) as error:
+        request.images()
+    assert error.value.status == 415
+
+
+def test_access_is_dispatched_to_workers():
+    workers = StubWorkers()
+    status, body = run(exchange(RecognitionApi(workers, 1, 1.0, token=''), post('/access?manager_id=3', b'img')))
+
+    assert status == 200
+    assert workers.calls == [('process_access_attempt', (b'img', 3, 'Entrada Principal'))]
+
+
+def test_missing_or_wrong_token_is_401():
+    workers = StubWorkers()
+    api = RecognitionApi(workers, 1, 1.0, token='segredo')
+
+    assert run(exchange(api, post('/verify?user_id=1', b'img')))[0] == 401
+    assert run(exchange(api, post('/verify?user_id=1', b'img', token='outro')))[0] == 401
+    assert run(exchange(api, post('/verify?user_id=1', b'img', token='segredo')))[0] == 200
+    assert len(workers.calls) == 1
+
+
+def test_busy_server_answers_503_after_queue_timeout():
+    async def scenario():
+        api = RecognitionApi(StubWorkers(delay=0.5), max_concurrency=1, queue_timeout=0.05, token='')
+        return await asyncio.gather(exchange(api, post('/access', b'a')), exchange(api, post('/access', b'b')))
+
+    statuses = sorted(status for status, _ in run(scenario()))
+    assert statuses == [200, 503]
+
+
+def test_batch_over_limit_is_413():
+    body, content_type = multipart(*[b'x'] * 33)
+    status, _ = run(exchange(RecognitionApi(StubWorkers(), 1, 1.0, token=''),
+                             post('/access/batch', body, content_type)))
+
+    assert status == 413
+
+
+def test_health_reports_worker_telemetry():
+    raw = b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"
+    status, body = run(exchange(RecognitionApi(StubWorkers(), 1, 1.0, token=''), raw))
+
+    assert status == 200
+    assert body['status'] == 'ok' and body['gallery_size'] == 3
+
+
+def test_public_bind_requires_token():
+    assert is_loopback('127.0.0.1') and is_loopback('localhost') and is_loopback('::1')
+    assert not is_loopback('0.0.0.0')
+
+    with pytest.raises(RuntimeError, match="RECOGNITION_API_TOKEN"):
+        run(serve('0.0.0.0', 0, workers=1, token=''))
+
+
+def test_worker_metrics_are_merged_into_the_api_registry():
+    from facepass.services.metrics import MetricsRegistry
+
+    worker, api = MetricsRegistry(), MetricsRegistry()
+    worker.observe('facepass_stage_seconds', 0.02, operation='process_access_attempt', stage='face_detection')
+    worker.observe('facepass_stage_seconds', 0.2, operation='process_access_attempt', stage='face_detection')
+
+    api.merge(worker.drain())
+
+    assert worker.render_prometheus() == "\n"
+    text = api.render_prometheus()
+    assert 'facepass_stage_seconds_count{operation="process_access_attempt",stage="face_detection"} 2' in text
@@ -0,0 +1,35 @@
+"""
+Verificação de versão do MySQL antes da troca de tabelas do reencode_faces.
+"""
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("dotenv")
+
+from facepass.database.setup_database.reencode_faces import check_switch_supported, server_version
+
+
+class VersionCursor:
+    def __init__(self, version):
+        self.version = version
+
+    def execute(self, query, params=None):
+        assert query == "SELECT VERSION()"
+
+    def fetchone(self):
+        return (self.version,)
+
+
+def test_server_version_ignores_distribution_suffix():
+    assert server_version(VersionCursor('8.0.36-0ubuntu0.22.04.1')) == (8, 0, 36)
+
+
+@pytest.mark.parametrize('version', ['8.0.13', '8.4.0', '9.1.0-commercial'])
+def test_switch_supported(version):
+    check_switch_supported(VersionCursor(version))
+
+
+@pytest.mark.parametrize('version', ['5.7.44-log', '8.0.12'])
+def test_old_server_fails_before_processing(version):
+    with pytest.raises(RuntimeError, match="8.0.13"):
+        check_switch_supported(VersionCursor(version))
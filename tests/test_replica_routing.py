@@ -0,0 +1,111 @@
+"""
+Roteamento de leituras para réplicas no QueryExecutor, usando conexões
+stand-in (sem MySQL). Para testar contra duas instâncias locais, aponte
+DB_REPLICAS para a segunda e abra o dashboard.
+"""
+import pytest
+
+mysql_connector = pytest.importorskip("mysql.connector")
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("dotenv")
+
+from facepass.database.setup_database.connection import ReadReplicas
+from facepass.database.setup_database.executor_query import QueryExecutor
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+        self.lastrowid = 1
+        self.description = []
+        self._row = None
+
+    def execute(self, query, params=()):
+        if self.connection.fail_with:
+            raise self.connection.fail_with
+        self.connection.queries.append(query)
+        self._row = self.connection.replica_status if 'STATUS' in query else {'total': 1}
+
+    def fetchone(self):
+        return self._row
+
+    def fetchall(self):
+        return [self._row]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, replica_status=None):
+        self.replica_status = replica_status
+        self.fail_with = None
+        self.queries = []
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def is_connected(self):
+        return True
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def data_queries(self):
+        return [q for q in self.queries if 'STATUS' not in q]
+
+
+def make_executor(lag=0):
+    primary = FakeConnection()
+    replica = FakeConnection({'Seconds_Behind_Source': lag})
+    replicas = ReadReplicas([('replica', 3306)], 'user', 'password', max_lag=5, check_interval=60)
+    replicas.replicas[0]['connection'] = replica
+    return QueryExecutor(primary, replicas), primary, replica
+
+
+def test_reads_go_to_replica_and_writes_to_primary():
+    executor, primary, replica = make_executor()
+
+    executor.execute_query("SELECT 1")
+    executor.execute_update("UPDATE t SET x = 1")
+
+    assert replica.data_queries() == ["SELECT 1"]
+    assert primary.data_queries() == ["UPDATE t SET x = 1"]
+
+
+def test_lagging_replica_falls_back_to_primary():
+    executor, primary, replica = make_executor(lag=30)
+
+    executor.execute_query_one("SELECT 1")
+
+    assert replica.data_queries() == []
+    assert primary.data_queries() == ["SELECT 1"]
+
+
+def test_failed_replica_is_skipped_until_next_check():
+    executor, primary, replica = make_executor()
+    executor.replicas.acquire()  # verificação inicial
+    replica.fail_with = mysql_connector.OperationalError("connection lost")
+
+    executor.execute_query("SELECT 1")
+    replica.fail_with = None
+    executor.execute_query("SELECT 2")
+
+    assert primary.data_queries() == ["SELECT 1", "SELECT 2"]
+    assert executor.replicas.status()[0]['healthy'] is False
+
+
+def test_reads_inside_transaction_stay_on_primary():
+    executor, primary, replica = make_executor()
+
+    with executor.transaction():
+        executor.execute_insert("INSERT INTO t VALUES (1)")
+        executor.execute_query("SELECT 1")
+
+    assert replica.data_queries() == []
+    assert primary.data_queries() == ["INSERT INTO t VALUES (1)", "SELECT 1"]
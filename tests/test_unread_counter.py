@@ -0,0 +1,86 @@
+"""
+Contador de notificações não lidas dentro de transações (sem MySQL).
+"""
+from datetime import datetime
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("dotenv")
+
+from facepass.database.setup_database.executor_query import QueryExecutor
+from facepass.models.registerAccess import RegistroAcesso
+from facepass.services.notification_service import NotificationService, UnreadNotificationCounter
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class InMemoryNotificationRepository:
+    def __init__(self, connection):
+        self.executor = QueryExecutor(connection)
+        self.saved = []
+
+    def save_notification(self, notificacao):
+        self.saved.append(notificacao)
+
+
+@pytest.fixture
+def setup():
+    connection = FakeConnection()
+    counter = UnreadNotificationCounter(resync_seconds=3600)
+    counter.get(1, lambda manager_id: 5)
+    service = NotificationService(InMemoryNotificationRepository(connection), counter)
+    return connection, counter, service
+
+
+def denied():
+    return RegistroAcesso(10, None, datetime(2024, 5, 10, 9, 0), 'entrada', False, 'Rosto não cadastrado')
+
+
+def test_counter_moves_only_after_commit(setup):
+    connection, counter, service = setup
+    executor = service.notification_repository.executor
+
+    with executor.transaction():
+        service.notify_access_denied(denied(), manager_id=1)
+        assert counter.get(1, lambda manager_id: 0) == 5
+
+    assert connection.commits == 1
+    assert counter.get(1, lambda manager_id: 0) == 6
+
+
+def test_rollback_discards_counter_delta(setup):
+    connection, counter, service = setup
+    executor = service.notification_repository.executor
+
+    with pytest.raises(RuntimeError):
+        with executor.transaction():
+            service.notify_access_denied(denied(), manager_id=1)
+            raise RuntimeError("daily_hours.record_event falhou")
+
+    assert connection.rollbacks == 1
+    assert counter.get(1, lambda manager_id: 0) == 5
+
+    # Nenhum callback pendente vaza para a próxima transação
+    with executor.transaction():
+        pass
+    assert counter.get(1, lambda manager_id: 0) == 5
+
+
+def test_without_transaction_counter_moves_immediately(setup):
+    _, counter, service = setup
+
+    service.notify_access_denied(denied(), manager_id=1)
+
+    assert counter.get(1, lambda manager_id: 0) == 6
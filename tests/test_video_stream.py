@@ -0,0 +1,94 @@
+"""
+Modo de vídeo (VideoStreamProcessor) com um service stand-in e caixas sintéticas.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("face_recognition")
+pytest.importorskip("dotenv")
+
+from facepass.services.video_stream_service import VideoStreamProcessor
+
+FACE = (40, 140, 140, 40)
+
+
+class StubRecognitionService:
+    """Detecta as caixas programadas por quadro e devolve confianças programadas"""
+
+    def __init__(self, boxes_per_frame, confidences):
+        self.boxes_per_frame = list(boxes_per_frame)
+        self.confidences = list(confidences)
+        self.encoded = 0
+
+    def detect_faces(self, image):
+        return self.boxes_per_frame.pop(0) if self.boxes_per_frame else []
+
+    def encode_face(self, image, location):
+        self.encoded += 1
+        return np.zeros(128)
+
+    def identify_encoding(self, encoding):
+        return (7, self.confidences.pop(0))
+
+
+class FakeCapture:
+    def __init__(self, frames):
+        self.remaining = frames
+
+    def grab(self):
+        self.remaining -= 1
+        return self.remaining >= 0
+
+    def read(self):
+        ok = self.grab()
+        return ok, np.zeros((240, 320, 3), dtype=np.uint8) if ok else None
+
+
+def frame():
+    return np.zeros((240, 320, 3), dtype=np.uint8)
+
+
+def processor(service, events, **kwargs):
+    return VideoStreamProcessor(service, lambda track, identity, image: events.append((track.id, identity, image)),
+                                frame_skip=0, detection_scale=1, **kwargs)
+
+
+def test_confident_face_generates_one_event():
+    events = []
+    service = StubRecognitionService([[FACE]] * 10, [0.9])
+    stream = processor(service, events)
+
+    for index in range(10):
+        stream.process_frame(frame(), index)
+
+    assert service.encoded == 1
+    assert len(events) == 1
+    track_id, identity, image = events[0]
+    assert identity == (7, 0.9)
+    assert image.startswith(b'\xff\xd8')
+
+
+def test_low_confidence_rechecks_are_bounded():
+    events = []
+    service = StubRecognitionService([[FACE]] * 30, [0.2, 0.4, 0.3, 0.9])
+    stream = processor(service, events, max_attempts=3, recheck_frames=5)
+
+    for index in range(30):
+        stream.process_frame(frame(), index)
+
+    assert service.encoded == 3
+    assert [identity for _, identity, _ in events] == [(7, 0.4)]
+    assert stream.stats.events == 1
+
+
+def test_face_leaving_before_last_attempt_emits_best_result():
+    events = []
+    service = StubRecognitionService([[FACE]], [0.3])
+    stream = VideoStreamProcessor(service, lambda track, identity, image: events.append(identity),
+                                  frame_skip=2, detection_scale=1, max_attempts=3)
+
+    stats = stream.run(FakeCapture(frames=9))
+
+    assert (stats['frames_read'], stats['frames_processed']) == (9, 3)
+    assert events == [(7, 0.3)]